@@ -0,0 +1,38 @@
+from core.solution_validator import SolutionValidator
+from models.coordinate import Coordinate
+from models.gift_set import GiftSet
+from models.sleigh_state import SleighState
+from models.velocity import Velocity
+
+
+def make_state(c=0, r=0, vc=0, vr=0) -> SleighState:
+    """Stan sań bez prezentów i marchewek - do testów ruchu."""
+    return SleighState(
+        0,
+        Coordinate(c, r),
+        Velocity(vc, vr),
+        0,
+        0,
+        GiftSet(0),
+        GiftSet(0),
+        GiftSet(0),
+        False,
+    )
+
+
+def run_strict(solver, problem, simulator, max_decisions=20000):
+    """
+    Przebieg solvera, w którym każdą komendę sprawdza SolutionValidator -
+    niedozwolona komenda przerywa test (SolutionError). Zwraca (stan, liczba
+    decyzji).
+    """
+    validator = SolutionValidator(problem, simulator.accel_table)
+    state = validator.state
+    decisions = 0
+    while state.current_time < problem.T and decisions < max_decisions:
+        decisions += 1
+        action, value = solver.resolve(
+            state, problem, simulator.accel_table, simulator.all_gifts_map
+        )
+        validator.apply(action, value)
+    return state, decisions
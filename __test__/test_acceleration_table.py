@@ -0,0 +1,64 @@
+import numpy as np
+
+from core.acceleration_table import AccelerationTable
+from input.input_parser import InputParser
+
+
+def linear_scan(ranges, weight):
+    for acceleration_range in ranges:
+        if (
+            acceleration_range.min_weight_exclusive
+            < weight
+            <= acceleration_range.max_weight_inclusive
+        ):
+            return acceleration_range.max_accel
+    return 0
+
+
+def make_table():
+    ranges = InputParser(None).parse_acceleration_ranges(
+        ["15 8", "30 6", "45 4", "60 2"]
+    )
+    return AccelerationTable(ranges)
+
+
+def test_scalar_lookup_matches_linear_scan():
+    table = make_table()
+    weights = [
+        -5,
+        0,
+        0.5,
+        1,
+        14.9,
+        15,
+        15.0,
+        15.5,
+        30,
+        44,
+        45,
+        59.99,
+        60,
+        60.5,
+        61,
+        10**7,
+    ]
+
+    for weight in weights:
+        assert table.get_max_acceleration_for_weight(weight) == linear_scan(
+            table.ranges, weight
+        )
+
+
+def test_vectorized_lookup_matches_scalar():
+    table = make_table()
+    weights = np.concatenate([np.arange(-3, 70), np.linspace(-1.5, 65.5, 41)])
+
+    expected = [table.get_max_acceleration_for_weight(w) for w in weights]
+    assert table.get_max_acceleration_for_weights(weights).tolist() == expected
+
+
+def test_empty_table_returns_zero():
+    table = AccelerationTable([])
+
+    assert table.get_max_acceleration_for_weight(10) == 0
+    assert table.get_max_acceleration_for_weights(np.array([1, 2])).tolist() == [0, 0]
@@ -0,0 +1,98 @@
+import os
+import time
+
+from brain import anytime
+from brain.anytime import improve_trips, run_solver, solution_trips, solve_anytime
+from brain.smart_solver import SmartSolver
+from core.actions import Action
+from core.loader import load_problem
+from core.solution_validator import SolutionValidator
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+class IdleSolver:
+    def resolve(self, state, problem, accel_table, all_gifts_map):
+        return Action.Floating, 1
+
+
+def _problem():
+    return load_problem(os.path.join(DATA_DIR, "a_an_example.in.txt"))
+
+
+def test_run_solver_stops_at_deadline():
+    problem, simulator = _problem()
+
+    full = run_solver(SmartSolver(), problem, simulator.accel_table)
+    cut = run_solver(SmartSolver(), problem, simulator.accel_table, deadline=0)
+
+    assert full.score == 18
+    assert cut.commands == [] and cut.score == 0
+
+
+def test_keeps_best_solution_on_disk(tmp_path, monkeypatch):
+    problem, simulator = _problem()
+    path = str(tmp_path / "solution.txt")
+    written = []
+
+    def candidates(route_checks, beam_time_budget=None):
+        yield "bez ruchu", IdleSolver()
+        yield "smart", SmartSolver(route_max_checks=route_checks)
+        yield "bez ruchu", IdleSolver()
+
+    def recording_write(output_path, solution, catalog):
+        written.append(solution.score)
+        write_solution(output_path, solution, catalog)
+
+    write_solution = anytime.write_solution
+    monkeypatch.setattr(anytime, "candidate_solvers", candidates)
+    monkeypatch.setattr(anytime, "write_solution", recording_write)
+
+    best = solve_anytime(problem, simulator.accel_table, path, 5.0)
+
+    # Gorsze rozwiązania nie nadpisują pliku, a wyniki bez zmian kończą pętlę
+    assert written == [0, 18]
+    assert best.score == 18
+    result = SolutionValidator(problem, simulator.accel_table).validate_file(path)
+    assert result.valid and result.score == 18
+
+
+def test_respects_deadline(tmp_path):
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "b_better_hurry.in.txt"))
+    path = str(tmp_path / "solution.txt")
+
+    start = time.perf_counter()
+    solve_anytime(problem, simulator.accel_table, path, 0.5)
+
+    assert time.perf_counter() - start < 2.0
+    assert SolutionValidator(problem, simulator.accel_table).validate_file(path).valid
+
+
+def test_solution_trips_groups_delivered_gifts():
+    problem, simulator = _problem()
+    solution = run_solver(SmartSolver(), problem, simulator.accel_table)
+
+    trips = solution_trips(solution)
+
+    delivered = [v for a, v in solution.commands if a == Action.DeliverGift]
+    assert sorted(g for trip in trips for g in trip) == sorted(delivered)
+    assert all(trip for trip in trips)
+
+
+def test_improve_trips_beats_first_solution():
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "b_better_hurry.in.txt"))
+    first = run_solver(SmartSolver(), problem, simulator.accel_table)
+    found = []
+
+    best = improve_trips(
+        first,
+        problem,
+        simulator.accel_table,
+        route_checks=1000,
+        deadline=time.perf_counter() + 10.0,
+        on_better=found.append,
+    )
+
+    # Dokładanie prezentów do kursu poprawia słaby plan misji
+    assert best.score > first.score
+    assert found and found[-1] is best
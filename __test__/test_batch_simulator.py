@@ -0,0 +1,80 @@
+import glob
+import os
+import random
+
+import pytest
+
+from core.batch_simulator import BatchSimulator
+from core.loader import load_problem
+from core.simulator import Simulator
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+INSTANCES = sorted(glob.glob(os.path.join(DATA_DIR, "*.in.txt")))
+N_SLEIGHS = 6
+N_STEPS = 400
+
+
+def random_command(rng: random.Random):
+    kind = rng.random()
+    if kind < 0.45:
+        ax, ay = rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1), (3, 0), (0, -2)])
+        return ax, ay, 0, 0, True
+    if kind < 0.6:
+        return 0, 0, 0, 0, True
+    if kind < 0.75:
+        return 0, 0, 1, 0, False
+    if kind < 0.9:
+        return 0, 0, -1, 0, False
+    return 0, 0, 0, 1, False
+
+
+@pytest.mark.parametrize("knapsack_load", [False, True], ids=["greedy", "knapsack"])
+@pytest.mark.parametrize("path", INSTANCES, ids=os.path.basename)
+def test_batch_simulator_matches_scalar_simulator(path, knapsack_load):
+    problem, simulator = load_problem(path)
+    scalars = [
+        Simulator(
+            t_limit=simulator.t_limit,
+            range_d=simulator.range_d,
+            accel_table=simulator.accel_table,
+            all_gifts_map=simulator.all_gifts_map,
+            knapsack_load=knapsack_load,
+        )
+        for _ in range(N_SLEIGHS)
+    ]
+    batch = BatchSimulator.from_simulator(scalars[0], N_SLEIGHS)
+
+    batch.reset()
+    for sim in scalars:
+        sim.reset()
+
+    rng = random.Random(2022)
+    for _ in range(N_STEPS):
+        commands = [random_command(rng) for _ in range(N_SLEIGHS)]
+
+        for sim, (ax, ay, load, fuel, moves) in zip(scalars, commands):
+            sim.handle_action(ax, ay, load, fuel)
+            if moves:
+                sim.step()
+
+        ax, ay, load, fuel, moves = map(list, zip(*commands))
+        batch.handle_action(ax, ay, load, fuel)
+        batch.step(moves)
+
+        for i, sim in enumerate(scalars):
+            assert batch.get_state(i) == sim.state
+
+
+def test_partial_reset_only_touches_masked_rows():
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "a_an_example.in.txt"))
+    batch = BatchSimulator.from_simulator(simulator, 3)
+    batch.reset()
+
+    batch.handle_action([1, 1, 1], 0, 1, 0)
+    batch.step()
+    batch.reset([False, True, False])
+
+    assert batch.time.tolist() == [1, 0, 1]
+    assert batch.vel_c.tolist() == [1.0, 0.0, 1.0]
+    assert batch.available[1].all()
+    assert not batch.available[0].all()
@@ -0,0 +1,114 @@
+import os
+import time
+
+import batch_solve
+from batch_solve import format_table, solve_all, solve_instance
+from core.actions import Action
+from core.loader import instance_name, load_problem
+from core.solution_validator import SolutionValidator
+from env.sleigh_env import SleighEnv
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def _instance(name):
+    return os.path.join(DATA_DIR, f"{name}.in.txt")
+
+
+def _validate(instance, path):
+    problem, simulator = load_problem(instance)
+    return SolutionValidator(problem, simulator.accel_table).validate_file(path)
+
+
+def test_instance_name():
+    assert instance_name("data/b_better_hurry.in.txt") == "b_better_hurry"
+    assert instance_name("private/x.txt") == "x"
+
+
+def test_solves_instances_in_parallel(tmp_path):
+    paths = [_instance("mini_challenge"), _instance("a_an_example")]
+
+    results = solve_all(paths, "smart", str(tmp_path), timeout=60, workers=2)
+
+    assert [r.instance for r in results] == ["mini_challenge", "a_an_example"]
+    for path, result in zip(paths, results):
+        assert result.error is None and not result.timed_out
+        validation = _validate(path, result.output_path)
+        assert validation.valid and validation.score == result.score
+    table = format_table(results)
+    assert "a_an_example" in table and "Razem" in table
+
+
+def test_beam_solver_with_time_budget(tmp_path):
+    path = _instance("a_an_example")
+
+    result = solve_instance(
+        path, "beam", str(tmp_path), timeout=60, beam_time_budget=0.05
+    )
+
+    assert result.error is None and result.score > 0
+    validation = _validate(path, result.output_path)
+    assert validation.valid and validation.score == result.score
+
+
+def test_timeout_keeps_valid_prefix(tmp_path):
+    path = _instance("b_better_hurry")
+
+    result = solve_instance(path, "greedy", str(tmp_path), timeout=0)
+
+    assert result.timed_out
+    assert _validate(path, result.output_path).valid
+
+
+def _hanging_task(path, solver_name, output_dir, timeout):
+    # Jedna decyzja dłuższa niż limit - miękki limit jej nie przerwie
+    time.sleep(600)
+
+
+def _crashing_task(path, solver_name, output_dir, timeout):
+    os._exit(3)
+
+
+def test_hard_limit_stops_stuck_instance(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_solve, "HARD_LIMIT_GRACE", 1.0)
+    paths = [_instance("a_an_example"), _instance("mini_challenge")]
+
+    start = time.perf_counter()
+    results = solve_all(
+        paths, "smart", str(tmp_path), timeout=0.5, workers=2, task=_hanging_task
+    )
+
+    assert time.perf_counter() - start < 30
+    for result in results:
+        assert result.timed_out and result.error is None
+        assert result.output_path is None and result.score == 0
+    assert "przerwany" in format_table(results)
+
+
+def test_crashed_worker_is_reported(tmp_path):
+    [result] = solve_all(
+        [_instance("a_an_example")], "smart", str(tmp_path), 5, 1, _crashing_task
+    )
+
+    assert "kodem 3" in result.error
+
+
+def test_errors_are_reported_per_instance(tmp_path):
+    missing = os.path.join(str(tmp_path), "missing.in.txt")
+
+    [result] = solve_all([missing], "smart", str(tmp_path), timeout=5, workers=1)
+
+    assert result.error is not None
+    assert "missing" in format_table([result])
+
+
+def test_env_step_commands():
+    problem, simulator = load_problem(_instance("a_an_example"))
+    env = SleighEnv(problem, simulator)
+    env.reset()
+
+    _, _, _, move = env.step_with_commands(0)
+    _, _, _, idle = env.step_with_commands(8)
+
+    assert move == [(Action.AccUp, 1), (Action.Floating, 1)]
+    assert idle == [(Action.Floating, 1)]
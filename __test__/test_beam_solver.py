@@ -0,0 +1,124 @@
+import os
+import time
+
+from brain.beam_solver import (
+    BeamSearchPlanner,
+    BeamSearchSolver,
+    remaining_travel_time,
+)
+from core.loader import load_problem
+from models.coordinate import Coordinate
+
+from .helpers import make_state, run_strict
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def _table():
+    _, simulator = load_problem(os.path.join(DATA_DIR, "a_an_example.in.txt"))
+    return simulator.accel_table
+
+
+def _replay(planner, state, path, table):
+    for macro in path:
+        planner._apply(state, table, macro)
+    return state
+
+
+def test_plan_reaches_target():
+    table = _table()
+    planner = BeamSearchPlanner(max_depth=12, time_budget=1.0)
+    state = make_state()
+    state.carrot_count = 20
+    state.sleigh_weight = 20
+    target = Coordinate(12, -7)
+
+    path, reached = planner.plan(state, target, 2, table, 1000)
+    # Plan nie zmienia stanu wejściowego, bo szuka na SearchState
+    assert state.position.c == 0 and state.carrot_count == 20
+
+    end = _replay(planner, state, path, table)
+    assert reached
+    assert (end.position.c - 12) ** 2 + (end.position.r + 7) ** 2 <= 4
+
+
+def test_plan_can_stop_in_range():
+    table = _table()
+    planner = BeamSearchPlanner(max_depth=12, time_budget=1.0)
+    state = make_state(c=10, r=4, vc=2)
+    state.carrot_count = 20
+    state.sleigh_weight = 20
+
+    path, reached = planner.plan(state, Coordinate(0, 0), 3, table, 1000, stop=True)
+    end = _replay(planner, state, path, table)
+
+    assert reached
+    assert end.velocity.vc == end.velocity.vr == 0
+    assert end.position.c**2 + end.position.r**2 <= 9
+
+
+def test_plan_respects_time_budget():
+    table = _table()
+    planner = BeamSearchPlanner(beam_width=512, max_depth=50, time_budget=0.02)
+    state = make_state()
+    state.carrot_count = 200
+    state.sleigh_weight = 200
+
+    start = time.perf_counter()
+    path, _ = planner.plan(state, Coordinate(5000, 5000), 0, table, 10**6)
+
+    assert time.perf_counter() - start < 0.5
+    assert path
+
+
+def test_custom_heuristic_is_used():
+    calls = []
+
+    def heuristic(state, target, range_d, max_acc):
+        calls.append(max_acc)
+        return remaining_travel_time(state, target, range_d, max_acc)
+
+    state = make_state()
+    state.carrot_count = 5
+    state.sleigh_weight = 5
+    BeamSearchPlanner(heuristic=heuristic).plan(
+        state, Coordinate(3, 0), 0, _table(), 100
+    )
+
+    assert calls
+
+
+def test_solver_delivers_gifts():
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "a_an_example.in.txt"))
+
+    # run_strict przerywa na pierwszym niedozwolonym ruchu (SolutionError)
+    state, _ = run_strict(BeamSearchSolver(), problem, simulator)
+
+    assert len(state.delivered_gifts) == len(problem.catalog)
+    assert state.current_time <= problem.T
+
+
+def test_solver_plans_leg_once_per_target(monkeypatch):
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "new_challenge.in.txt"))
+    plans = []
+    plan_leg = BeamSearchSolver._plan_leg
+
+    def recording_plan_leg(self, state, problem, accel_table, target):
+        leg = plan_leg(self, state, problem, accel_table, target)
+        plans.append(((target.c, target.r), bool(leg)))
+        return leg
+
+    monkeypatch.setattr(BeamSearchSolver, "_plan_leg", recording_plan_leg)
+    state, _ = run_strict(BeamSearchSolver(), problem, simulator)
+
+    assert len(state.delivered_gifts) > 0
+    # Znaleziony harmonogram nie jest liczony ponownie dla tego samego celu
+    for (target, found), (next_target, _) in zip(plans, plans[1:]):
+        assert not found or next_target != target
+
+
+def test_solver_passes_time_budget_to_planner():
+    assert BeamSearchSolver().planner.time_budget is None
+    assert BeamSearchSolver(time_budget=0.2).planner.time_budget == 0.2
+    planner = BeamSearchPlanner(beam_width=4)
+    assert BeamSearchSolver(planner, time_budget=0.2).planner is planner
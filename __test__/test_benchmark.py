@@ -0,0 +1,65 @@
+import json
+import os
+
+from benchmark import compare, format_comparison, main, metric, run_benchmarks
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def _report(**metrics):
+    return {"meta": {}, "metrics": metrics}
+
+
+def test_compare_respects_metric_direction():
+    baseline = _report(
+        rate=metric(100.0, "steps/s", True), seconds=metric(1.0, "s", False)
+    )
+    faster = _report(
+        rate=metric(150.0, "steps/s", True), seconds=metric(0.5, "s", False)
+    )
+    slower = _report(
+        rate=metric(80.0, "steps/s", True), seconds=metric(1.05, "s", False)
+    )
+
+    assert [row[4] for row in compare(baseline, faster, 0.1)] == [False, False]
+    rows = compare(baseline, slower, 0.1)
+    assert [(row[0], row[4]) for row in rows] == [("rate", True), ("seconds", False)]
+    assert abs(rows[0][3] + 0.2) < 1e-9
+    assert "❌" in format_comparison(rows)
+
+
+def test_compare_fails_on_missing_metrics():
+    baseline = _report(old=metric(1.0, "s", False), both=metric(1.0, "s", False))
+    current = _report(both=metric(1.0, "s", False), new=metric(1.0, "s", False))
+
+    rows = compare(baseline, current)
+
+    assert rows == [("old", 1.0, None, None, True), ("both", 1.0, 1.0, 0.0, False)]
+    assert "brak" in format_comparison(rows)
+
+
+def test_compare_command_exits_nonzero_on_missing_metric(tmp_path, monkeypatch, capsys):
+    paths = []
+    for name, report in (
+        ("baseline", _report(rate=metric(1.0, "steps/s", True))),
+        ("current", _report()),
+    ):
+        paths.append(str(tmp_path / f"{name}.json"))
+        with open(paths[-1], "w") as f:
+            json.dump(report, f)
+    monkeypatch.setattr("sys.argv", ["benchmark.py", "compare", *paths])
+
+    assert main() == 1
+    assert "Brak w obecnym raporcie: rate" in capsys.readouterr().out
+
+
+def test_run_produces_json_report():
+    path = os.path.join(DATA_DIR, "a_an_example.in.txt")
+
+    report = run_benchmarks([path], ("parse", "solver"), repeats=1)
+
+    assert report["meta"]["instances"] == ["a_an_example"]
+    metrics = json.loads(json.dumps(report))["metrics"]
+    assert {"parse/a_an_example", "solve/smart/a_an_example"} <= metrics.keys()
+    assert metrics["decisions/greedy/a_an_example"]["higher_is_better"]
+    assert all(m["value"] > 0 for m in metrics.values())
@@ -0,0 +1,62 @@
+import gzip
+import lzma
+import os
+
+import numpy as np
+import pytest
+
+from input.column_parser import ColumnInputParser, parse_gift_chunk
+from input.input_parser import InputParser
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+INPUT_FILES = sorted(
+    os.path.join(DATA_DIR, name)
+    for name in os.listdir(DATA_DIR)
+    if name.endswith(".in.txt")
+)
+
+
+@pytest.mark.parametrize("path", INPUT_FILES, ids=os.path.basename)
+def test_matches_input_parser(path):
+    T, D, W, G, ranges, gifts = InputParser(path).parse_information()
+    T2, D2, W2, G2, ranges2, catalog = ColumnInputParser(
+        path, chunk_size=64
+    ).parse_information()
+
+    assert (T, D, W, G) == (T2, D2, W2, G2)
+    assert ranges == ranges2
+    assert catalog.gifts == gifts[:G]
+    assert [catalog.name_of(i) for i in catalog] == [g.name for g in gifts[:G]]
+
+
+@pytest.mark.parametrize("opener, suffix", [(gzip.open, ".gz"), (lzma.open, ".xz")])
+def test_compressed_input(tmp_path, opener, suffix):
+    source = os.path.join(DATA_DIR, "b_better_hurry.in.txt")
+    target = str(tmp_path / ("b.in.txt" + suffix))
+    with open(source, "rb") as src, opener(target, "wb") as dst:
+        dst.write(src.read())
+
+    expected = ColumnInputParser(source).parse_information()[-1]
+    catalog = ColumnInputParser(target, chunk_size=1000).parse_information()[-1]
+
+    assert np.array_equal(catalog.names, expected.names)
+    assert np.array_equal(catalog.weights, expected.weights)
+    assert np.array_equal(catalog.dest_r, expected.dest_r)
+
+
+def test_parse_gift_chunk_negative_and_crlf():
+    names, values = parse_gift_chunk(b"A 1 -2 30 -400\r\nLonger_name 0 5 -6 7\r\n")
+
+    assert names.tolist() == [b"A", b"Longer_name"]
+    assert values.tolist() == [[1, -2, 30, -400], [0, 5, -6, 7]]
+
+
+def test_parse_gift_chunk_rejects_malformed_line():
+    with pytest.raises(ValueError):
+        parse_gift_chunk(b"A 1 2 3\nB 1 2 3 4 5\n")
+    with pytest.raises(ValueError):
+        parse_gift_chunk(b"A 1 x 3 4\n")
+    with pytest.raises(ValueError):
+        parse_gift_chunk(b"A 1 - 3 4\n")
+    with pytest.raises(ValueError):
+        parse_gift_chunk(b"A 1 2-3 3 4\n")
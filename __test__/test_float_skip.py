@@ -0,0 +1,134 @@
+import os
+import random
+
+import pytest
+
+from brain import smart_solver
+from brain.greedy_solver import GreedySolver
+from brain.motion_control import coast_steps, get_move_action, steps_until_in_range
+from brain.smart_solver import SmartSolver
+from core.actions import Action, floating
+from core.distance_utils import distance
+from core.loader import load_problem
+from core.simulator import Simulator
+from env.sleigh_env import SleighEnv
+from models.coordinate import Coordinate
+
+from .helpers import make_state, run_strict
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def test_steps_until_in_range_matches_stepping():
+    rng = random.Random(0)
+    for _ in range(500):
+        state = make_state(
+            *(rng.randint(-50, 50) for _ in range(2)),
+            *(rng.randint(-4, 4) for _ in range(2))
+        )
+        target = Coordinate(rng.randint(-50, 50), rng.randint(-50, 50))
+        radius = rng.randint(0, 6)
+
+        expected = None
+        for t in range(200):
+            pos = Coordinate(
+                state.position.c + t * state.velocity.vc,
+                state.position.r + t * state.velocity.vr,
+            )
+            if distance(pos, target) <= radius:
+                expected = t
+                break
+
+        got = steps_until_in_range(state.position, state.velocity, target, radius)
+        if expected is None:
+            assert got is None or got >= 200
+        else:
+            assert got == expected
+
+
+def test_coast_steps_matches_single_step_decisions():
+    rng = random.Random(1)
+    checked = 0
+    while checked < 300:
+        state = make_state(
+            rng.randint(-200, 200),
+            rng.randint(-200, 200),
+            rng.randint(-6, 6),
+            rng.randint(-6, 6),
+        )
+        target = Coordinate(rng.randint(-200, 200), rng.randint(-200, 200))
+        if get_move_action(state, target)[0] != Action.Floating:
+            continue
+        checked += 1
+
+        k = coast_steps(state, target, 3)
+        probe = state.clone()
+        for t in range(1, k):
+            floating(probe)
+            assert get_move_action(probe, target)[0] == Action.Floating
+            assert distance(probe.position, target) > 3
+        # Po dokładnie k krokach trzeba już skręcić albo cel jest w zasięgu
+        floating(probe)
+        assert (
+            get_move_action(probe, target)[0] != Action.Floating
+            or distance(probe.position, target) <= 3
+        )
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "b_better_hurry.in.txt",
+        "huge_challenge.in.txt",
+        "mini_challenge.in.txt",
+        "new_challenge.in.txt",
+    ],
+)
+@pytest.mark.parametrize("solver_cls", [GreedySolver, SmartSolver])
+def test_solvers_same_result_with_fewer_decisions(monkeypatch, name, solver_cls):
+    problem, simulator = load_problem(os.path.join(DATA_DIR, name))
+    fast, fast_decisions = run_strict(solver_cls(), problem, simulator)
+
+    monkeypatch.setattr(smart_solver, "coast_steps", lambda *args, **kwargs: 1)
+    monkeypatch.setattr(GreedySolver, "_coast_steps", lambda *args: 1)
+    slow, slow_decisions = run_strict(solver_cls(), problem, simulator)
+
+    assert fast.delivered_gifts == slow.delivered_gifts
+    assert fast.position == slow.position
+    assert fast.current_time == slow.current_time
+    assert fast_decisions <= slow_decisions
+
+
+def test_env_coast_matches_single_floats():
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "new_challenge.in.txt"))
+
+    def knapsack_env(coast):
+        loading = Simulator(
+            problem.T,
+            problem.D,
+            simulator.accel_table,
+            problem.catalog,
+            knapsack_load=True,
+        )
+        return SleighEnv(problem, loading, coast=coast)
+
+    coasting = knapsack_env(coast=True)
+    stepping = knapsack_env(coast=False)
+    for env in (coasting, stepping):
+        env.reset()
+        env.step(10)
+        env.step(9)
+        # MAX_E i MAX_N - pierwszy załadowany cel (30, 20) jest na prawo i w górę
+        env.step(6)
+        env.step(4)
+
+    _, _, _, commands = coasting.step_with_commands(8)
+    [(action, k)] = commands
+    assert action == Action.Floating and k > 1
+
+    for _ in range(k):
+        stepping.step(8)
+    assert stepping.state.position == coasting.state.position
+    assert stepping.state.current_time == coasting.state.current_time
+    assert coasting.state.current_time - k == 2
+    assert stepping._get_distance_to_current_target() <= stepping.problem.D
@@ -0,0 +1,49 @@
+import torch
+
+from agents.genetic_agent import GeneticAgent
+from agents.genetic_population import GeneticPopulation
+
+
+def test_batched_forward_matches_individual_agents():
+    torch.manual_seed(0)
+    population = GeneticPopulation(5, 12, 12, device=torch.device("cpu"))
+    states = torch.randn(5, 12)
+
+    batched = population.forward(states)
+    for i in range(5):
+        agent = population.to_agent(i)
+        assert torch.allclose(batched[i], agent(states[i]).squeeze(0).cpu(), atol=1e-5)
+
+
+def test_from_agent_keeps_master_and_mutates_rest():
+    torch.manual_seed(0)
+    master = GeneticAgent(12, 12)
+    population = GeneticPopulation.from_agent(master, 4, mutation_power=0.1)
+
+    states = torch.randn(4, 12)
+    assert torch.allclose(
+        population.forward(states)[0], master(states[0]).squeeze(0).cpu(), atol=1e-5
+    )
+    assert not torch.equal(population.genomes[0], population.genomes[1])
+
+
+def test_from_agent_honours_device():
+    master = GeneticAgent(12, 12)
+
+    population = GeneticPopulation.from_agent(
+        master, 3, mutation_power=0.1, device=torch.device("cpu")
+    )
+
+    assert population.device == torch.device("cpu")
+    assert population.genomes.device.type == "cpu"
+    assert GeneticPopulation.from_agent(master, 3, 0.1).device == master.device
+
+
+def test_next_generation_keeps_elites_first():
+    population = GeneticPopulation(6, 12, 12, device=torch.device("cpu"))
+    elites = population.genomes[[4, 2]].clone()
+
+    population.next_generation([4, 2], mutation_power=0.05)
+
+    assert population.genomes.shape == (6, population.n_params)
+    assert torch.equal(population.genomes[:2], elites)
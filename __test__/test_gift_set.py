@@ -0,0 +1,24 @@
+from models.gift_set import GiftSet
+
+
+def test_membership_and_transfer():
+    available = GiftSet.full(5)
+    loaded = GiftSet(5)
+
+    available.remove(3)
+    loaded.add(3)
+
+    assert 3 not in available and 3 in loaded
+    assert len(available) == 4 and len(loaded) == 1
+    assert list(available) == [0, 1, 2, 4]
+
+
+def test_first_is_smallest_id_and_copy_is_independent():
+    loaded = GiftSet(10, [7, 2, 5])
+    snapshot = loaded.copy()
+    loaded.remove(2)
+
+    assert loaded.first() == 5
+    assert snapshot.first() == 2
+    assert GiftSet(10).first() is None
+    assert snapshot == GiftSet(10, [2, 5, 7])
@@ -1,8 +1,9 @@
 import pytest
 from pathlib import Path
-from src.input.input_parser import InputParser
-from src.models.gift import Gift
-from src.models.acceleration_range import AccelerationRange
+from input.input_parser import InputParser
+from models.gift import Gift
+from models.acceleration_range import AccelerationRange
+from models.coordinate import Coordinate
 
 
 MOCK_INPUT_DATA = """15 3 4 4
@@ -61,9 +62,13 @@ def test_parse_gifts(parser: InputParser):
     gifts = parser.parse_gifts(lines)
 
     assert len(gifts) == 4
-    assert gifts[0] == Gift(name="Olivia", score=1, weight=10, c=5, r=1)
-    assert gifts[2] == Gift(name="Liam", score=5, weight=10, c=8, r=4)
-    assert gifts[3].r == -100
+    assert gifts[0] == Gift(
+        name="Olivia", score=1, weight=10, destination=Coordinate(5, 1)
+    )
+    assert gifts[2] == Gift(
+        name="Liam", score=5, weight=10, destination=Coordinate(8, 4)
+    )
+    assert gifts[3].destination.r == -100
 
 
 def test_read_file_not_found():
@@ -88,8 +93,12 @@ def test_parse_information_full(parser: InputParser):
     assert "Kacper" in map(lambda g: g.name, gifts)
     assert "Bob" in map(lambda g: g.name, gifts)
 
-    expected_john = Gift(name="John", score=5, weight=10, c=8, r=4)
-    expected_alek = Gift(name="Alek", score=2, weight=10, c=-10, r=1)
+    expected_john = Gift(
+        name="John", score=5, weight=10, destination=Coordinate(8, 4)
+    )
+    expected_alek = Gift(
+        name="Alek", score=2, weight=10, destination=Coordinate(-10, 1)
+    )
 
     assert gifts[2] == expected_john
     assert gifts[1] == expected_alek
@@ -0,0 +1,105 @@
+from core.actions import Action
+from models.gift import Gift
+from models.gift_catalog import GiftCatalog
+from models.coordinate import Coordinate
+from output.output_writer import OutputWriter
+
+
+def _read_commands(path):
+    with open(path) as file:
+        lines = file.read().splitlines()
+    return int(lines[0]), lines[1:]
+
+
+def test_merges_floats_and_writes_count(tmp_path):
+    path = tmp_path / "solution.txt"
+    catalog = GiftCatalog([Gift("Olivia", 1, 10, Coordinate(5, 1))])
+
+    with OutputWriter(str(path), gift_names=catalog) as writer:
+        writer.record(Action.LoadCarrots, 5)
+        writer.record(Action.LoadGifts, 0)
+        writer.record(Action.AccUp, 3)
+        writer.record(Action.Floating, 1)
+        writer.record(Action.Floating, 4)
+        writer.record(Action.DeliverGift, "Olivia")
+        writer.record(Action.Floating, 2)
+
+    # Pierwsza linia to sama liczba, bez dopełnienia
+    assert path.read_text().startswith("6\n")
+    count, commands = _read_commands(path)
+    assert commands == [
+        "LoadCarrots 5",
+        "LoadGift Olivia",
+        "AccUp 3",
+        "Float 5",
+        "DeliverGift Olivia",
+        "Float 2",
+    ]
+    assert count == len(commands)
+
+
+def test_count_survives_many_commands(tmp_path):
+    path = tmp_path / "solution.txt"
+    with OutputWriter(str(path), buffer_size=64) as writer:
+        for _ in range(5000):
+            writer.record(Action.AccRight, 1)
+            writer.record(Action.Floating, 1)
+
+    count, commands = _read_commands(path)
+    assert count == 10000 == len(commands)
+    assert commands[-2:] == ["AccRight 1", "Float 1"]
+
+
+def test_empty_solution(tmp_path):
+    path = tmp_path / "solution.txt"
+    OutputWriter(str(path)).close()
+
+    assert _read_commands(path) == (0, [])
+
+
+def test_atomic_write_keeps_old_file_on_error(tmp_path):
+    path = tmp_path / "solution.txt"
+    with OutputWriter(str(path), atomic=True) as writer:
+        writer.record(Action.AccUp, 1)
+    assert _read_commands(path) == (1, ["AccUp 1"])
+
+    try:
+        with OutputWriter(str(path), atomic=True) as writer:
+            writer.record(Action.AccDown, 2)
+            raise RuntimeError("przerwany zapis")
+    except RuntimeError:
+        pass
+
+    assert _read_commands(path) == (1, ["AccUp 1"])
+    assert [p.name for p in tmp_path.iterdir()] == ["solution.txt"]
+
+
+def test_atomic_write_uses_regular_file_mode(tmp_path):
+    path = tmp_path / "solution.txt"
+    with OutputWriter(str(path), atomic=True) as writer:
+        writer.record(Action.AccUp, 1)
+
+    # Tryb jak pliku utworzonego zwykłym open()
+    reference = tmp_path / "reference.txt"
+    reference.write_text("")
+    assert path.stat().st_mode & 0o777 == reference.stat().st_mode & 0o777
+
+    path.chmod(0o640)
+    with OutputWriter(str(path), atomic=True) as writer:
+        writer.record(Action.AccUp, 2)
+    assert path.stat().st_mode & 0o777 == 0o640
+
+
+def test_error_keeps_old_file_without_atomic(tmp_path):
+    path = tmp_path / "solution.txt"
+    path.write_text("1\nAccUp 1\n")
+
+    try:
+        with OutputWriter(str(path)) as writer:
+            writer.record(Action.AccDown, 2)
+            raise RuntimeError("przerwany zapis")
+    except RuntimeError:
+        pass
+
+    assert path.read_text() == "1\nAccUp 1\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["solution.txt"]
@@ -0,0 +1,100 @@
+import os
+import shutil
+
+import numpy as np
+
+from core import problem_cache
+from core.loader import load_problem
+from core.problem_cache import cache_path_for, file_digest, load_cached_problem
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def _copy_input(tmp_path, name="b_better_hurry.in.txt"):
+    target = tmp_path / name
+    shutil.copy(os.path.join(DATA_DIR, name), target)
+    return str(target)
+
+
+def test_cache_roundtrip(tmp_path):
+    path = _copy_input(tmp_path)
+    parsed, _ = load_problem(path, use_cache=True)
+    assert os.path.exists(cache_path_for(path))
+
+    cached = load_cached_problem(path, file_digest(path))
+    assert cached is not None
+    assert (cached.T, cached.D, cached.W, cached.G) == (
+        parsed.T,
+        parsed.D,
+        parsed.W,
+        parsed.G,
+    )
+    assert cached.acceleration_ranges == parsed.acceleration_ranges
+    assert cached.gifts == parsed.gifts
+    assert list(cached.spatial_index.iter_nearest(0, 0)) == list(
+        parsed.spatial_index.iter_nearest(0, 0)
+    )
+
+    loaded, simulator = load_problem(path, use_cache=True)
+    assert np.array_equal(loaded.catalog.dest_c, parsed.catalog.dest_c)
+    assert simulator.all_gifts_map is loaded.catalog
+
+
+def test_indexing_builds_single_gifts(tmp_path):
+    path = _copy_input(tmp_path)
+    parsed, _ = load_problem(path, use_cache=False)
+    load_problem(path, use_cache=True)
+    cached = load_cached_problem(path, file_digest(path))
+
+    assert cached.catalog[7] == parsed.gifts[7]
+    assert cached.catalog[np.int64(7)] is cached.catalog[7]
+    # Pojedyncze prezenty nie budują listy obiektów dla całego katalogu
+    assert cached.catalog._gifts is None
+
+
+def test_cache_invalidated_by_source_change(tmp_path):
+    path = _copy_input(tmp_path, "a_an_example.in.txt")
+    load_problem(path, use_cache=True)
+
+    with open(path) as file:
+        lines = file.read().splitlines()
+    lines[-1] = "Changed 99 1 2 3"
+    with open(path, "w") as file:
+        file.write("\n".join(lines) + "\n")
+
+    assert load_cached_problem(path, file_digest(path)) is None
+    problem, _ = load_problem(path, use_cache=True)
+    assert problem.gifts[-1].name == "Changed"
+    assert load_cached_problem(path, file_digest(path)) is not None
+
+
+def test_cache_ignored_on_version_change_or_garbage(tmp_path, monkeypatch):
+    path = _copy_input(tmp_path, "a_an_example.in.txt")
+    load_problem(path, use_cache=True)
+    digest = file_digest(path)
+
+    monkeypatch.setattr(problem_cache, "CACHE_VERSION", problem_cache.CACHE_VERSION + 1)
+    assert load_cached_problem(path, digest) is None
+
+    with open(cache_path_for(path), "wb") as file:
+        file.write(b"not a cache")
+    assert load_cached_problem(path, digest) is None
+    problem, _ = load_problem(path, use_cache=True)
+    assert problem.G == 4
+
+
+def test_cache_off_by_default(tmp_path):
+    path = _copy_input(tmp_path, "a_an_example.in.txt")
+    load_problem(path)
+    assert not os.path.exists(cache_path_for(path))
+
+
+def test_cache_in_separate_dir(tmp_path):
+    path = _copy_input(tmp_path, "a_an_example.in.txt")
+    cache_dir = str(tmp_path / "cache")
+    parsed, _ = load_problem(path, use_cache=True, cache_dir=cache_dir)
+
+    assert not os.path.exists(cache_path_for(path))
+    assert os.path.exists(cache_path_for(path, cache_dir))
+    cached = load_cached_problem(path, file_digest(path), cache_dir)
+    assert cached.gifts == parsed.gifts
@@ -0,0 +1,65 @@
+import numpy as np
+import torch
+
+from agents.replay_buffer import PrioritizedReplayBuffer, ReplayBuffer, SumTree
+
+
+def fill(buffer, n, state_size=3):
+    for i in range(n):
+        state = torch.full((state_size,), float(i))
+        buffer.push(state, i % 4, float(i), state + 1, i % 2 == 0)
+
+
+def test_ring_buffer_overwrites_oldest():
+    buffer = ReplayBuffer(capacity=5, state_size=3)
+    fill(buffer, 7)
+
+    assert len(buffer) == 5
+    assert sorted(buffer.rewards.tolist()) == [2.0, 3.0, 4.0, 5.0, 6.0]
+
+
+def test_push_batch_and_sample_shapes():
+    buffer = ReplayBuffer(capacity=16, state_size=3)
+    buffer.push_batch(
+        torch.ones(4, 3),
+        np.array([0, 1, 2, 3]),
+        np.ones(4),
+        torch.zeros(4, 3),
+        [True, False, True, False],
+    )
+
+    batch = buffer.sample(8)
+    assert len(buffer) == 4
+    assert batch.states.shape == (8, 3)
+    assert batch.actions.dtype == torch.int64
+    assert torch.equal(batch.weights, torch.ones(8))
+
+
+def test_sum_tree_find_respects_priorities():
+    tree = SumTree(4)
+    tree.update(np.arange(4), np.array([1.0, 0.0, 3.0, 0.0]))
+
+    assert tree.total == 4.0
+    assert tree.find([0.5, 1.5, 3.9]).tolist() == [0, 2, 2]
+
+
+def test_prioritized_sampling_prefers_large_td_errors():
+    buffer = PrioritizedReplayBuffer(capacity=8, state_size=3)
+    fill(buffer, 8)
+    buffer.update_priorities(torch.arange(8), torch.tensor([0.0] * 7 + [100.0]))
+
+    batch = buffer.sample(64)
+    assert (batch.indices == 7).float().mean() > 0.9
+    assert batch.weights.max() == 1.0
+
+
+def test_prioritized_push_gives_new_transitions_max_priority():
+    buffer = PrioritizedReplayBuffer(capacity=4, state_size=3)
+    fill(buffer, 2)
+    buffer.update_priorities(torch.arange(2), torch.tensor([4.0, 4.0]))
+    fill(buffer, 3)
+
+    # Trzecie przejście nadpisało indeks 0 - z największym dotąd priorytetem
+    leaves = buffer.tree.leaves(np.arange(4))
+    assert len(buffer) == 4 and buffer.position == 1
+    assert leaves[0] == leaves[2] == leaves[3] == buffer.max_priority > 1.0
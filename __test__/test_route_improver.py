@@ -0,0 +1,94 @@
+import numpy as np
+
+from brain.route_improver import _Tour, improve_route, route_length
+from brain.route_planner import sort_route_tsp
+from models.coordinate import Coordinate
+from models.gift_catalog import GiftCatalog
+
+LAPLAND = Coordinate(0, 0)
+
+
+def _catalog(dest_c, dest_r):
+    n = len(dest_c)
+    return GiftCatalog.from_columns(
+        names=[f"g{i}".encode() for i in range(n)],
+        scores=np.ones(n),
+        weights=np.ones(n),
+        dest_c=dest_c,
+        dest_r=dest_r,
+    )
+
+
+def _random_catalog(n, seed, spread=1000):
+    rng = np.random.default_rng(seed)
+    return _catalog(rng.integers(-spread, spread, n), rng.integers(-spread, spread, n))
+
+
+def test_removes_crossing():
+    # Kwadrat obchodzony "na krzyż": 0 -> (10,0) -> (0,10) -> (10,10) -> 0
+    catalog = _catalog([10, 0, 10], [0, 10, 10])
+    route = improve_route([0, 1, 2], catalog, LAPLAND)
+
+    assert route in ([0, 2, 1], [1, 2, 0])
+    assert route_length(route, catalog, LAPLAND) == 40
+
+
+def test_move_segment_keeps_positions_consistent():
+    tour = _Tour([0] * 8, [0] * 8)
+    # 0 [1 2] 3 4 5 6 7 -> 0 3 4 5 [2 1] 6 7
+    tour.move_segment(1, 2, 5, flip=True)
+    start = tour.pos[0]
+    order = tour.order[start:] + tour.order[:start]
+    assert order in ([0, 3, 4, 5, 2, 1, 6, 7], [0, 7, 6, 1, 2, 5, 4, 3])
+    assert all(tour.order[tour.pos[node]] == node for node in range(8))
+
+
+def test_never_worse_and_keeps_all_stops():
+    for seed in range(100):
+        rng = np.random.default_rng(seed)
+        n = int(rng.integers(3, 40))
+        catalog = _random_catalog(n, seed, spread=50)
+        start = list(rng.permutation(n))
+
+        route = improve_route(start, catalog, LAPLAND, time_budget=5)
+
+        assert sorted(route) == list(range(n))
+        assert route_length(route, catalog, LAPLAND) <= route_length(
+            start, catalog, LAPLAND
+        )
+
+
+def test_zero_budget_returns_same_route():
+    catalog = _random_catalog(50, 0)
+    start = sort_route_tsp(range(50), catalog, LAPLAND)
+
+    assert improve_route(start, catalog, LAPLAND, time_budget=0) == start
+    assert improve_route(start, catalog, LAPLAND, max_checks=0) == start
+
+
+def test_check_limit_is_deterministic():
+    catalog = _random_catalog(500, 2)
+    start = sort_route_tsp(range(500), catalog, LAPLAND)
+
+    short = improve_route(start, catalog, LAPLAND, max_checks=300)
+    full = improve_route(start, catalog, LAPLAND)
+
+    assert short == improve_route(start, catalog, LAPLAND, max_checks=300)
+    assert full == improve_route(start, catalog, LAPLAND)
+    assert (
+        route_length(full, catalog, LAPLAND)
+        < route_length(short, catalog, LAPLAND)
+        < route_length(start, catalog, LAPLAND)
+    )
+
+
+def test_shortens_nearest_neighbour_tour_of_thousands_of_stops():
+    catalog = _random_catalog(3000, 1)
+    start = sort_route_tsp(range(3000), catalog, LAPLAND)
+
+    route = improve_route(start, catalog, LAPLAND, time_budget=10)
+
+    assert sorted(route) == list(range(3000))
+    assert route_length(route, catalog, LAPLAND) < 0.92 * route_length(
+        start, catalog, LAPLAND
+    )
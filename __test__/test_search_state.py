@@ -0,0 +1,116 @@
+import os
+import random
+
+import pytest
+
+from core.actions import (
+    Direction,
+    accelerate,
+    deliver_gift,
+    floating,
+    load_carrots,
+    load_gifts,
+)
+from core.loader import load_problem
+from models.coordinate import Coordinate
+from models.gift_set import GiftSet
+from models.search_state import SearchState
+from models.sleigh_state import SleighState
+from models.velocity import Velocity
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+LAPLAND = Coordinate(0, 0)
+
+
+@pytest.fixture(scope="module")
+def simulator():
+    return load_problem(os.path.join(DATA_DIR, "b_better_hurry.in.txt"))[1]
+
+
+def _start(size):
+    return SleighState(
+        0,
+        Coordinate(0, 0),
+        Velocity(0, 0),
+        0,
+        0,
+        GiftSet(size),
+        GiftSet.full(size),
+        GiftSet(size),
+        False,
+    )
+
+
+def _random_step(state, simulator, rng):
+    """Losowe dozwolone przejście z core.actions (albo nic)."""
+    catalog = simulator.all_gifts_map
+    kind = rng.random()
+    if kind < 0.3 and not state.last_action_was_acceleration and state.carrot_count:
+        accelerate(state, simulator.accel_table, 1, rng.choice(list(Direction)))
+    elif kind < 0.5:
+        floating(state, rng.randint(1, 3))
+    elif kind < 0.6 and state.position.c**2 + state.position.r**2 <= 2500:
+        load_carrots(state, rng.randint(1, 5), LAPLAND, 50)
+    elif kind < 0.8 and state.available_gifts and state.position.c == 0:
+        gift_id = rng.choice(state.available_gifts.ids().tolist())
+        load_gifts(state, gift_id, catalog, LAPLAND, 10**9)
+    elif state.loaded_gifts:
+        gift_id = rng.choice(state.loaded_gifts.ids().tolist())
+        deliver_gift(state, gift_id, catalog, 10**9)
+
+
+def test_transitions_match_sleigh_state(simulator):
+    size = len(simulator.all_gifts_map)
+    reference = _start(size)
+    search = SearchState.from_state(reference)
+
+    for seed in range(300):
+        _random_step(reference, simulator, random.Random(seed))
+        _random_step(search, simulator, random.Random(seed))
+        assert search.to_state() == reference
+
+
+def test_restore_undoes_branch(simulator):
+    rng = random.Random(7)
+    search = SearchState.from_state(_start(len(simulator.all_gifts_map)))
+    for _ in range(50):
+        _random_step(search, simulator, rng)
+
+    before = search.to_state()
+    key = search.key()
+    snapshot = search.snapshot()
+    for _ in range(200):
+        _random_step(search, simulator, rng)
+
+    search.restore(snapshot)
+    assert search.to_state() == before
+    assert search.key() == key
+
+
+def test_nested_snapshots(simulator):
+    rng = random.Random(3)
+    search = SearchState.from_state(_start(len(simulator.all_gifts_map)))
+    keys, snapshots = [], []
+    for _ in range(20):
+        keys.append(search.key())
+        snapshots.append(search.snapshot())
+        for _ in range(10):
+            _random_step(search, simulator, rng)
+
+    for key, snapshot in zip(reversed(keys), reversed(snapshots)):
+        search.restore(snapshot)
+        assert search.key() == key
+
+
+def test_gift_hash_depends_only_on_sets(simulator):
+    size = len(simulator.all_gifts_map)
+    first = SearchState.from_state(_start(size))
+    second = SearchState.from_state(_start(size))
+
+    load_gifts(first, 0, simulator.all_gifts_map, LAPLAND, 1)
+    load_gifts(first, 1, simulator.all_gifts_map, LAPLAND, 1)
+    load_gifts(second, 1, simulator.all_gifts_map, LAPLAND, 1)
+    assert first.gift_hash() != second.gift_hash()
+    load_gifts(second, 0, simulator.all_gifts_map, LAPLAND, 1)
+    assert first.gift_hash() == second.gift_hash()
+    assert first.key() == second.key()
@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from brain.smart_solver import SmartSolver
+from core.loader import load_problem, load_travel_times
+from core.shared_problem import SharedProblem, attach_problem
+
+from .helpers import run_strict
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+EXAMPLE = os.path.join(DATA_DIR, "a_an_example.in.txt")
+
+_worker = None
+
+
+def _init_worker(handle):
+    global _worker
+    _worker = attach_problem(handle)
+
+
+def _describe(_):
+    problem, simulator = _worker
+    nearest = problem.spatial_index.iter_nearest(0, 0)
+    return (
+        problem.G,
+        int(problem.catalog.scores.sum()),
+        problem.catalog.name_of(0),
+        next(iter(nearest)),
+        simulator.accel_table.get_max_acceleration_for_weight(0),
+    )
+
+
+def test_attached_problem_matches_original():
+    problem, _ = load_problem(EXAMPLE)
+    travel = load_travel_times(EXAMPLE, problem, use_cache=False)
+
+    with SharedProblem(problem, travel) as shared:
+        view, simulator = attach_problem(shared.handle)
+
+        for column in ("names", "scores", "weights", "dest_c", "dest_r"):
+            expected = getattr(problem.catalog, column)
+            assert np.array_equal(getattr(view.catalog, column), expected)
+        assert view.catalog.scores.flags.writeable is False
+        assert (view.T, view.D, view.W, view.G) == (
+            problem.T,
+            problem.D,
+            problem.W,
+            problem.G,
+        )
+        assert view.acceleration_ranges == problem.acceleration_ranges
+        assert view.catalog[1] == problem.catalog[1]
+        assert np.array_equal(view.travel_times.base_times, travel.base_times)
+
+        # Solver działa na widoku tak samo jak na wczytanym problemie
+        state, _ = run_strict(SmartSolver(), view, simulator)
+        assert len(state.delivered_gifts) == len(problem.catalog)
+
+
+def test_workers_attach_without_parsing():
+    problem, simulator = load_problem(EXAMPLE)
+    expected = _describe_local(problem, simulator)
+
+    with SharedProblem(problem) as shared:
+        with ProcessPoolExecutor(
+            max_workers=2,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(shared.handle,),
+        ) as executor:
+            results = list(executor.map(_describe, range(4)))
+
+    assert results == [expected] * 4
+
+
+def test_closed_block_cannot_be_attached():
+    problem, _ = load_problem(EXAMPLE)
+    shared = SharedProblem(problem)
+    handle = shared.handle
+    shared.close()
+    shared.close()
+
+    with pytest.raises(FileNotFoundError):
+        attach_problem(handle)
+
+
+def _describe_local(problem, simulator):
+    global _worker
+    _worker = (problem, simulator)
+    return _describe(None)
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from core.actions import Action
+from core.loader import load_problem
+from core.solution_validator import SolutionValidator
+from output.output_writer import OutputWriter
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+VALID_SOLUTION = [
+    "LoadCarrots 5",
+    "LoadGift Olivia",
+    "LoadGift Liam",
+    "AccRight 2",
+    "Float 2",
+    "DeliverGift Olivia",
+    "AccUp 1",
+    "Float 2",
+    "DeliverGift Liam",
+]
+
+
+@pytest.fixture
+def validator():
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "a_an_example.in.txt"))
+    return SolutionValidator(problem, simulator.accel_table)
+
+
+def _lines(commands, count=None):
+    return [str(len(commands) if count is None else count)] + commands
+
+
+def test_valid_solution_score(validator):
+    result = validator.validate_lines(_lines(VALID_SOLUTION))
+
+    assert result.valid, result.violation
+    assert result.score == 6
+    assert result.commands == len(VALID_SOLUTION)
+    assert validator.state.current_time == 4
+
+
+def test_float_k_matches_k_single_floats(validator):
+    split = VALID_SOLUTION[:4] + ["Float 1", "Float 1"] + VALID_SOLUTION[5:]
+    validator.validate_lines(_lines(split))
+    expected = validator.state.clone()
+
+    validator.validate_lines(_lines(VALID_SOLUTION))
+    assert validator.state == expected
+
+
+@pytest.mark.parametrize(
+    "position, command, message",
+    [
+        (4, "AccUp 1", "two accelerations"),
+        (3, "AccRight 7", "outside 0..6"),
+        (5, "Float 39", "time limit"),
+        (5, "DeliverGift Liam", "out of range"),
+        (2, "LoadGift Olivia", "not available"),
+        (0, "AccUp 1", "without carrots"),
+        (1, "LoadGift Nobody", "unknown gift"),
+    ],
+)
+def test_reports_first_violation(validator, position, command, message):
+    commands = VALID_SOLUTION[:position] + [command] + VALID_SOLUTION[position:]
+    result = validator.validate_lines(_lines(commands))
+
+    assert not result.valid
+    assert message in result.violation
+    assert result.line == position + 2
+
+
+def test_count_mismatch(validator):
+    result = validator.validate_lines(_lines(VALID_SOLUTION, count=3))
+
+    assert not result.valid
+    assert result.line == 1
+
+
+def test_validates_writer_output(tmp_path, validator):
+    path = str(tmp_path / "solution.txt")
+    with OutputWriter(path, gift_names=validator.catalog) as writer:
+        for line in VALID_SOLUTION:
+            name, value = line.split()
+            action = {"LoadGift": Action.LoadGifts, "DeliverGift": Action.DeliverGift}
+            if name in action:
+                writer.record(action[name], value)
+            elif name == "Float":
+                for _ in range(int(value)):
+                    writer.record(Action.Floating, 1)
+            else:
+                writer.record(getattr(Action, name), int(value))
+
+    result = validator.validate_file(path)
+    assert result.valid, result.violation
+    assert result.score == 6
@@ -0,0 +1,62 @@
+import numpy as np
+
+from core.spatial_index import GiftSpatialIndex
+
+
+def _points(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(-1000, 1000, n), rng.integers(-300, 300, n)
+
+
+def _brute_order(xs, ys, x, y, alive):
+    d = (xs - x) ** 2 + (ys - y) ** 2
+    ids = [i for i in np.lexsort((np.arange(len(xs)), d)) if alive[i]]
+    return [int(i) for i in ids]
+
+
+def test_within_matches_brute_force():
+    xs, ys = _points()
+    index = GiftSpatialIndex(xs, ys)
+
+    for x, y, radius in [(0, 0, 50), (900, -200, 120), (-2000, 0, 1500), (3, 7, 0)]:
+        d2 = (xs - x) ** 2 + (ys - y) ** 2
+        expected = set(np.flatnonzero(d2 <= radius * radius).tolist())
+        assert set(index.within(x, y, radius).tolist()) == expected
+
+
+def test_iter_nearest_order_and_remove():
+    xs, ys = _points()
+    index = GiftSpatialIndex(xs, ys)
+    alive = np.ones(len(xs), dtype=bool)
+
+    for gift_id in range(0, len(xs), 3):
+        index.remove(gift_id)
+        alive[gift_id] = False
+
+    assert len(index) == alive.sum()
+    for x, y in [(0, 0), (999, 299), (-5000, 4000)]:
+        expected = _brute_order(xs, ys, x, y, alive)
+        got = list(index.iter_nearest(x, y))
+        d2 = lambda i: (xs[i] - x) ** 2 + (ys[i] - y) ** 2
+        assert sorted(got) == sorted(expected)
+        assert [d2(i) for i in got] == [d2(i) for i in expected]
+
+
+def test_copy_has_own_removals():
+    xs, ys = _points(50)
+    index = GiftSpatialIndex(xs, ys)
+    clone = index.copy()
+    clone.remove(0)
+
+    assert 0 in index
+    assert 0 not in clone
+    assert len(clone) == len(index) - 1
+
+
+def test_subset_ids():
+    xs, ys = _points(20)
+    ids = np.arange(100, 120)
+    index = GiftSpatialIndex(xs, ys, ids=ids)
+
+    assert set(index.nearest(0, 0, k=20)) == set(ids.tolist())
+    assert 5 not in index
@@ -0,0 +1,41 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import torch
+
+from agents.genetic_population import GeneticPopulation
+from core.loader import load_problem
+from core.shared_problem import SharedProblem
+from env.vector_sleigh_env import VectorSleighEnv
+from train_genetic import _init_worker, evaluate_parallel, evaluate_population
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def test_parallel_fitness_matches_serial():
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "new_challenge.in.txt"))
+    vec_env = VectorSleighEnv(problem, simulator, 6, autoreset=False)
+    torch.manual_seed(0)
+    population = GeneticPopulation(
+        6,
+        vec_env.input_size,
+        vec_env.ACTION_SPACE_SIZE,
+        device=torch.device("cpu"),
+    )
+
+    rewards, delivered = evaluate_population(vec_env, population)
+
+    with SharedProblem(problem) as shared, ProcessPoolExecutor(
+        max_workers=2,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(shared.handle,),
+    ) as executor:
+        parallel_rewards, parallel_delivered = evaluate_parallel(
+            executor, population, 2
+        )
+
+    assert np.allclose(parallel_rewards, rewards)
+    assert np.array_equal(parallel_delivered, delivered)
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from brain.trajectory import count_accelerations, plan_leg
+from core.actions import Action
+
+VELOCITY_CHANGE = {
+    Action.AccUp: (0, 1),
+    Action.AccDown: (0, -1),
+    Action.AccLeft: (-1, 0),
+    Action.AccRight: (1, 0),
+}
+
+
+def _replay(schedule, vc, vr, max_acc):
+    c = r = 0
+    last_was_acceleration = False
+    for action, value in schedule:
+        if action == Action.Floating:
+            assert value >= 1
+            c += vc * value
+            r += vr * value
+            last_was_acceleration = False
+        else:
+            assert not last_was_acceleration
+            assert 1 <= value <= max_acc
+            dc, dr = VELOCITY_CHANGE[action]
+            vc += dc * value
+            vr += dr * value
+            last_was_acceleration = True
+    return c, r, vc, vr
+
+
+def test_random_legs_stop_within_range():
+    rng = random.Random(0)
+    for _ in range(500):
+        dx, dy = rng.randint(-300, 300), rng.randint(-300, 300)
+        vc, vr = rng.randint(-8, 8), rng.randint(-8, 8)
+        max_acc = rng.choice([1, 2, 4, 6, 8])
+        radius = rng.randint(0, 10)
+
+        schedule = plan_leg(dx, dy, vc, vr, max_acc, radius)
+        c, r, end_vc, end_vr = _replay(schedule, vc, vr, max_acc)
+
+        assert (end_vc, end_vr) == (0, 0)
+        assert (c - dx) ** 2 + (r - dy) ** 2 <= radius * radius
+
+
+def test_straight_leg_uses_full_acceleration():
+    schedule = plan_leg(200, 0, 0, 0, 8, 0)
+
+    assert schedule[0] == (Action.AccRight, 8)
+    assert _replay(schedule, 0, 0, 8) == (200, 0, 0, 0)
+    # Przy a=1 ten sam odcinek wymaga dużo więcej przyspieszeń
+    slow = plan_leg(200, 0, 0, 0, 1, 0)
+    assert count_accelerations(schedule) < count_accelerations(slow)
+
+
+def test_already_stopped_in_range_is_empty():
+    assert plan_leg(2, 1, 0, 0, 3, 3) == ()
+
+
+def test_memoized():
+    plan_leg.cache_clear()
+    first = plan_leg(50, -40, 1, 2, 4, 3)
+    second = plan_leg(50, -40, 1, 2, 4, 3)
+
+    assert first is second
+    assert plan_leg.cache_info().hits == 1
+
+
+def test_rejects_zero_acceleration():
+    with pytest.raises(ValueError):
+        plan_leg(10, 10, 0, 0, 0, 3)
@@ -0,0 +1,138 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from brain.route_planner import sort_route_tsp
+from core.loader import load_problem, load_travel_times
+from core.problem_cache import travel_cache_path_for
+from core.travel_time import (
+    BASE,
+    TravelTimeMatrix,
+    estimate_travel_time,
+    nearest_neighbours,
+    straight_travel_time,
+)
+from models.coordinate import Coordinate
+from models.gift_catalog import GiftCatalog
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def _brute_force_time(dist, max_acc):
+    """BFS po (pozycja, prędkość) na osi - od postoju do postoju."""
+    frontier = {(0, 0)}
+    for ticks in range(1, 100):
+        frontier = {
+            (pos + vel + a, vel + a)
+            for pos, vel in frontier
+            for a in range(-max_acc, max_acc + 1)
+            if -1 <= pos + vel + a <= dist + 1
+        }
+        # Ostatnie hamowanie do zera nie wymaga już kroku
+        if any(pos == dist and abs(vel) <= max_acc for pos, vel in frontier):
+            return ticks
+    raise AssertionError("unreachable")
+
+
+@pytest.mark.parametrize("max_acc", [1, 2, 3])
+def test_straight_travel_time_is_optimal(max_acc):
+    dists = np.arange(0, 60)
+    got = straight_travel_time(dists, max_acc)
+
+    assert got[0] == 0
+    for dist in range(1, 60):
+        assert got[dist] == _brute_force_time(dist, max_acc)
+
+
+def test_estimate_accounts_for_range():
+    assert estimate_travel_time(3, 4, 1, 7) == 0
+    assert estimate_travel_time(-30, 0, 2, 5) == straight_travel_time(25, 2)
+
+
+def test_nearest_neighbours_matches_brute_force():
+    rng = np.random.default_rng(0)
+    xs = rng.integers(-500, 500, 700)
+    ys = rng.integers(-500, 500, 700)
+    # Skupisko, żeby siatka miała puste i przepełnione komórki
+    xs[:100] = rng.integers(0, 5, 100)
+
+    got = nearest_neighbours(xs, ys, 8)
+
+    d2 = (xs[:, None] - xs[None, :]) ** 2 + (ys[:, None] - ys[None, :]) ** 2
+    np.fill_diagonal(d2, np.iinfo(np.int64).max)
+    expected = np.sort(d2, axis=1)[:, :8]
+    assert np.array_equal(np.take_along_axis(d2, got.astype(np.int64), 1), expected)
+
+
+def _catalog(n, seed=1):
+    rng = np.random.default_rng(seed)
+    return GiftCatalog.from_columns(
+        names=[f"g{i}".encode() for i in range(n)],
+        scores=np.ones(n),
+        weights=np.ones(n),
+        dest_c=rng.integers(-300, 300, n),
+        dest_r=rng.integers(-300, 300, n),
+    )
+
+
+def test_dense_and_sparse_agree():
+    catalog = _catalog(200)
+    ranges = load_problem(
+        os.path.join(DATA_DIR, "a_an_example.in.txt"), use_cache=False
+    )[0].acceleration_ranges
+    dense = TravelTimeMatrix.build(catalog, ranges, 10)
+    sparse = TravelTimeMatrix.build(catalog, ranges, 10, k=6)
+    assert dense.dense and not sparse.dense and sparse.k == 6
+
+    for a in dense.accels.tolist():
+        for g in range(0, 200, 17):
+            assert dense.from_base(g, a) == sparse.from_base(g, a)
+            for h in (0, 5, 199):
+                assert dense.between(g, h, a) == sparse.between(g, h, a)
+            for h in sparse.neighbours_of(g)[:3].tolist():
+                assert dense.between(g, h, a) == sparse.between(g, h, a)
+            # Sąsiedzi z macierzy, pozostałe punkty liczone na miejscu
+            points = np.arange(201)
+            assert np.array_equal(
+                sparse.times_from(g + 1, points, a), dense.times_from(g + 1, points, a)
+            )
+        assert dense.time(BASE, 3, a) == dense.time(3, BASE, a)
+
+    with pytest.raises(KeyError):
+        dense.class_of(999)
+
+
+def test_cached_on_disk(tmp_path):
+    path = str(tmp_path / "a_an_example.in.txt")
+    shutil.copy(os.path.join(DATA_DIR, "a_an_example.in.txt"), path)
+    problem, _ = load_problem(path)
+
+    built = load_travel_times(path, problem, use_cache=True)
+    assert os.path.exists(travel_cache_path_for(path))
+    cached = load_travel_times(path, problem, use_cache=True)
+    assert np.array_equal(cached.times, built.times)
+    assert np.array_equal(cached.base_times, built.base_times)
+
+    sparse = load_travel_times(path, problem, k=2, use_cache=True)
+    assert sparse.k == 2
+
+
+def test_route_by_travel_time_visits_all():
+    problem, simulator = load_problem(
+        os.path.join(DATA_DIR, "a_an_example.in.txt"), use_cache=False
+    )
+    matrix = TravelTimeMatrix.build(
+        problem.catalog, problem.acceleration_ranges, problem.D
+    )
+    gifts = list(range(problem.G))
+    max_acc = int(matrix.accels[-1])
+
+    route = sort_route_tsp(
+        gifts, simulator.all_gifts_map, Coordinate(0, 0), matrix, max_acc
+    )
+    assert sorted(route) == gifts
+    assert matrix.from_base(route[0], max_acc) == min(
+        matrix.from_base(g, max_acc) for g in gifts
+    )
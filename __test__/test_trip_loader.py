@@ -0,0 +1,143 @@
+import itertools
+import os
+
+import numpy as np
+
+from core import trip_loader
+from core.actions import solve_knapsack_greedy
+from core.loader import load_problem
+from core.simulator import Simulator
+from core.trip_loader import TripLoader
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def _brute_force(weights, scores, capacity):
+    best = 0
+    for r in range(len(weights) + 1):
+        for combo in itertools.combinations(range(len(weights)), r):
+            if sum(weights[i] for i in combo) <= capacity:
+                best = max(best, sum(scores[i] for i in combo))
+    return best
+
+
+def test_single_class_is_optimal():
+    rng = np.random.default_rng(0)
+    for _ in range(60):
+        n = int(rng.integers(1, 11))
+        weights = rng.integers(0, 15, n)
+        scores = rng.integers(0, 20, n)
+        capacity = int(rng.integers(0, 40))
+        loader = TripLoader([(capacity, 1)], weights, scores)
+
+        chosen = loader.select(np.arange(n), 0)
+
+        assert weights[chosen].sum() <= capacity
+        assert scores[chosen].sum() == _brute_force(weights, scores, capacity)
+
+
+def test_prefers_lighter_class_when_it_pays_off():
+    weights = np.array([10, 10, 10])
+    scores = np.array([10, 12, 30])
+    everything = np.arange(3)
+
+    # Trzeci prezent przesuwa sanie do klasy 16x słabszego przyspieszenia
+    assert TripLoader([(20, 16), (30, 1)], weights, scores).select(
+        everything, 0
+    ).tolist() == [1, 2]
+
+    slow = TripLoader([(20, 4), (30, 3)], weights, scores)
+    assert slow.select(everything, 0).tolist() == [0, 1, 2]
+    # Punkty już na pokładzie też tracą na wolniejszej klasie
+    assert slow.select(everything, 0, loaded_score=1000).tolist() == [1, 2]
+
+
+def test_nothing_fits():
+    loader = TripLoader([(15, 8)], np.array([5]), np.array([3]))
+    assert loader.select([0], 15).tolist() == []
+    assert loader.select([0], 16).tolist() == []
+    assert loader.select([], 0).tolist() == []
+
+
+def test_approximation_is_feasible_and_close(monkeypatch):
+    rng = np.random.default_rng(1)
+    weights = rng.integers(1, 50, 3000)
+    scores = rng.integers(1, 100, 3000)
+    loader = TripLoader([(1000, 1)], weights, scores)
+    exact = scores[loader.select(np.arange(3000), 0)].sum()
+
+    monkeypatch.setattr(trip_loader, "MAX_DP_CAPACITY", 100)
+    monkeypatch.setattr(trip_loader, "DP_CELL_LIMIT", 101 * 200)
+    chosen = loader.select(np.arange(3000), 0)
+
+    assert weights[chosen].sum() <= 1000
+    assert scores[chosen].sum() >= 0.97 * exact
+
+
+def test_solve_knapsack_greedy_uses_loader():
+    problem, _ = load_problem(os.path.join(DATA_DIR, "a_an_example.in.txt"))
+    catalog = problem.catalog
+
+    chosen = solve_knapsack_greedy(range(len(catalog)), catalog, 35, 10)
+
+    assert catalog.weights[chosen].sum() <= 25
+    assert catalog.scores[chosen].sum() == _brute_force(
+        catalog.weights.tolist(), catalog.scores.tolist(), 25
+    )
+
+
+def _knapsack_simulator(name):
+    problem, simulator = load_problem(os.path.join(DATA_DIR, name))
+    return problem, Simulator(
+        problem.T, problem.D, simulator.accel_table, problem.catalog, knapsack_load=True
+    )
+
+
+def test_simulator_loads_knapsack_choice():
+    problem, simulator = _knapsack_simulator("a_an_example.in.txt")
+    simulator.reset()
+    expected = simulator.trip_loader.select(
+        simulator.state.available_gifts.ids(), simulator.state.sleigh_weight
+    )
+
+    simulator.handle_action(0, 0, 1, 0)
+
+    assert simulator.state.loaded_gifts.ids().tolist() == expected.tolist()
+    assert (
+        simulator.accel_table.get_max_acceleration_for_weight(
+            simulator.state.sleigh_weight
+        )
+        > 0
+    )
+
+
+def test_repeated_load_reuses_knapsack(monkeypatch):
+    problem, simulator = _knapsack_simulator("new_challenge.in.txt")
+    calls = []
+    knapsack_table = trip_loader.knapsack_table
+
+    def counting_table(*args):
+        calls.append(1)
+        return knapsack_table(*args)
+
+    monkeypatch.setattr(trip_loader, "knapsack_table", counting_table)
+    loads = []
+    for _ in range(3):
+        simulator.reset()
+        simulator.handle_action(0, 0, 1, 0)
+        loads.append(simulator.state.loaded_gifts.ids().tolist())
+
+    assert len(calls) == 1
+    assert loads[0] == loads[1] == loads[2]
+    assert simulator.state.sleigh_weight == 10 + problem.catalog.weights[loads[0]].sum()
+
+
+def test_simulator_loads_everything_that_fits_by_default():
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "a_an_example.in.txt"))
+    simulator.reset()
+
+    simulator.handle_action(0, 0, 1, 0)
+
+    # Bez knapsack_load - wszystkie prezenty po kolei, póki sanie przyspieszają
+    assert simulator.trip_loader is None
+    assert simulator.state.loaded_gifts.ids().tolist() == list(range(problem.G))
@@ -0,0 +1,152 @@
+import os
+
+import numpy as np
+
+from brain import smart_solver, trip_planner
+from brain.smart_solver import SmartSolver
+from brain.trip_planner import default_capacity, plan_trips, sweep_partition
+from core.loader import load_problem, load_travel_times
+from models.gift_catalog import GiftCatalog
+
+from .helpers import run_strict
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+CLUSTERS = [(50, 50), (-50, 50), (50, -50), (-50, -50)]
+
+
+def _clustered_catalog(per_cluster=12, seed=0):
+    rng = np.random.default_rng(seed)
+    dest_c, dest_r = [], []
+    for cx, cy in CLUSTERS:
+        dest_c.extend(cx + rng.integers(-30, 31, per_cluster))
+        dest_r.extend(cy + rng.integers(-30, 31, per_cluster))
+    n = len(dest_c)
+    return GiftCatalog.from_columns(
+        names=[f"g{i}".encode() for i in range(n)],
+        scores=np.arange(1, n + 1),
+        weights=np.full(n, 5),
+        dest_c=dest_c,
+        dest_r=dest_r,
+    )
+
+
+def test_sweep_keeps_clusters_apart():
+    catalog = _clustered_catalog()
+    # Jeden kurs mieści dokładnie jedno skupisko
+    groups = sweep_partition(catalog.dest_c, catalog.dest_r, catalog.weights, 60)
+
+    assert len(groups) == 4
+    assert sorted(np.concatenate(groups).tolist()) == list(range(48))
+    for group in groups:
+        assert catalog.weights[group].sum() <= 60
+        assert len(set((group // 12).tolist())) == 1
+
+
+def test_sweep_keeps_cluster_on_angle_seam_together():
+    # Skupisko na ujemnej osi c leży po obu stronach granicy -pi/pi
+    rng = np.random.default_rng(1)
+    dest_c = np.concatenate(
+        [-60 + rng.integers(-5, 6, 10), 60 + rng.integers(-5, 6, 10)]
+    )
+    dest_r = np.concatenate([rng.integers(-8, 9, 10), rng.integers(-8, 9, 10)])
+    groups = sweep_partition(dest_c, dest_r, np.full(20, 5), 50)
+
+    assert len(groups) == 2
+    for group in groups:
+        assert len(set((group // 10).tolist())) == 1
+
+
+def test_sweep_skips_too_heavy_gifts():
+    weights = np.array([5, 100, 5])
+    groups = sweep_partition(np.array([1, 2, 3]), np.array([0, 0, 0]), weights, 10)
+
+    assert [g.tolist() for g in groups] == [[0, 2]]
+
+
+def test_plan_trips_orders_by_score_per_time():
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "huge_challenge.in.txt"))
+    catalog = _clustered_catalog()
+    table = simulator.accel_table
+
+    trips = plan_trips(catalog, table, problem.D, base_weight=10, capacity=30)
+
+    assert sorted(g for trip in trips for g in trip.gift_ids) == list(range(48))
+    assert all(trip.weight <= 30 for trip in trips)
+    density = [trip.score / trip.est_time for trip in trips]
+    assert density == sorted(density, reverse=True)
+    assert default_capacity(table, 10) > 0
+
+
+def test_plan_trips_drops_unreachable_gifts():
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "a_an_example.in.txt"))
+
+    trips = plan_trips(problem.catalog, simulator.accel_table, problem.D, time_limit=8)
+    planned = {g for trip in trips for g in trip.gift_ids}
+
+    # Bob (0, -100) jest za daleko na 8 kroków
+    assert 3 not in planned
+    assert planned
+
+
+def test_plan_trips_reads_travel_time_matrix():
+    path = os.path.join(DATA_DIR, "a_an_example.in.txt")
+    problem, simulator = load_problem(path)
+    problem.travel_times = load_travel_times(path, problem)
+    table = simulator.accel_table
+
+    [trip] = plan_trips(
+        problem.catalog, table, problem.D, travel_times=problem.travel_times
+    )
+    accel = table.get_max_acceleration_for_weight(default_capacity(table, 0))
+    stops = [
+        problem.travel_times.between(a, b, accel)
+        for a, b in zip(trip.gift_ids, trip.gift_ids[1:])
+    ]
+    farthest = max(problem.travel_times.from_base(g, accel) for g in trip.gift_ids)
+
+    assert sorted(trip.gift_ids) == list(range(problem.G))
+    assert trip.est_time == 2 * farthest + sum(stops)
+    state, _ = run_strict(SmartSolver(), problem, simulator)
+    assert len(state.delivered_gifts) == len(problem.catalog)
+
+
+def test_smart_solver_plans_mission_once(monkeypatch):
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "a_an_example.in.txt"))
+    calls = []
+
+    def counting_plan_trips(*args, **kwargs):
+        calls.append(args)
+        return trip_planner.plan_trips(*args, **kwargs)
+
+    monkeypatch.setattr(smart_solver, "plan_trips", counting_plan_trips)
+    state, _ = run_strict(SmartSolver(), problem, simulator)
+
+    assert len(calls) == 1
+    assert len(state.delivered_gifts) == len(problem.catalog)
+
+
+def test_trimmed_gifts_stay_in_plan(monkeypatch):
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "new_challenge.in.txt"))
+    everything = list(range(len(problem.catalog)))
+    trip = trip_planner.Trip(everything, 0, 0, est_time=1)
+    monkeypatch.setattr(smart_solver, "plan_trips", lambda *args, **kwargs: [trip])
+    solver = SmartSolver()
+
+    loaded = solver._next_planned_trip(
+        simulator.reset(), problem, simulator.accel_table, problem.catalog
+    )
+
+    assert 0 < len(loaded) < len(everything)
+    assert len(solver.trips) == 1
+    leftover = solver.trips[0].gift_ids
+    assert sorted(loaded + leftover) == everything
+    assert solver.trips[0].weight == problem.catalog.weights[leftover].sum()
+
+
+def test_planned_trip_leaves_room_for_carrots():
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "huge_challenge.in.txt"))
+
+    state, _ = run_strict(SmartSolver(), problem, simulator)
+
+    # Kurs przycięty do ładowności bez marchewek utykał w połowie trasy
+    assert len(state.delivered_gifts) == problem.G
@@ -0,0 +1,128 @@
+import itertools
+import os
+
+import numpy as np
+
+from brain.smart_solver import SmartSolver
+from core.loader import load_problem
+from core.travel_time import estimate_travel_time
+from core.trip_selector import BranchAndBoundSelector
+
+from .helpers import run_strict
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+CLASSES = [(20, 8), (40, 4), (60, 1)]
+
+
+def _random_gifts(rng, n):
+    return (
+        rng.integers(1, 15, n),
+        rng.integers(0, 30, n),
+        rng.integers(-200, 201, n),
+        rng.integers(-200, 201, n),
+    )
+
+
+def _rate(chosen, weights, scores, dest_c, dest_r, time_left=None):
+    """Punkty na krok kursu - ta sama miara, którą maksymalizuje selektor."""
+    chosen = list(chosen)
+    if not chosen:
+        return 0.0
+    weight = weights[chosen].sum()
+    accel = next((a for limit, a in CLASSES if weight <= limit), None)
+    if accel is None:
+        return None
+    one_way = estimate_travel_time(dest_c[chosen], dest_r[chosen], accel, 3)
+    trip = max(1, 2 * int(one_way.max()))
+    if time_left is not None and trip > time_left:
+        return None
+    return scores[chosen].sum() / trip
+
+
+def test_matches_exhaustive_search():
+    rng = np.random.default_rng(0)
+    for _ in range(40):
+        n = int(rng.integers(1, 10))
+        gifts = _random_gifts(rng, n)
+        time_left = int(rng.integers(20, 80))
+        selector = BranchAndBoundSelector(CLASSES, *gifts, range_d=3)
+
+        chosen = selector.select(np.arange(n), 0, time_left=time_left)
+
+        best = max(
+            rate
+            for r in range(n + 1)
+            for combo in itertools.combinations(range(n), r)
+            if (rate := _rate(combo, *gifts, time_left)) is not None
+        )
+        assert selector.exhausted
+        assert np.isclose(_rate(chosen, *gifts, time_left), best)
+
+
+def test_loaded_gifts_count_in_trip_time():
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        n = int(rng.integers(1, 8))
+        gifts = _random_gifts(rng, n + 1)
+        # Ostatni prezent jest już na saniach i leży daleko od bazy
+        gifts[2][n] = 400
+        weights, scores = gifts[0], gifts[1]
+        selector = BranchAndBoundSelector(CLASSES, *gifts, range_d=3)
+
+        chosen = selector.select(
+            np.arange(n), weights[n], loaded_score=scores[n], loaded=[n]
+        )
+
+        best = max(
+            rate
+            for r in range(1, n + 1)
+            for combo in itertools.combinations(range(n), r)
+            if (rate := _rate(combo + (n,), *gifts)) is not None
+        )
+        assert selector.exhausted
+        assert np.isclose(_rate(list(chosen) + [n], *gifts), best)
+
+
+def test_node_budget_keeps_feasible_result():
+    rng = np.random.default_rng(1)
+    gifts = _random_gifts(rng, 400)
+    selector = BranchAndBoundSelector(
+        CLASSES, *gifts, range_d=3, max_nodes=200, time_budget=10.0
+    )
+
+    chosen = selector.select(np.arange(400), 0)
+
+    assert selector.nodes <= 201 and not selector.exhausted
+    assert gifts[0][chosen].sum() <= 60
+    assert _rate(chosen, *gifts) > 0
+
+
+def test_time_budget_per_trip():
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "mini_challenge.in.txt"))
+    rng = np.random.default_rng(2)
+    gifts = _random_gifts(rng, 2000)
+    selector = BranchAndBoundSelector(
+        CLASSES, *gifts, range_d=3, max_nodes=10**9, time_budget=0.02
+    )
+
+    selector.select(np.arange(2000), 0)
+    # Przerwał zegar, nie limit węzłów
+    assert not selector.exhausted
+    assert 0 < selector.nodes < 10**9
+
+    # Z katalogu zadania
+    selector = BranchAndBoundSelector.from_table(
+        simulator.accel_table, problem.catalog, problem.D
+    )
+    chosen = selector.select(np.arange(len(problem.catalog)), 0, time_left=problem.T)
+    assert len(chosen) > 0
+
+
+def test_smart_solver_with_branch_and_bound():
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "mini_challenge.in.txt"))
+
+    state, _ = run_strict(
+        SmartSolver(use_branch_and_bound=True, use_trip_plan=False), problem, simulator
+    )
+
+    assert len(state.delivered_gifts) == len(problem.catalog)
@@ -0,0 +1,64 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+from core.loader import load_problem
+from env.sleigh_env import SleighEnv
+from env.vector_sleigh_env import VectorSleighEnv
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+N_ENVS = 4
+
+
+def biased_action(rng: random.Random):
+    # Częściej LOAD/FUEL/DELIVER niż przy losowaniu jednostajnym
+    if rng.random() < 0.3:
+        return rng.choice([9, 10, 11])
+    return rng.randrange(SleighEnv.ACTION_SPACE_SIZE)
+
+
+@pytest.mark.parametrize("instance", ["a_an_example.in.txt", "new_challenge.in.txt"])
+def test_vector_env_matches_scalar_env(instance):
+    path = os.path.join(DATA_DIR, instance)
+    envs = [SleighEnv(*load_problem(path)) for _ in range(N_ENVS)]
+    problem, simulator = load_problem(path)
+    vec_env = VectorSleighEnv(problem, simulator, N_ENVS, autoreset=False)
+
+    observations = vec_env.reset()
+    for i, env in enumerate(envs):
+        assert np.allclose(observations[i].numpy(), env.reset().numpy())
+
+    rng = random.Random(7)
+    finished = [False] * N_ENVS
+    for _ in range(300):
+        actions = [biased_action(rng) for _ in range(N_ENVS)]
+        observations, rewards, dones, _ = vec_env.step(actions)
+
+        for i, env in enumerate(envs):
+            if finished[i]:
+                assert rewards[i] == 0.0
+                continue
+            obs, reward, done, _ = env.step(actions[i])
+            assert np.allclose(observations[i].numpy(), obs.numpy())
+            assert rewards[i] == pytest.approx(reward)
+            assert dones[i] == done
+            finished[i] = done
+
+
+def test_autoreset_returns_final_observation():
+    problem, simulator = load_problem(os.path.join(DATA_DIR, "a_an_example.in.txt"))
+    vec_env = VectorSleighEnv(problem, simulator, 2, max_episode_steps=3)
+    vec_env.reset()
+
+    for _ in range(2):
+        _, _, dones, _ = vec_env.step([8, 8])
+        assert not dones.any()
+
+    observations, _, dones, info = vec_env.step([8, 8])
+    assert dones.all()
+    assert info["truncated"].all()
+    assert "final_observation" in info
+    assert (vec_env.episode_steps == 0).all()
+    assert np.allclose(observations.numpy(), vec_env.reset().numpy())
@@ -1,10 +1,11 @@
 import random
-from collections import deque
 
 import torch
 import torch.nn as nn
 import torch.optim as optim
 
+from agents.replay_buffer import PrioritizedReplayBuffer, ReplayBuffer
+
 
 class DuelingDQN(nn.Module):
     def __init__(self, input_dim, output_dim):
@@ -30,20 +31,28 @@ class DuelingDQN(nn.Module):
 
 
 class DQNAgent:
-    def __init__(self, state_size, action_size, learning_rate=0.0001):
+    def __init__(
+        self,
+        state_size,
+        action_size,
+        learning_rate=0.0001,
+        memory_size=100000,
+        prioritized=False,
+    ):
         self.state_size = state_size
         self.action_size = action_size
-        self.memory = deque(maxlen=100000)
         self.gamma = 0.99
         self.batch_size = 128
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
+        buffer_cls = PrioritizedReplayBuffer if prioritized else ReplayBuffer
+        self.memory = buffer_cls(memory_size, state_size, self.device)
+
         self.policy_net = DuelingDQN(state_size, action_size).to(self.device)
         self.target_net = DuelingDQN(state_size, action_size).to(self.device)
         self.update_target_network()
 
         self.optimizer = optim.Adam(self.policy_net.parameters(), lr=learning_rate)
-        self.loss_fn = nn.MSELoss()
 
     def update_target_network(self):
         self.target_net.load_state_dict(self.policy_net.state_dict())
@@ -59,22 +68,33 @@ class DQNAgent:
             q_values = self.policy_net(state)
             return torch.argmax(q_values).item()
 
+    def get_actions(self, states, epsilon):
+        """Akcje dla całego batcha stanów (N, state_size) - jeden forward pass."""
+        with torch.no_grad():
+            q_values = self.policy_net(states.to(self.device))
+            actions = q_values.argmax(dim=1).cpu()
+
+        explore = torch.rand(actions.shape[0]) < epsilon
+        if explore.any():
+            actions[explore] = torch.randint(0, self.action_size, (int(explore.sum()),))
+        return actions
+
     def remember(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))
+        self.memory.push(state, action, reward, next_state, done)
+
+    def remember_batch(self, states, actions, rewards, next_states, dones):
+        self.memory.push_batch(states, actions, rewards, next_states, dones)
 
     def update(self):
         if len(self.memory) < self.batch_size:
             return
 
-        minibatch = random.sample(self.memory, self.batch_size)
-
-        states = torch.stack([x[0] for x in minibatch]).to(self.device)
-        actions = torch.tensor([x[1] for x in minibatch]).to(self.device).unsqueeze(1)
-        rewards = torch.tensor([x[2] for x in minibatch]).to(self.device)
-        next_states = torch.stack([x[3] for x in minibatch]).to(self.device)
-        dones = torch.tensor([x[4] for x in minibatch], dtype=torch.float32).to(
-            self.device
-        )
+        batch = self.memory.sample(self.batch_size)
+        states = batch.states
+        actions = batch.actions.unsqueeze(1)
+        rewards = batch.rewards
+        next_states = batch.next_states
+        dones = batch.dones
 
         with torch.no_grad():
             next_actions = self.policy_net(next_states).argmax(1).unsqueeze(1)
@@ -85,7 +105,10 @@ class DQNAgent:
 
         current_q = self.policy_net(states).gather(1, actions).squeeze(1)
 
-        loss = self.loss_fn(current_q, target_q)
+        # Wagi importance sampling - w buforze jednostajnym same jedynki (MSE)
+        td_errors = current_q - target_q
+        loss = (batch.weights * td_errors.pow(2)).mean()
+        self.memory.update_priorities(batch.indices, td_errors)
 
         self.optimizer.zero_grad()
         loss.backward()
@@ -0,0 +1,108 @@
+import math
+
+import torch
+from torch.nn.utils import parameters_to_vector, vector_to_parameters
+
+from agents.genetic_agent import GeneticAgent
+
+
+class GeneticPopulation:
+    """
+    Cała populacja GeneticAgent jako jedna macierz genomów (P, n_params).
+    Wiersz ma ten sam układ co parameters_to_vector(GeneticAgent), więc
+    forward dla całej populacji to trzy batchowane mnożenia (bmm).
+    """
+
+    def __init__(
+        self, size, state_size, action_size, hidden_size=128, genomes=None, device=None
+    ):
+        self.size = size
+        self.state_size = state_size
+        self.action_size = action_size
+        self.device = device or torch.device(
+            "cuda" if torch.cuda.is_available() else "cpu"
+        )
+
+        self.layer_shapes = [
+            (hidden_size, state_size),
+            (hidden_size, hidden_size),
+            (action_size, hidden_size),
+        ]
+        self.n_params = sum(out * inp + out for out, inp in self.layer_shapes)
+
+        if genomes is None:
+            genomes = self._random_genomes(size)
+        self.genomes = torch.as_tensor(genomes, dtype=torch.float32).to(self.device)
+
+    def _random_genomes(self, size):
+        # Ta sama inicjalizacja co domyślne nn.Linear: U(-1/sqrt(in), 1/sqrt(in))
+        chunks = []
+        for out, inp in self.layer_shapes:
+            bound = 1.0 / math.sqrt(inp)
+            chunks.append(torch.empty(size, out * inp).uniform_(-bound, bound))
+            chunks.append(torch.empty(size, out).uniform_(-bound, bound))
+        return torch.cat(chunks, dim=1)
+
+    def _layers(self):
+        offset = 0
+        for out, inp in self.layer_shapes:
+            weight = self.genomes[:, offset : offset + out * inp]
+            offset += out * inp
+            bias = self.genomes[:, offset : offset + out]
+            offset += out
+            yield weight.reshape(self.size, out, inp), bias
+
+    def forward(self, x):
+        """x: (P, state_size) lub (P, B, state_size) - wiersz i trafia do genomu i."""
+        x = torch.as_tensor(x, dtype=torch.float32).to(self.device)
+        squeeze = x.dim() == 2
+        if squeeze:
+            x = x.unsqueeze(1)
+
+        layers = list(self._layers())
+        for i, (weight, bias) in enumerate(layers):
+            x = torch.baddbmm(bias.unsqueeze(1), x, weight.transpose(1, 2))
+            if i < len(layers) - 1:
+                x = torch.relu(x)
+
+        return x.squeeze(1) if squeeze else x
+
+    def get_actions(self, states):
+        with torch.no_grad():
+            return self.forward(states).argmax(dim=-1).cpu()
+
+    def next_generation(self, elite_indices, mutation_power):
+        """Elity przechodzą bez zmian, reszta to zmutowane kopie losowych elit."""
+        elite_indices = torch.as_tensor(elite_indices, device=self.device)
+        n_children = self.size - len(elite_indices)
+
+        parents = elite_indices[
+            torch.randint(0, len(elite_indices), (n_children,), device=self.device)
+        ]
+        children = self.genomes[parents]
+        children += torch.randn_like(children) * mutation_power
+
+        self.genomes = torch.cat([self.genomes[elite_indices], children])
+
+    def to_agent(self, index) -> GeneticAgent:
+        agent = GeneticAgent(self.state_size, self.action_size)
+        vector_to_parameters(self.genomes[index].to(agent.device), agent.parameters())
+        return agent
+
+    @classmethod
+    def from_agent(cls, agent, size, mutation_power, hidden_size=128, device=None):
+        """
+        Populacja z mistrza na pozycji 0 i jego zmutowanych kopii - na
+        device albo, domyślnie, na urządzeniu agenta.
+        """
+        genome = parameters_to_vector(agent.parameters()).detach().cpu()
+        genomes = genome.repeat(size, 1)
+        genomes[1:] += torch.randn_like(genomes[1:]) * mutation_power
+        return cls(
+            size,
+            agent.fc1.in_features,
+            agent.fc3.out_features,
+            hidden_size=hidden_size,
+            genomes=genomes,
+            device=device or agent.device,
+        )
@@ -0,0 +1,185 @@
+from typing import NamedTuple
+
+import numpy as np
+import torch
+
+
+class ReplayBatch(NamedTuple):
+    states: torch.Tensor
+    actions: torch.Tensor
+    rewards: torch.Tensor
+    next_states: torch.Tensor
+    dones: torch.Tensor
+    indices: torch.Tensor
+    weights: torch.Tensor
+
+
+class ReplayBuffer:
+    """
+    Bufor cykliczny na prealokowanych tensorach.
+    Próbkowanie to jeden tensor losowych indeksów zamiast random.sample na deque.
+    """
+
+    def __init__(self, capacity, state_size, device=torch.device("cpu")):
+        self.capacity = capacity
+        self.device = device
+
+        self.states = torch.zeros(
+            (capacity, state_size), dtype=torch.float32, device=device
+        )
+        self.actions = torch.zeros(capacity, dtype=torch.int64, device=device)
+        self.rewards = torch.zeros(capacity, dtype=torch.float32, device=device)
+        self.next_states = torch.zeros(
+            (capacity, state_size), dtype=torch.float32, device=device
+        )
+        self.dones = torch.zeros(capacity, dtype=torch.float32, device=device)
+
+        self.position = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, state, action, reward, next_state, done):
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = float(done)
+        self._advance(1)
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        """Zapisuje N przejść naraz, np. z VectorSleighEnv."""
+        n = len(states)
+        indices = (self.position + torch.arange(n)) % self.capacity
+
+        self.states[indices] = torch.as_tensor(states, dtype=torch.float32).to(
+            self.device
+        )
+        self.actions[indices] = torch.as_tensor(actions, dtype=torch.int64).to(
+            self.device
+        )
+        self.rewards[indices] = torch.as_tensor(rewards, dtype=torch.float32).to(
+            self.device
+        )
+        self.next_states[indices] = torch.as_tensor(
+            next_states, dtype=torch.float32
+        ).to(self.device)
+        self.dones[indices] = torch.as_tensor(dones, dtype=torch.float32).to(
+            self.device
+        )
+        self._advance(n)
+
+    def _advance(self, n):
+        self.position = (self.position + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def sample(self, batch_size) -> ReplayBatch:
+        indices = torch.randint(0, self.size, (batch_size,), device=self.device)
+        return self._gather(indices, torch.ones(batch_size, device=self.device))
+
+    def update_priorities(self, indices, td_errors):
+        """Bufor jednostajny nie ma priorytetów - wagi próbek zawsze 1."""
+
+    def _gather(self, indices, weights) -> ReplayBatch:
+        return ReplayBatch(
+            states=self.states[indices],
+            actions=self.actions[indices],
+            rewards=self.rewards[indices],
+            next_states=self.next_states[indices],
+            dones=self.dones[indices],
+            indices=indices,
+            weights=weights,
+        )
+
+
+class SumTree:
+    """Drzewo sum priorytetów w jednej tablicy - liście zaczynają się od indeksu `leaf_offset`."""
+
+    def __init__(self, capacity):
+        self.leaf_offset = 2
+        while self.leaf_offset < capacity:
+            self.leaf_offset *= 2
+        self.tree = np.zeros(2 * self.leaf_offset, dtype=np.float64)
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def leaves(self, indices):
+        return self.tree[self.leaf_offset + indices]
+
+    def update(self, indices, priorities):
+        nodes = self.leaf_offset + np.asarray(indices)
+        self.tree[nodes] = priorities
+
+        nodes = np.unique(nodes // 2)
+        while True:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            if nodes[0] == 1:
+                break
+            nodes = np.unique(nodes // 2)
+
+    def find(self, prefix_sums):
+        """Dla każdej sumy prefiksowej zwraca indeks liścia, w który ona wpada."""
+        nodes = np.ones(len(prefix_sums), dtype=np.int64)
+        prefix_sums = np.array(prefix_sums, dtype=np.float64)
+
+        while nodes[0] < self.leaf_offset:
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = prefix_sums > left_sum
+            prefix_sums = np.where(go_right, prefix_sums - left_sum, prefix_sums)
+            nodes = np.where(go_right, left + 1, left)
+
+        return nodes - self.leaf_offset
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """Prioritized Experience Replay (proporcjonalny) na SumTree."""
+
+    def __init__(
+        self,
+        capacity,
+        state_size,
+        device=torch.device("cpu"),
+        alpha=0.6,
+        beta=0.4,
+        beta_increment=1e-5,
+        epsilon=1e-5,
+    ):
+        super().__init__(capacity, state_size, device)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        self.tree = SumTree(capacity)
+
+    def _advance(self, n):
+        indices = (self.position + np.arange(n)) % self.capacity
+        self.tree.update(indices, self.max_priority)
+        super()._advance(n)
+
+    def sample(self, batch_size) -> ReplayBatch:
+        segment = self.tree.total / batch_size
+        prefix_sums = (np.arange(batch_size) + np.random.rand(batch_size)) * segment
+        indices = np.minimum(self.tree.find(prefix_sums), self.size - 1)
+
+        probabilities = self.tree.leaves(indices) / self.tree.total
+        weights = (self.size * probabilities) ** (-self.beta)
+        weights /= weights.max()
+        self.beta = min(1.0, self.beta + self.beta_increment)
+
+        return self._gather(
+            torch.as_tensor(indices, device=self.device),
+            torch.as_tensor(weights, dtype=torch.float32, device=self.device),
+        )
+
+    def update_priorities(self, indices, td_errors):
+        priorities = (
+            td_errors.detach().abs().cpu().numpy() + self.epsilon
+        ) ** self.alpha
+        self.tree.update(indices.cpu().numpy(), priorities)
+        self.max_priority = max(self.max_priority, float(priorities.max()))
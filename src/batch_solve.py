@@ -0,0 +1,309 @@
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import time
+from dataclasses import dataclass
+from functools import partial
+from multiprocessing.connection import wait
+from typing import Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from brain.anytime import Solution, run_solver, write_solution
+from brain.beam_solver import BeamSearchSolver
+from brain.greedy_solver import GreedySolver
+from brain.smart_solver import SmartSolver
+from core.loader import instance_name, load_problem, load_travel_times
+from core.solution_validator import SolutionError, SolutionValidator
+
+SOLVERS = ("greedy", "smart", "beam", "dqn", "genetic")
+OUTPUT_DIR = "data/output"
+DQN_MODEL_PATH = "models_saved/santa_final.pth"
+GENETIC_MODEL_PATH = "models_saved/santa_genetic_best.pth"
+# Czas ponad limit na zapis rozwiązania - potem proces instancji jest zabijany
+HARD_LIMIT_GRACE = 10.0
+POLL_SECONDS = 0.1
+
+
+@dataclass
+class InstanceResult:
+    instance: str
+    solver: str
+    score: int = 0
+    seconds: float = 0.0
+    commands: int = 0
+    timed_out: bool = False
+    error: Optional[str] = None
+    output_path: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return f"❌ {self.error}"
+        if self.timed_out and self.output_path is None:
+            return "⏱️ limit czasu, przerwany bez rozwiązania"
+        return "⏱️ limit czasu" if self.timed_out else "✅"
+
+
+def _policy_commands(env, choose_action, deadline: float) -> list:
+    """Komendy z przebiegu agenta w SleighEnv (jak tryb eval w main.py)."""
+    state = env.reset()
+    commands = []
+    done = False
+    steps = 0
+    while not done and steps < env.problem.T + 100:
+        if time.perf_counter() > deadline:
+            break
+        state, _, done, step_commands = env.step_with_commands(choose_action(state))
+        commands.extend(step_commands)
+        steps += 1
+    return commands
+
+
+def _replay(problem, accel_table, commands) -> Solution:
+    """Wynik komend agenta - do pierwszej niedozwolonej komendy."""
+    validator = SolutionValidator(problem, accel_table)
+    valid = []
+    for action, value in commands:
+        try:
+            validator.apply(action, value)
+        except SolutionError:
+            break
+        valid.append((action, value))
+    return Solution(validator.score, valid)
+
+
+def _agent_solution(solver_name, problem, simulator, deadline) -> Solution:
+    import torch
+
+    from env.sleigh_env import SleighEnv
+
+    torch.set_num_threads(1)
+    env = SleighEnv(problem, simulator)
+
+    if solver_name == "dqn":
+        from agents.dqn_agent import DQNAgent
+
+        agent = DQNAgent(env.input_size, env.ACTION_SPACE_SIZE)
+        agent.load(DQN_MODEL_PATH)
+        agent.policy_net.eval()
+
+        def choose_action(state):
+            return agent.get_action(state, epsilon=0.0)
+
+    else:
+        from agents.genetic_agent import GeneticAgent
+        from env.scripted_policy import scripted_action
+
+        agent = GeneticAgent(env.input_size, env.ACTION_SPACE_SIZE)
+        agent.load_state_dict(torch.load(GENETIC_MODEL_PATH, map_location=agent.device))
+
+        def choose_action(state):
+            action_id = scripted_action(env)
+            return agent.get_action(state) if action_id is None else action_id
+
+    commands = _policy_commands(env, choose_action, deadline)
+    return _replay(problem, simulator.accel_table, commands)
+
+
+def solve_instance(
+    input_path: str,
+    solver_name: str,
+    output_dir: str,
+    timeout: float,
+    cache_dir: Optional[str] = None,
+    beam_time_budget: Optional[float] = None,
+) -> InstanceResult:
+    """
+    Rozwiązuje jedną instancję w procesie roboczym. Limit czasu jest
+    sprawdzany co decyzję: przerwany przebieg zostaje zapisany jako poprawny
+    początek rozwiązania. Proces, który mimo to przekroczy limit (np. jedna
+    długa decyzja), zabija solve_all. Z cache_dir sparsowane instancje są
+    tam zapisywane i odczytywane przy kolejnych przebiegach.
+    beam_time_budget: limit sekund na jedno przeszukiwanie solvera beam.
+    """
+    start = time.perf_counter()
+    deadline = start + timeout
+    result = InstanceResult(instance_name(input_path), solver_name)
+
+    problem, simulator = load_problem(
+        input_path, use_cache=cache_dir is not None, cache_dir=cache_dir
+    )
+    if solver_name in ("smart", "beam"):
+        problem.travel_times = load_travel_times(
+            input_path, problem, use_cache=cache_dir is not None, cache_dir=cache_dir
+        )
+    if solver_name in ("greedy", "smart", "beam"):
+        if solver_name == "greedy":
+            solver = GreedySolver()
+        elif solver_name == "smart":
+            solver = SmartSolver()
+        else:
+            solver = BeamSearchSolver(time_budget=beam_time_budget)
+        solution = run_solver(solver, problem, simulator.accel_table, deadline)
+    else:
+        solution = _agent_solution(solver_name, problem, simulator, deadline)
+
+    result.timed_out = time.perf_counter() > deadline
+
+    result.output_path = os.path.join(output_dir, f"{result.instance}.out.txt")
+    write_solution(result.output_path, solution, problem.catalog)
+
+    result.score = solution.score
+    result.commands = len(solution.commands)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _error_result(path: str, solver_name: str, error: Exception) -> InstanceResult:
+    # Pierwsza linia wystarczy do tabeli - np. niezgodny model
+    message = str(error).strip().splitlines()
+    return InstanceResult(
+        instance_name(path),
+        solver_name,
+        error=message[0] if message else type(error).__name__,
+    )
+
+
+def _solve_worker(connection, task, path, solver_name, output_dir, timeout):
+    try:
+        result = task(path, solver_name, output_dir, timeout)
+    except Exception as e:
+        result = _error_result(path, solver_name, e)
+    connection.send(result)
+    connection.close()
+
+
+def solve_all(
+    paths: list[str],
+    solver_name: str,
+    output_dir: str = OUTPUT_DIR,
+    timeout: float = 300.0,
+    workers: Optional[int] = None,
+    task=solve_instance,
+) -> list[InstanceResult]:
+    """
+    Każda instancja w osobnym procesie, najwyżej workers naraz; wyniki w
+    kolejności paths. Proces działający dłużej niż timeout + HARD_LIMIT_GRACE
+    jest przerywany, a instancja zgłaszana jako przekroczony limit czasu.
+    task: funkcja rozwiązująca jedną instancję (domyślnie solve_instance).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max(workers or min(len(paths), os.cpu_count() or 1), 1)
+    context = multiprocessing.get_context("spawn")
+
+    results = {}
+    pending = list(paths)
+    # Końcówka potoku -> (ścieżka, proces, start)
+    running = {}
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                path = pending.pop(0)
+                reader, writer = context.Pipe(duplex=False)
+                args = (writer, task, path, solver_name, output_dir, timeout)
+                process = context.Process(target=_solve_worker, args=args)
+                process.start()
+                writer.close()
+                running[reader] = (path, process, time.perf_counter())
+
+            for reader in wait(list(running), timeout=POLL_SECONDS):
+                path, process, _ = running.pop(reader)
+                try:
+                    result = reader.recv()
+                except EOFError:
+                    result = None
+                reader.close()
+                process.join()
+                if result is None:
+                    # Proces zginął bez wyniku, np. zabrakło pamięci
+                    error = RuntimeError(f"proces zakończony kodem {process.exitcode}")
+                    result = _error_result(path, solver_name, error)
+                results[path] = result
+                print(f"  {results[path].instance}: {results[path].status}")
+
+            now = time.perf_counter()
+            for reader, (path, process, started) in list(running.items()):
+                if now - started <= timeout + HARD_LIMIT_GRACE:
+                    continue
+                process.terminate()
+                process.join()
+                reader.close()
+                del running[reader]
+                results[path] = InstanceResult(
+                    instance_name(path),
+                    solver_name,
+                    seconds=now - started,
+                    timed_out=True,
+                )
+                print(f"  {results[path].instance}: {results[path].status}")
+    finally:
+        # Np. Ctrl-C - nie zostawiamy osieroconych procesów
+        for _, process, _ in running.values():
+            process.terminate()
+            process.join()
+
+    return [results[path] for path in paths]
+
+
+def format_table(results: list[InstanceResult]) -> str:
+    width = max([len("Instancja")] + [len(r.instance) for r in results])
+    lines = [
+        f"{'Instancja':<{width}}  {'Solver':<8} {'Wynik':>12} {'Czas [s]':>9}  Status"
+    ]
+    for r in results:
+        lines.append(
+            f"{r.instance:<{width}}  {r.solver:<8} {r.score:>12} "
+            f"{r.seconds:>9.2f}  {r.status}"
+        )
+    lines.append(
+        f"{'Razem':<{width}}  {'':<8} {sum(r.score for r in results):>12} "
+        f"{sum(r.seconds for r in results):>9.2f}"
+    )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rozwiązuje wiele instancji naraz i wypisuje tabelę wyników."
+    )
+    parser.add_argument(
+        "pattern", nargs="?", default="data/*.in.txt", help="glob instancji"
+    )
+    parser.add_argument("--solver", choices=SOLVERS, default="smart")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument(
+        "--timeout", type=float, default=300.0, help="sekundy na instancję"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--cache-dir", default=None, help="katalog cache sparsowanych instancji"
+    )
+    parser.add_argument(
+        "--beam-budget",
+        type=float,
+        default=None,
+        help="sekundy na jedno przeszukiwanie solvera beam (domyślnie bez limitu)",
+    )
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(args.pattern))
+    if not paths:
+        print(f"❌ Brak instancji pasujących do {args.pattern}")
+        return 1
+
+    print(f"--- {len(paths)} instancji, solver {args.solver} ---")
+    task = partial(
+        solve_instance, cache_dir=args.cache_dir, beam_time_budget=args.beam_budget
+    )
+    results = solve_all(
+        paths, args.solver, args.output_dir, args.timeout, args.workers, task
+    )
+    print(format_table(results))
+    return 1 if any(r.error is not None for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from brain.anytime import run_solver
+from brain.greedy_solver import GreedySolver
+from brain.smart_solver import SmartSolver
+from core.loader import instance_name, load_problem
+from models.problem import Problem
+
+SEED = 2022
+REPEATS = 5
+# Krótkie pomiary są powtarzane w pętli, aż jeden trwa co najmniej tyle
+MIN_MEASURE_SECONDS = 0.05
+DEFAULT_THRESHOLD = 0.10
+GROUPS = ("parse", "simulator", "env", "dqn", "solver")
+
+SIMULATOR_STEPS = 20000
+ENV_STEPS = 2000
+DQN_UPDATES = 50
+SOLVERS = {"greedy": GreedySolver, "smart": SmartSolver}
+
+
+def seed_everything(seed: int = SEED):
+    random.seed(seed)
+    np.random.seed(seed)
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.manual_seed(seed)
+
+
+def _measure(run, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        run()
+    return time.perf_counter() - start
+
+
+def best_time(run, repeats: int = REPEATS) -> float:
+    """
+    Czas jednego run() - najkrótszy z repeats pomiarów, najmniej zaszumiony
+    przez system. Liczba wywołań na pomiar rośnie jak w timeit.autorange.
+    """
+    number = 1
+    while (elapsed := _measure(run, number)) < MIN_MEASURE_SECONDS:
+        number *= 10
+    best = elapsed
+    for _ in range(repeats - 1):
+        best = min(best, _measure(run, number))
+    return best / number
+
+
+def metric(value: float, unit: str, higher_is_better: bool) -> dict:
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def bench_parse(paths: list[str], repeats: int) -> dict:
+    """Pełne parsowanie pliku oraz odczyt przez cache .npz (w katalogu tymczasowym)."""
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for path in paths:
+            name = instance_name(path)
+            results[f"parse/{name}"] = metric(
+                best_time(lambda: Problem(path), repeats), "s", False
+            )
+
+            def cached():
+                return load_problem(path, use_cache=True, cache_dir=cache_dir)
+
+            cached()
+            results[f"parse_cached/{name}"] = metric(
+                best_time(cached, repeats), "s", False
+            )
+    return results
+
+
+def bench_simulator(paths: list[str], repeats: int) -> dict:
+    """Kroki Simulator.step i Simulator.handle_action na sekundę."""
+    results = {}
+    for path in paths:
+        name = instance_name(path)
+        _, simulator = load_problem(path)
+        rng = np.random.default_rng(SEED)
+        accels = rng.integers(-1, 2, size=(SIMULATOR_STEPS, 2)).tolist()
+
+        def steps():
+            simulator.reset()
+            for _ in range(SIMULATOR_STEPS):
+                simulator.step()
+
+        def actions():
+            simulator.reset()
+            for ax, ay in accels:
+                simulator.handle_action(ax, ay, 0, 0)
+
+        results[f"simulator_step/{name}"] = metric(
+            SIMULATOR_STEPS / best_time(steps, repeats), "steps/s", True
+        )
+        results[f"simulator_action/{name}"] = metric(
+            SIMULATOR_STEPS / best_time(actions, repeats), "actions/s", True
+        )
+    return results
+
+
+def bench_env(paths: list[str], repeats: int) -> dict:
+    """SleighEnv.step na sekundę dla losowych (ze stałym ziarnem) akcji."""
+    from env.sleigh_env import SleighEnv
+
+    results = {}
+    for path in paths:
+        name = instance_name(path)
+        problem, simulator = load_problem(path)
+        env = SleighEnv(problem, simulator)
+        rng = np.random.default_rng(SEED)
+        action_ids = rng.integers(0, env.ACTION_SPACE_SIZE, size=ENV_STEPS).tolist()
+
+        def run():
+            env.reset()
+            for action_id in action_ids:
+                _, _, done, _ = env.step(action_id)
+                if done:
+                    env.reset()
+
+        results[f"env_step/{name}"] = metric(
+            ENV_STEPS / best_time(run, repeats), "steps/s", True
+        )
+    return results
+
+
+def bench_dqn(paths: list[str], repeats: int) -> dict:
+    """DQNAgent.update na sekundę - rozmiar stanu z SleighEnv pierwszej instancji."""
+    import torch
+
+    from agents.dqn_agent import DQNAgent
+    from env.sleigh_env import SleighEnv
+
+    problem, simulator = load_problem(paths[0])
+    env = SleighEnv(problem, simulator)
+    agent = DQNAgent(env.input_size, env.ACTION_SPACE_SIZE)
+
+    n = agent.batch_size * 8
+    generator = torch.Generator().manual_seed(SEED)
+    agent.remember_batch(
+        torch.rand(n, env.input_size, generator=generator),
+        torch.randint(0, env.ACTION_SPACE_SIZE, (n,), generator=generator),
+        torch.rand(n, generator=generator),
+        torch.rand(n, env.input_size, generator=generator),
+        torch.zeros(n),
+    )
+
+    def run():
+        for _ in range(DQN_UPDATES):
+            agent.update()
+
+    return {
+        "dqn_update": metric(DQN_UPDATES / best_time(run, repeats), "updates/s", True)
+    }
+
+
+def bench_solvers(paths: list[str], repeats: int) -> dict:
+    """Decyzje solverów na sekundę i czas pełnego rozwiązania instancji."""
+    results = {}
+    for path in paths:
+        name = instance_name(path)
+        problem, simulator = load_problem(path)
+        for label, solver_cls in SOLVERS.items():
+            decisions = []
+
+            def run():
+                solution = run_solver(solver_cls(), problem, simulator.accel_table)
+                decisions.append(len(solution.commands))
+
+            seconds = best_time(run, repeats)
+            results[f"solve/{label}/{name}"] = metric(seconds, "s", False)
+            results[f"decisions/{label}/{name}"] = metric(
+                decisions[-1] / seconds, "decisions/s", True
+            )
+    return results
+
+
+BENCHMARKS = {
+    "parse": bench_parse,
+    "simulator": bench_simulator,
+    "env": bench_env,
+    "dqn": bench_dqn,
+    "solver": bench_solvers,
+}
+
+
+def run_benchmarks(paths: list[str], groups=GROUPS, repeats: int = REPEATS) -> dict:
+    seed_everything()
+    metrics = {}
+    for group in groups:
+        print(f"⏱️ {group}...", file=sys.stderr)
+        seed_everything()
+        metrics.update(BENCHMARKS[group](paths, repeats))
+
+    meta = {
+        "seed": SEED,
+        "repeats": repeats,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "instances": [instance_name(p) for p in paths],
+    }
+    if "dqn" in groups or "env" in groups:
+        import torch
+
+        meta["torch"] = torch.__version__
+    return {"meta": meta, "metrics": metrics}
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD):
+    """
+    Wiersze (nazwa, bazowa, obecna, zmiana, regresja) dla metryk raportu
+    bazowego. Zmiana > 0 to poprawa niezależnie od kierunku metryki;
+    regresja, gdy pogorszenie przekracza threshold (ułamek wartości bazowej).
+    Metryka, której brak w obecnym raporcie, ma obecną wartość i zmianę None
+    i też jest regresją. Nowe metryki obecnego raportu są pomijane.
+    """
+    rows = []
+    for name, base in baseline["metrics"].items():
+        if name not in current["metrics"]:
+            rows.append((name, base["value"], None, None, True))
+            continue
+        old, new = base["value"], current["metrics"][name]["value"]
+        if old == 0:
+            change = 0.0
+        elif base["higher_is_better"]:
+            change = (new - old) / old
+        else:
+            change = (old - new) / old
+        rows.append((name, old, new, change, change < -threshold))
+    return rows
+
+
+def format_comparison(rows) -> str:
+    width = max([len("Metryka")] + [len(row[0]) for row in rows])
+    lines = [f"{'Metryka':<{width}}  {'Bazowa':>12} {'Obecna':>12} {'Zmiana':>8}"]
+    for name, old, new, change, regressed in rows:
+        mark = "  ❌" if regressed else ""
+        if new is None:
+            lines.append(f"{name:<{width}}  {old:>12.6g} {'brak':>12} {'':>8}{mark}")
+            continue
+        lines.append(
+            f"{name:<{width}}  {old:>12.6g} {new:>12.6g} {change:>+8.1%}{mark}"
+        )
+    return "\n".join(lines)
+
+
+def _load_report(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarki parsowania, symulatora, środowiska, DQN i solverów."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="mierzy i zapisuje raport JSON")
+    run.add_argument("--instances", default="data/*.in.txt", help="glob instancji")
+    run.add_argument("--only", nargs="+", choices=GROUPS, default=list(GROUPS))
+    run.add_argument("--repeats", type=int, default=REPEATS)
+    run.add_argument("--output", default=None, help="plik JSON (domyślnie stdout)")
+
+    cmp = commands.add_parser("compare", help="porównuje dwa raporty JSON")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="dopuszczalne pogorszenie, np. 0.1 = 10%%",
+    )
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        rows = compare(
+            _load_report(args.baseline), _load_report(args.current), args.threshold
+        )
+        print(format_comparison(rows))
+        missing = [row[0] for row in rows if row[2] is None]
+        regressions = [row[0] for row in rows if row[4] and row[2] is not None]
+        if missing:
+            print(f"❌ Brak w obecnym raporcie: {', '.join(missing)}")
+        if regressions:
+            print(f"❌ Regresja ponad {args.threshold:.0%}: {', '.join(regressions)}")
+        if missing or regressions:
+            return 1
+        print("✅ Bez regresji")
+        return 0
+
+    paths = sorted(glob.glob(args.instances))
+    if not paths:
+        print(f"❌ Brak instancji pasujących do {args.instances}")
+        return 1
+
+    report = run_benchmarks(paths, args.only, args.repeats)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        print(f"✅ Raport zapisany do {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from brain.beam_solver import BeamSearchSolver
+from brain.smart_solver import SmartSolver
+from brain.trip_planner import Trip
+from core.actions import Action
+from core.solution_validator import SolutionError, SolutionValidator
+from output.output_writer import OutputWriter
+
+# Limit sprawdzeń przy poprawie tras pierwszego poziomu - kolejne są 4x większe
+FIRST_ROUTE_CHECKS = 1000
+ROUTE_BUDGET_GROWTH = 4
+# Ilu najbliższych niedostarczonych prezentów próbujemy dołożyć do kursu
+EXTRA_CANDIDATES = 8
+
+
+@dataclass
+class Solution:
+    score: int
+    # Pary (Action, wartość) - id prezentów dla LoadGifts/DeliverGift
+    commands: list
+    label: str = ""
+
+
+def run_solver(solver, problem, accel_table, deadline: Optional[float] = None):
+    """
+    Przebieg solvera, w którym każdą komendę wykonuje SolutionValidator.
+    Pierwsza niedozwolona komenda kończy przebieg, a przebieg przerwany po
+    deadline (time.perf_counter) zostaje poprawnym początkiem rozwiązania.
+    """
+    validator = SolutionValidator(problem, accel_table)
+    state = validator.state
+    commands = []
+    while state.current_time < problem.T:
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        action, value = solver.resolve(state, problem, accel_table, problem.catalog)
+        try:
+            validator.apply(action, value)
+        except SolutionError:
+            break
+        commands.append((action, value))
+    return Solution(validator.score, commands)
+
+
+def candidate_solvers(route_checks: int, beam_time_budget: Optional[float] = None):
+    """
+    Warianty jednego poziomu: sposób wyboru kursów x ten sam budżet tras.
+    beam_time_budget: limit sekund na jedno przeszukiwanie wiązkowe.
+    """
+    yield "plan misji", SmartSolver(route_max_checks=route_checks)
+    yield "kurs po kursie", SmartSolver(
+        route_max_checks=route_checks, use_trip_plan=False
+    )
+    yield "podział i ograniczenia", SmartSolver(
+        route_max_checks=route_checks,
+        use_trip_plan=False,
+        use_branch_and_bound=True,
+    )
+    yield "przeszukiwanie wiązkowe", BeamSearchSolver(
+        route_max_checks=route_checks, time_budget=beam_time_budget
+    )
+
+
+def solution_trips(solution: Solution) -> list[list[int]]:
+    """
+    Kursy rozwiązania: prezenty ładowane przy kolejnych pobytach w bazie,
+    tylko te, które zostały dostarczone.
+    """
+    delivered = {
+        value for action, value in solution.commands if action == Action.DeliverGift
+    }
+    trips = []
+    loading = False
+    for action, value in solution.commands:
+        if action == Action.LoadGifts:
+            if not loading:
+                trips.append([])
+                loading = True
+            if value in delivered:
+                trips[-1].append(value)
+        elif action != Action.LoadCarrots:
+            loading = False
+    return [trip for trip in trips if trip]
+
+
+def replay_trips(
+    trips: list[list[int]],
+    problem,
+    accel_table,
+    route_checks: int,
+    deadline: Optional[float] = None,
+) -> Solution:
+    """
+    Przelot SmartSolver po podanych kursach (w tej kolejności). Trasy są
+    układane na nowo z budżetem route_checks; kursy, które się nie
+    zmieszczą, są przycinane jak w planie misji, a prezenty spoza kursów
+    zbiera potem zwykły wybór kursu po kursie.
+    """
+    catalog = problem.catalog
+    solver = SmartSolver(route_max_checks=route_checks)
+    solver.trips = deque(
+        Trip(
+            gift_ids=list(gift_ids),
+            weight=int(catalog.weights[gift_ids].sum()),
+            score=int(catalog.scores[gift_ids].sum()),
+            est_time=1,
+        )
+        for gift_ids in trips
+    )
+    return run_solver(solver, problem, accel_table, deadline)
+
+
+def trip_variants(trips: list[list[int]], index: int, catalog, undelivered):
+    """
+    Warianty kursu index: z dołożonymi najbliższymi niedostarczonymi
+    prezentami i bez prezentu z najmniejszą liczbą punktów na jednostkę wagi.
+    """
+    trip = trips[index]
+    if len(undelivered):
+        c = catalog.dest_c[trip].mean()
+        r = catalog.dest_r[trip].mean()
+        d2 = (catalog.dest_c[undelivered] - c) ** 2 + (
+            catalog.dest_r[undelivered] - r
+        ) ** 2
+        nearest = undelivered[np.argsort(d2, kind="stable")[:EXTRA_CANDIDATES]]
+        yield trips[:index] + [trip + nearest.tolist()] + trips[index + 1 :]
+
+    if len(trip) > 1:
+        density = catalog.scores[trip] / np.maximum(catalog.weights[trip], 1)
+        worst = trip[int(np.argmin(density))]
+        lighter = [g for g in trip if g != worst]
+        yield trips[:index] + [lighter] + trips[index + 1 :]
+
+
+def improve_trips(
+    best: Solution,
+    problem,
+    accel_table,
+    route_checks: int,
+    deadline: float,
+    on_better,
+) -> Solution:
+    """
+    Jedno przejście po kursach najlepszego rozwiązania: każdy kurs po kolei
+    jest dobierany na nowo (trip_variants), a wszystkie trasy poprawiane z
+    budżetem route_checks. Lepszy przelot od razu zastępuje best i trafia
+    do on_better.
+    """
+    catalog = problem.catalog
+    trips = solution_trips(best)
+    index = 0
+    while index < len(trips) and time.perf_counter() < deadline:
+        delivered = np.zeros(len(catalog), dtype=bool)
+        delivered[[g for trip in trips for g in trip]] = True
+        undelivered = np.flatnonzero(~delivered)
+
+        variants = [trips] + list(trip_variants(trips, index, catalog, undelivered))
+        for variant in variants:
+            if time.perf_counter() >= deadline:
+                break
+            solution = replay_trips(
+                variant, problem, accel_table, route_checks, deadline
+            )
+            if solution.score > best.score:
+                solution.label = f"poprawa kursów, trasy {route_checks} sprawdzeń"
+                best = solution
+                on_better(best)
+                trips = solution_trips(best)
+                break
+        index += 1
+    return best
+
+
+def write_solution(path: str, solution: Solution, catalog):
+    with OutputWriter(path, gift_names=catalog, atomic=True) as writer:
+        for action, value in solution.commands:
+            writer.record(action, value)
+
+
+def solve_anytime(
+    problem,
+    accel_table,
+    output_path: str,
+    deadline_seconds: float,
+    beam_time_budget: Optional[float] = None,
+):
+    """
+    Najpierw szybkie rozwiązania wariantów SmartSolver, potem poprawianie
+    najlepszego z nich kurs po kursie (improve_trips) z coraz większym
+    budżetem poprawy tras, aż do deadline. Gdy przejście po kursach nic nie
+    daje, zapasowo startują od nowa warianty z większym budżetem tras.
+    Każde lepsze rozwiązanie jest od razu zapisywane atomowo do output_path,
+    więc plik zawsze zawiera najlepszy dotąd wynik. Kończy wcześniej, gdy
+    większy budżet tras nie zmienia już wyników restartów ani kursów.
+    """
+    start = time.perf_counter()
+    deadline = start + deadline_seconds
+    best = None
+    route_checks = FIRST_ROUTE_CHECKS
+
+    def record(solution):
+        write_solution(output_path, solution, problem.catalog)
+        elapsed = time.perf_counter() - start
+        print(f"🏆 Wynik {solution.score} ({solution.label}) po {elapsed:.1f} s")
+
+    def restart() -> list[int]:
+        nonlocal best
+        scores = []
+        for label, solver in candidate_solvers(route_checks, beam_time_budget):
+            solution = run_solver(solver, problem, accel_table, deadline)
+            solution.label = f"{label}, trasy {route_checks} sprawdzeń"
+            scores.append(solution.score)
+
+            if best is None or solution.score > best.score:
+                best = solution
+                record(best)
+            if time.perf_counter() >= deadline:
+                break
+        return scores
+
+    previous_scores = restart()
+    stalled = False
+    while time.perf_counter() < deadline:
+        improved = improve_trips(
+            best, problem, accel_table, route_checks, deadline, record
+        )
+        if improved.score > best.score:
+            best, stalled = improved, False
+            continue
+        if stalled:
+            break
+
+        # Kursy nic już nie dają - warianty od nowa z większym budżetem tras
+        route_checks *= ROUTE_BUDGET_GROWTH
+        scores = restart()
+        # Bez zmian w restartach zostaje jeszcze przejście z większym budżetem
+        stalled = scores == previous_scores
+        previous_scores = scores
+
+    return best
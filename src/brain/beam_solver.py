@@ -0,0 +1,259 @@
+import math
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from brain.motion_control import get_stopping_distance, steps_until_in_range
+from brain.smart_solver import SmartSolver
+from core.actions import Action, Direction, accelerate, floating
+from core.travel_time import estimate_travel_time
+from models.coordinate import Coordinate
+from models.search_state import SearchState
+
+DIRECTION_ACTIONS = {
+    Direction.UP: Action.AccUp,
+    Direction.DOWN: Action.AccDown,
+    Direction.LEFT: Action.AccLeft,
+    Direction.RIGHT: Action.AccRight,
+}
+
+# Makro-ruch: (kierunek albo None, przyspieszenie, liczba kroków Float po nim)
+Macro = tuple[Optional[Direction], int, int]
+
+
+def remaining_travel_time(state, target: Coordinate, range_d: int, max_acc: int):
+    """
+    Domyślna heurystyka: szacowany czas do zatrzymania w zasięgu celu,
+    liczony od punktu, w którym sanie stanęłyby po hamowaniu.
+    """
+    vc, vr = state.velocity.vc, state.velocity.vr
+    stop_c = state.position.c + vc * abs(vc) // (2 * max_acc)
+    stop_r = state.position.r + vr * abs(vr) // (2 * max_acc)
+    braking = (abs(vc) + abs(vr)) / max_acc
+    return braking + int(
+        estimate_travel_time(target.c - stop_c, target.r - stop_r, max_acc, range_d)
+    )
+
+
+def coast_candidates(state, target: Coordinate, range_d: int, max_acc: int) -> set:
+    """
+    Długości Float warte sprawdzenia: do chwili, w której oś c albo oś r
+    musi zacząć hamować, i do wejścia w zasięg celu.
+    """
+    candidates = set()
+    for dist, vel in (
+        (target.c - state.position.c, state.velocity.vc),
+        (target.r - state.position.r, state.velocity.vr),
+    ):
+        if vel != 0 and dist * vel > 0:
+            stop_dist = get_stopping_distance(vel, max_acc)
+            candidates.add(math.ceil((abs(dist) - stop_dist) / abs(vel)))
+    in_range = steps_until_in_range(state.position, state.velocity, target, range_d)
+    if in_range is not None:
+        candidates.add(in_range)
+    return {k for k in candidates if k > 1}
+
+
+def _reached(state, target: Coordinate, range_d: int, stop: bool) -> bool:
+    if stop and (state.velocity.vc or state.velocity.vr):
+        return False
+    dc = state.position.c - target.c
+    dr = state.position.r - target.r
+    return dc * dc + dr * dr <= range_d * range_d
+
+
+class BeamSearchPlanner:
+    """
+    Ograniczone przeszukiwanie wiązkowe po przejściach z core.actions.
+    Węzły to ścieżki makro-ruchów od korzenia - stan węzła odtwarzany jest
+    na jednym SearchState (restore + powtórzenie ścieżki), więc gałęzie nie
+    kopiują zbiorów prezentów. Duplikaty odcina tablica transpozycji po
+    SearchState.key(). Węzły są porządkowane jak w A*: zużyte kroki +
+    heuristic(...) + koszt marchewek. Przeszukiwanie kończy się po
+    max_depth poziomach albo - tylko gdy podano time_budget - po tylu sekundach.
+    """
+
+    def __init__(
+        self,
+        beam_width: int = 16,
+        max_depth: int = 8,
+        time_budget: Optional[float] = None,
+        heuristic: Callable = remaining_travel_time,
+        carrot_cost: float = 0.5,
+    ):
+        self.beam_width = beam_width
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.heuristic = heuristic
+        self.carrot_cost = carrot_cost
+
+    def _macros(self, state, target, range_d, accel_table, time_left) -> list:
+        macros = [(None, 0, 1)]
+        max_acc = accel_table.get_max_acceleration_for_weight(state.sleigh_weight)
+        for k in coast_candidates(state, target, range_d, max(max_acc, 1)):
+            if min(k, time_left) > 1:
+                macros.append((None, 0, min(k, time_left)))
+
+        if (
+            state.carrot_count >= 1
+            and max_acc > 0
+            and not state.last_action_was_acceleration
+        ):
+            for direction in DIRECTION_ACTIONS:
+                macros.append((direction, max_acc, 1))
+                if max_acc > 1:
+                    macros.append((direction, 1, 1))
+        return macros
+
+    @staticmethod
+    def _apply(state, accel_table, macro: Macro):
+        direction, value, k = macro
+        if direction is not None:
+            accelerate(state, accel_table, value, direction)
+        floating(state, k)
+
+    def _cost(self, state, root, target, range_d, accel_table, stop) -> float:
+        max_acc = accel_table.get_max_acceleration_for_weight(state.sleigh_weight)
+        elapsed = state.current_time - root[6]
+        carrots = root[5] - state.carrot_count
+        if _reached(state, target, range_d, stop):
+            remaining = 0
+        else:
+            remaining = self.heuristic(state, target, range_d, max(max_acc, 1))
+        return elapsed + remaining + self.carrot_cost * carrots
+
+    def plan(
+        self,
+        state,
+        target: Coordinate,
+        range_d: int,
+        accel_table,
+        time_limit: int,
+        stop: bool = False,
+    ) -> tuple[list[Macro], bool]:
+        """
+        Najlepsza znaleziona ścieżka makro-ruchów i to, czy kończy się w
+        zasięgu celu. Ze stop=True sanie muszą się w nim zatrzymać.
+        """
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.perf_counter() + self.time_budget
+        search = SearchState.from_state(state)
+        root = search.snapshot()
+        seen = {search.key(): 0}
+
+        # (koszt, ścieżka) - ścieżka kończąca się w zasięgu celu jest liściem
+        beam = [(self._cost(search, root, target, range_d, accel_table, stop), ())]
+        best_goal = None
+
+        for _ in range(self.max_depth):
+            children = []
+            for _, path in beam:
+                search.restore(root)
+                for macro in path:
+                    self._apply(search, accel_table, macro)
+                node = search.snapshot()
+                time_left = time_limit - search.current_time
+
+                for macro in self._macros(
+                    search, target, range_d, accel_table, time_left
+                ):
+                    if macro[2] > time_left:
+                        continue
+                    self._apply(search, accel_table, macro)
+                    key = search.key()
+                    depth = search.current_time - root[6]
+                    if seen.get(key, depth + 1) > depth:
+                        seen[key] = depth
+                        cost = self._cost(
+                            search, root, target, range_d, accel_table, stop
+                        )
+                        child = (cost, path + (macro,))
+                        if _reached(search, target, range_d, stop):
+                            if best_goal is None or cost < best_goal[0]:
+                                best_goal = child
+                        else:
+                            children.append(child)
+                    search.restore(node)
+
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+
+            children.sort(key=lambda child: child[0])
+            if children:
+                beam = children[: self.beam_width]
+            if not children or (
+                deadline is not None and time.perf_counter() > deadline
+            ):
+                break
+            # Wiązka nie ma już szans pobić znalezionego liścia
+            if best_goal is not None and beam[0][0] >= best_goal[0]:
+                break
+
+        search.restore(root)
+        if best_goal is not None and best_goal[0] <= beam[0][0]:
+            return list(best_goal[1]), True
+        return list(beam[0][1]), False
+
+
+class BeamSearchSolver(SmartSolver):
+    """
+    SmartSolver (wybór prezentów, kolejność celów), w którym przelot do
+    celu wybiera BeamSearchPlanner. Plan jest powtarzany co decyzję od
+    bieżącego stanu, dopóki dolatuje przed harmonogramem plan_leg liczonym
+    raz na cel; potem sanie dolatują wg harmonogramu.
+    """
+
+    def __init__(
+        self,
+        planner: BeamSearchPlanner = None,
+        time_budget: Optional[float] = None,
+        **kwargs,
+    ):
+        """
+        time_budget: limit sekund na jedno przeszukiwanie domyślnego
+        BeamSearchPlanner (bez limitu - max_depth poziomów). Pozostałe
+        argumenty trafiają do SmartSolver.
+        """
+        super().__init__(**kwargs)
+        self.planner = planner or BeamSearchPlanner(time_budget=time_budget)
+        # Cel wiązki i czas dolotu do niego wg plan_leg (None - bez harmonogramu)
+        self.beam_target = None
+        self.leg_arrival = None
+
+    def _move(self, state, problem, accel_table, target):
+        key = (target.c, target.r)
+        if self.leg_target == key or state.carrot_count < 1:
+            return super()._move(state, problem, accel_table, target)
+
+        leg = None
+        # Bez harmonogramu (np. za mało marchewek) próbujemy w kolejnej decyzji
+        if self.beam_target != key or self.leg_arrival is None:
+            leg = self._plan_leg(state, problem, accel_table, target)
+            leg_time = sum(v for action, v in leg if action == Action.Floating)
+            self.beam_target = key
+            self.leg_arrival = state.current_time + leg_time if leg else None
+
+        # W bazie SmartSolver ładuje prezenty, więc tam sanie muszą stanąć
+        at_base = target.c == 0 and target.r == 0
+        path, reached = self.planner.plan(
+            state, target, problem.D, accel_table, problem.T, stop=at_base
+        )
+        arrival = state.current_time + sum(k for _, _, k in path)
+        has_leg = self.leg_arrival is not None
+        if (
+            not path
+            or (has_leg and not reached)
+            or (has_leg and self.leg_arrival <= arrival)
+        ):
+            if leg:
+                # Harmonogram policzony od tego samego stanu - bez liczenia od nowa
+                self.leg, self.leg_target = leg, key
+            return super()._move(state, problem, accel_table, target)
+
+        direction, value, k = path[0]
+        if direction is None:
+            return Action.Floating, k
+        # Float z makro-ruchu zostanie zwrócony w następnej decyzji
+        self.leg = deque([(Action.Floating, k)])
+        return DIRECTION_ACTIONS[direction], value
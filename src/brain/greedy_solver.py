@@ -1,22 +1,64 @@
+from brain.motion_control import steps_until_in_range
 from core.actions import Action
 from core.distance_utils import distance
 from models.coordinate import Coordinate
 
 
 class GreedySolver:
+    # Przy kilku załadowanych prezentach prosta pętla jest tańsza od zapytania do siatki
+    SCAN_LIMIT = 16
+
     def __init__(self):
         pass
 
+    def _loaded_gift_in_range(self, state, problem, all_gift_map):
+        loaded = state.loaded_gifts
+        if len(loaded) <= self.SCAN_LIMIT:
+            for gift_id in loaded:
+                gift = all_gift_map[gift_id]
+                if distance(state.position, gift.destination) <= problem.D:
+                    return gift_id
+            return None
+
+        nearby = problem.spatial_index.within(
+            state.position.c, state.position.r, problem.D
+        )
+        in_range = [gift_id for gift_id in nearby.tolist() if gift_id in loaded]
+        return min(in_range) if in_range else None
+
+    def _coast_steps(self, state, problem, all_gift_map):
+        """
+        Bez możliwości przyspieszania nic się nie zmieni, dopóki sanie nie
+        wlecą w zasięg któregoś z załadowanych prezentów albo bazy.
+        """
+        stops = [
+            steps_until_in_range(state.position, state.velocity, Coordinate(0, 0), 1.0)
+        ]
+        for gift_id in state.loaded_gifts:
+            stops.append(
+                steps_until_in_range(
+                    state.position,
+                    state.velocity,
+                    all_gift_map[gift_id].destination,
+                    problem.D,
+                )
+            )
+
+        k = problem.T - state.current_time
+        for stop in stops:
+            if stop is not None and stop >= 1:
+                k = min(k, stop)
+        return max(k, 1)
+
     def resolve(self, current_state, problem, accel_table, all_gift_map):
         lapland_pos = Coordinate(0, 0)
 
         if current_state.last_action_was_acceleration:
             return (Action.Floating, 1)
 
-        for i, gift_name in enumerate(current_state.loaded_gifts):
-            gift = all_gift_map[gift_name]
-            if distance(current_state.position, gift.destination) <= problem.D:
-                return (Action.DeliverGift, i)
+        gift_id = self._loaded_gift_in_range(current_state, problem, all_gift_map)
+        if gift_id is not None:
+            return (Action.DeliverGift, gift_id)
 
         dist_to_lapland = distance(current_state.position, lapland_pos)
         if dist_to_lapland <= 1.0:
@@ -24,23 +66,27 @@ class GreedySolver:
                 return (Action.LoadCarrots, 50)
 
             if len(current_state.available_gifts) > 0:
-                next_gift = all_gift_map[current_state.available_gifts[0]]
+                next_gift_id = current_state.available_gifts.first()
+                next_gift = all_gift_map[next_gift_id]
                 new_weight = current_state.sleigh_weight + next_gift.weight
                 if accel_table.get_max_acceleration_for_weight(new_weight) > 0:
-                    return (Action.LoadGifts, 0)
+                    return (Action.LoadGifts, next_gift_id)
 
         target_pos = lapland_pos
 
         if len(current_state.loaded_gifts) > 0:
-            first_gift_name = current_state.loaded_gifts[0]
-            target_pos = all_gift_map[first_gift_name].destination
+            first_gift_id = current_state.loaded_gifts.first()
+            target_pos = all_gift_map[first_gift_id].destination
 
         max_accel = accel_table.get_max_acceleration_for_weight(
             current_state.sleigh_weight
         )
 
         if max_accel == 0 or current_state.carrot_count == 0:
-            return (Action.Floating, 1)
+            return (
+                Action.Floating,
+                self._coast_steps(current_state, problem, all_gift_map),
+            )
 
         accel_val = min(1, max_accel)
 
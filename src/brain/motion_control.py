@@ -1,11 +1,104 @@
+import math
+from typing import Optional
+
 from core.actions import Action, Direction
 from models.coordinate import Coordinate
 from models.sleigh_state import SleighState
+from models.velocity import Velocity
 
 
-def get_stopping_distance(velocity: int) -> int:
+def get_stopping_distance(velocity: int, max_acc: int = 1) -> int:
+    """
+    Droga hamowania przy hamowaniu o max_acc na krok (licząc bieżący krok):
+    v + (v - a) + (v - 2a) + ... dopóki prędkość jest dodatnia.
+    """
     v = abs(velocity)
-    return (v * (v + 1)) // 2
+    if v == 0:
+        return 0
+    n = -(-v // max_acc)
+    return n * v - max_acc * n * (n - 1) // 2
+
+
+def steps_until_in_range(
+    position: Coordinate, velocity: Velocity, target: Coordinate, radius: float
+) -> Optional[int]:
+    """
+    Najmniejsze t >= 0, po którym sanie lecące ze stałą prędkością są w
+    odległości <= radius od celu, albo None, jeśli nigdy tam nie dolecą.
+    """
+    dc = position.c - target.c
+    dr = position.r - target.r
+    vc, vr = velocity.vc, velocity.vr
+
+    def inside(t):
+        c = dc + t * vc
+        r = dr + t * vr
+        return c * c + r * r <= radius * radius
+
+    if inside(0):
+        return 0
+
+    # |d + t v|^2 <= R^2  <=>  a t^2 + b t + c <= 0
+    a = vc * vc + vr * vr
+    b = 2 * (dc * vc + dr * vr)
+    c = dc * dc + dr * dr - radius * radius
+    if a == 0 or b >= 0:
+        return None
+    delta = b * b - 4 * a * c
+    if delta < 0:
+        return None
+
+    root = math.sqrt(delta)
+    t_first = max(1, math.ceil((-b - root) / (2 * a)))
+    t_last = math.floor((-b + root) / (2 * a))
+
+    # Poprawka na zaokrąglenia pierwiastka - sprawdzamy dokładnie na liczbach
+    while t_first > 1 and inside(t_first - 1):
+        t_first -= 1
+    while t_first <= t_last + 1:
+        if inside(t_first):
+            return t_first
+        t_first += 1
+    return None
+
+
+def coast_steps(
+    state: SleighState, target: Coordinate, radius: float, max_acc: int = 1
+) -> int:
+    """
+    Ile kroków Float z rzędu zwróciłby get_move_action: sanie lecą, dopóki
+    żadna oś nie musi zacząć hamować i cel nie znalazł się w zasięgu.
+    Zakłada, że get_move_action właśnie zwróciło Float.
+    """
+    dc = target.c - state.position.c
+    dr = target.r - state.position.r
+    vc, vr = state.velocity.vc, state.velocity.vr
+
+    k = math.inf
+    for dist, vel in ((dc, vc), (dr, vr)):
+        if vel == 0:
+            continue
+        if dist * vel <= 0:
+            return 1
+        stop_dist = get_stopping_distance(vel, max_acc)
+        k = min(k, math.ceil((abs(dist) - stop_dist) / abs(vel)))
+
+    # Oś r stojąca poza celem zawsze dostaje przyspieszenie, a oś c czeka,
+    # dopóki |dc| < |dr| (get_move_action najpierw wyrównuje dłuższą oś)
+    if vr == 0 and dr != 0:
+        return 1
+    if vc == 0 and dc != 0:
+        if vr == 0:
+            return 1
+        k = min(k, math.ceil((abs(dr) - abs(dc)) / abs(vr)))
+
+    in_range = steps_until_in_range(state.position, state.velocity, target, radius)
+    if in_range is not None and in_range >= 1:
+        k = min(k, in_range)
+
+    if k == math.inf:
+        return 1
+    return max(int(k), 1)
 
 
 def get_move_action(state: SleighState, target: Coordinate) -> tuple[Action, int]:
@@ -0,0 +1,199 @@
+import math
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from core.travel_time import nearest_neighbours
+from models.coordinate import Coordinate
+from models.gift_catalog import GiftCatalog
+
+# Ruch jest wykonywany tylko przy zysku większym niż ten margines
+EPSILON = 1e-9
+MAX_SEGMENT = 3
+# Domyślny limit węzłów sprawdzonych z kolejki - wynik nie zależy od zegara
+DEFAULT_MAX_CHECKS = 200_000
+
+
+class _Tour:
+    """
+    Zamknięta trasa po węzłach 0..m-1 (0 - baza) z pozycją każdego węzła,
+    więc następnik, poprzednik i koszt zmiany są liczone w O(1).
+    """
+
+    def __init__(self, xs: list, ys: list):
+        self.xs = xs
+        self.ys = ys
+        self.m = len(xs)
+        self.order = list(range(self.m))
+        self.pos = list(range(self.m))
+
+    def dist(self, a: int, b: int) -> float:
+        return math.hypot(self.xs[a] - self.xs[b], self.ys[a] - self.ys[b])
+
+    def succ(self, a: int) -> int:
+        return self.order[(self.pos[a] + 1) % self.m]
+
+    def pred(self, a: int) -> int:
+        return self.order[self.pos[a] - 1]
+
+    def reverse(self, first: int, last: int):
+        """Odwraca fragment od first do last (w przód, cyklicznie)."""
+        m = self.m
+        i, j = self.pos[first], self.pos[last]
+        length = (j - i) % m + 1
+        if 2 * length > m:
+            # Odwrócenie dopełnienia daje tę samą trasę mniejszym kosztem
+            i, j = (j + 1) % m, (i - 1) % m
+            length = m - length
+        order, pos = self.order, self.pos
+        for _ in range(length // 2):
+            a, b = order[i], order[j]
+            order[i], order[j] = b, a
+            pos[a], pos[b] = j, i
+            i = (i + 1) % m
+            j = (j - 1) % m
+
+    def move_segment(self, first: int, length: int, after: int, flip: bool):
+        """
+        Przenosi length węzłów od first za węzeł after (odwrócone z flip).
+        Trzy odwrócenia zamiast przebudowy całej trasy - każde kosztuje
+        tyle, ile krótszy z dwóch łuków.
+        """
+        last = first
+        for _ in range(length - 1):
+            last = self.succ(last)
+        p, n = self.pred(first), self.succ(last)
+
+        # p [first..last] n .. after  ->  p after .. n [last..first]
+        self.reverse(first, after)
+        # reverse mogło odwrócić dopełnienie - kierunek trasy sprawdzamy od p
+        if self.succ(p) == after:
+            self.reverse(after, n)
+        else:
+            self.reverse(n, after)
+        # Teraz p n .. after [last..first], czyli odcinek odwrócony
+        if not flip:
+            if self.succ(after) == last:
+                self.reverse(last, first)
+            else:
+                self.reverse(first, last)
+
+
+def _two_opt(tour: _Tour, a: int, candidates: list) -> tuple:
+    """Pierwszy poprawiający ruch 2-opt z krawędzią przy a - zmienione węzły."""
+    for forward in (True, False):
+        b = tour.succ(a) if forward else tour.pred(a)
+        d_ab = tour.dist(a, b)
+        for c in candidates[a]:
+            d_ac = tour.dist(a, c)
+            if d_ac >= d_ab - EPSILON:
+                # Sąsiedzi są posortowani - dalej już tylko gorzej
+                break
+            d = tour.succ(c) if forward else tour.pred(c)
+            if c == b or d == a:
+                continue
+            delta = d_ac + tour.dist(b, d) - d_ab - tour.dist(c, d)
+            if delta < -EPSILON:
+                if forward:
+                    tour.reverse(b, c)
+                else:
+                    tour.reverse(c, b)
+                return a, b, c, d
+    return ()
+
+
+def _or_opt(tour: _Tour, a: int, candidates: list) -> tuple:
+    """Przeniesienie odcinka 1..MAX_SEGMENT węzłów zaczynającego się w a."""
+    for length in range(1, MAX_SEGMENT + 1):
+        if length + 2 >= tour.m:
+            break
+        last = a
+        segment = [a]
+        for _ in range(length - 1):
+            last = tour.succ(last)
+            segment.append(last)
+        p, n = tour.pred(a), tour.succ(last)
+        gain = tour.dist(p, a) + tour.dist(last, n) - tour.dist(p, n)
+        if gain <= EPSILON:
+            continue
+
+        for end in (a, last):
+            for c in candidates[end]:
+                if c in segment:
+                    continue
+                if tour.dist(end, c) >= gain:
+                    # Heurystyka list sąsiadów - dalsi kandydaci raczej nie zyskają
+                    break
+                for e in (tour.succ(c), tour.pred(c)):
+                    if e in segment:
+                        continue
+                    # Wstawienie na krawędź (c, e) w dwóch orientacjach
+                    d_ce = tour.dist(c, e)
+                    straight = tour.dist(c, a) + tour.dist(last, e) - d_ce
+                    flipped = tour.dist(c, last) + tour.dist(a, e) - d_ce
+                    if min(straight, flipped) < gain - EPSILON:
+                        if e == tour.succ(c):
+                            after, flip = c, flipped < straight
+                        else:
+                            after, flip = e, straight <= flipped
+                        tour.move_segment(a, length, after, flip)
+                        return p, n, c, e, a, last
+    return ()
+
+
+def improve_route(
+    route: list[int],
+    all_gifts_map: GiftCatalog,
+    start_pos: Coordinate,
+    max_checks: Optional[int] = DEFAULT_MAX_CHECKS,
+    time_budget: Optional[float] = None,
+    neighbours: int = 8,
+) -> list[int]:
+    """
+    Poprawia trasę start_pos -> prezenty -> start_pos ruchami 2-opt i Or-opt.
+    Kandydaci na nowe krawędzie to tylko neighbours najbliższych węzłów,
+    a węzły do sprawdzenia są w kolejce (don't-look bits), więc jedna runda
+    nie jest kwadratowa. Kończy w lokalnym optimum, po max_checks węzłach
+    zdjętych z kolejki albo - tylko gdy podano time_budget - po tylu sekundach.
+    """
+    if len(route) < 3:
+        return list(route)
+
+    ids = np.asarray(route, dtype=np.int64)
+    xs = np.concatenate([[start_pos.c], all_gifts_map.dest_c[ids]])
+    ys = np.concatenate([[start_pos.r], all_gifts_map.dest_r[ids]])
+    candidates = nearest_neighbours(xs, ys, neighbours).tolist()
+    tour = _Tour(xs.tolist(), ys.tolist())
+
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    checks = 0
+    queue = deque(range(tour.m))
+    queued = [True] * tour.m
+    while queue and (max_checks is None or checks < max_checks):
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        checks += 1
+        a = queue.popleft()
+        queued[a] = False
+        touched = _two_opt(tour, a, candidates) or _or_opt(tour, a, candidates)
+        for node in touched:
+            if not queued[node]:
+                queued[node] = True
+                queue.append(node)
+        if touched and not queued[a]:
+            queued[a] = True
+            queue.append(a)
+
+    start = tour.pos[0]
+    order = tour.order[start + 1 :] + tour.order[:start]
+    return [route[node - 1] for node in order]
+
+
+def route_length(route: list[int], all_gifts_map: GiftCatalog, start_pos) -> float:
+    """Długość zamkniętej trasy start_pos -> prezenty -> start_pos."""
+    ids = np.asarray(route, dtype=np.int64)
+    xs = np.concatenate([[start_pos.c], all_gifts_map.dest_c[ids], [start_pos.c]])
+    ys = np.concatenate([[start_pos.r], all_gifts_map.dest_r[ids], [start_pos.r]])
+    return float(np.hypot(np.diff(xs), np.diff(ys)).sum())
@@ -1,48 +1,137 @@
+from typing import Iterable
+
+import numpy as np
+
 from core.distance_utils import distance
+from core.spatial_index import GiftSpatialIndex
+from core.trip_loader import TripLoader
+from core.trip_selector import BranchAndBoundSelector
+from core.travel_time import BASE, TravelTimeMatrix, estimate_travel_time
 from models.coordinate import Coordinate
-from models.gift import Gift
+from models.gift_catalog import GiftCatalog
 
 
 def plan_delivery_batch(
-    available_gifts: list[str],
-    all_gifts_map: dict[str, Gift],
+    available_gifts: Iterable[int],
+    all_gifts_map: GiftCatalog,
     current_weight: int,
     accel_table,
-) -> list[str]:
-    selected_gifts = []
-    MAX_SAFE_WEIGHT = 60
-
-    simulated_weight = current_weight
-
+    spatial_index: GiftSpatialIndex = None,
+    pool_size: int = 256,
+    time_left: int = None,
+    range_d: int = 0,
+    selector: BranchAndBoundSelector = None,
+    travel_times: TravelTimeMatrix = None,
+) -> list[int]:
+    """
+    Zestaw na kurs: spośród pool_size najbliższych bazie prezentów wybiera
+    plecak z TripLoader (punkty kontra wolniejsza klasa przyspieszenia)
+    albo, gdy podano selector, podział i ograniczenia po punktach na krok.
+    Z time_left pomijane są prezenty, do których nawet przy największym
+    przyspieszeniu nie da się dolecieć i wrócić w pozostałym czasie (czasy z
+    macierzy travel_times, jeśli podano).
+    Z indeksem przestrzennym nie trzeba sortować wszystkich - prezenty już
+    niedostępne są z niego usuwane przy okazji przeglądania.
+    """
     lapland = Coordinate(0, 0)
-    sorted_gifts = sorted(
-        available_gifts, key=lambda g: distance(lapland, all_gifts_map[g].destination)
-    )
+    if spatial_index is not None:
+        sorted_gifts = spatial_index.iter_nearest(lapland.c, lapland.r)
+    else:
+        sorted_gifts = sorted(
+            available_gifts,
+            key=lambda g: distance(lapland, all_gifts_map[g].destination),
+        )
 
-    for g_name in sorted_gifts:
-        gift = all_gifts_map[g_name]
-        if simulated_weight + gift.weight < MAX_SAFE_WEIGHT:
-            selected_gifts.append(g_name)
-            simulated_weight += gift.weight
-        else:
+    pool = []
+    for gift_id in sorted_gifts:
+        if gift_id not in available_gifts:
+            spatial_index.remove(gift_id)
+            continue
+        pool.append(gift_id)
+        if len(pool) == pool_size:
             break
 
-    return selected_gifts
+    loader = TripLoader.from_table(accel_table, all_gifts_map)
+    if time_left is not None and pool and loader.classes:
+        ids = np.array(pool, dtype=np.int64)
+        fastest = max(accel for _, accel in loader.classes)
+        if travel_times is not None:
+            one_way = travel_times.times_from(BASE, ids + 1, fastest)
+        else:
+            one_way = estimate_travel_time(
+                all_gifts_map.dest_c[ids], all_gifts_map.dest_r[ids], fastest, range_d
+            )
+        pool = ids[2 * one_way <= time_left].tolist()
+
+    if selector is not None:
+        chosen = selector.select(pool, current_weight, time_left=time_left)
+    else:
+        chosen = loader.select(pool, current_weight)
+    chosen = set(chosen.tolist())
+    # Kolejność jak w puli - od najbliższych
+    return [gift_id for gift_id in pool if gift_id in chosen]
 
 
 def sort_route_tsp(
-    loaded_gifts: list[str], all_gifts_map: dict[str, Gift], start_pos: Coordinate
-) -> list[str]:
+    loaded_gifts: Iterable[int],
+    all_gifts_map: GiftCatalog,
+    start_pos: Coordinate,
+    travel_times: TravelTimeMatrix = None,
+    max_acc: int = None,
+) -> list[int]:
+    """
+    Trasa najbliższego sąsiada. Z macierzą travel_times (i przyspieszeniem
+    max_acc) sąsiad jest wybierany po szacowanym czasie przelotu zamiast
+    po odległości.
+    """
+    ids = np.fromiter(loaded_gifts, dtype=np.int64)
+    if len(ids) == 0:
+        return []
+    if travel_times is not None:
+        return _sort_route_by_time(ids, all_gifts_map, start_pos, travel_times, max_acc)
+
+    remaining = GiftSpatialIndex(
+        all_gifts_map.dest_c[ids], all_gifts_map.dest_r[ids], ids=ids
+    )
     route = []
-    current_pos = start_pos
-    remaining = loaded_gifts[:]
+    current_c, current_r = start_pos.c, start_pos.r
 
-    while remaining:
-        nearest = min(
-            remaining, key=lambda g: distance(current_pos, all_gifts_map[g].destination)
-        )
+    while len(remaining):
+        nearest = remaining.nearest(current_c, current_r)[0]
         route.append(nearest)
         remaining.remove(nearest)
-        current_pos = all_gifts_map[nearest].destination
+        current_c, current_r = (
+            all_gifts_map.dest_c[nearest],
+            all_gifts_map.dest_r[nearest],
+        )
+
+    return route
+
+
+def _sort_route_by_time(ids, all_gifts_map, start_pos, travel_times, max_acc):
+    # Start nie musi być punktem macierzy, więc pierwszy krok liczymy wprost
+    times = estimate_travel_time(
+        all_gifts_map.dest_c[ids] - start_pos.c,
+        all_gifts_map.dest_r[ids] - start_pos.r,
+        max_acc,
+        travel_times.range_d,
+    )
+    points = ids + 1
+    dest_c = all_gifts_map.dest_c[ids].astype(np.int64)
+    dest_r = all_gifts_map.dest_r[ids].astype(np.int64)
+    current_c, current_r = start_pos.c, start_pos.r
+    visited = np.zeros(len(ids), dtype=bool)
+    route = []
+    for _ in range(len(ids)):
+        times = times.astype(np.int64)
+        times[visited] = np.iinfo(np.int64).max
+        # Czasy są w całych krokach - remisy rozstrzyga odległość
+        tied = np.flatnonzero(times == times.min())
+        d2 = (dest_c[tied] - current_c) ** 2 + (dest_r[tied] - current_r) ** 2
+        i = int(tied[np.argmin(d2)])
+        visited[i] = True
+        route.append(int(ids[i]))
+        current_c, current_r = dest_c[i], dest_r[i]
+        times = travel_times.times_from(int(points[i]), points, max_acc)
 
     return route
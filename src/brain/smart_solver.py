@@ -1,11 +1,21 @@
+from collections import deque
 from enum import Enum, auto
+from typing import Optional
 
-from brain.motion_control import get_move_action
+from brain.motion_control import coast_steps, get_move_action, steps_until_in_range
+from brain.route_improver import DEFAULT_MAX_CHECKS, improve_route
 from brain.route_planner import plan_delivery_batch, sort_route_tsp
+from brain.trajectory import count_accelerations, plan_leg, run_leg
+from brain.trip_planner import Trip, plan_trips
 from core.actions import Action
+from core.trip_loader import TripLoader
+from core.trip_selector import BranchAndBoundSelector
 from core.distance_utils import distance
 from models.coordinate import Coordinate
 
+# Marchewki ponad szacunek przyspieszeń kursu
+CARROT_RESERVE = 2
+
 
 class MissionState(Enum):
     AT_BASE = auto()
@@ -14,73 +24,320 @@ class MissionState(Enum):
 
 
 class SmartSolver:
-    def __init__(self):
+    def __init__(
+        self,
+        route_max_checks: Optional[int] = DEFAULT_MAX_CHECKS,
+        route_time_budget: Optional[float] = None,
+        use_trip_plan: bool = True,
+        use_branch_and_bound: bool = False,
+    ):
+        """
+        route_max_checks: limit węzłów sprawdzonych przy poprawie trasy
+        (2-opt/Or-opt) przed kursem - ten sam wynik na każdej maszynie.
+        route_time_budget: opcjonalny limit sekund na tę poprawę.
+        use_trip_plan: kursy z planu całej misji (plan_trips) zamiast
+        wybierania każdego kursu od nowa.
+        use_branch_and_bound: prezenty na kurs wybiera BranchAndBoundSelector
+        (punkty na krok, eksperymentalnie) zamiast plecaka z TripLoader.
+        """
+        self.route_max_checks = route_max_checks
+        self.route_time_budget = route_time_budget
+        self.use_trip_plan = use_trip_plan
+        self.use_branch_and_bound = use_branch_and_bound
+        self.selector = None
+        self.trips = None
         self.mission_state = MissionState.AT_BASE
         self.delivery_queue = []
+        # Prezenty wybrane na bieżący kurs, jeszcze niezaładowane
+        self.load_queue = deque()
+        self.available_index = None
+        # Harmonogram bieżącego odcinka z plan_leg i jego cel
+        self.leg = deque()
+        self.leg_target = None
 
     def resolve(self, state, problem, accel_table, all_gifts_map):
         if state.last_action_was_acceleration:
+            if self.leg and self.leg[0][0] == Action.Floating:
+                return self._next_leg_command(state, problem)
             return Action.Floating, 1
 
         lapland = Coordinate(0, 0)
 
         if self.mission_state == MissionState.AT_BASE:
             if state.carrot_count < 10:
-                return Action.LoadCarrots, 20
+                return Action.LoadCarrots, 40
 
-            if not state.loaded_gifts:
+            if not state.loaded_gifts and not self.load_queue:
                 if not state.available_gifts:
                     return Action.Floating, 1
 
-                to_load = plan_delivery_batch(
-                    state.available_gifts,
-                    all_gifts_map,
-                    state.sleigh_weight,
-                    accel_table,
+                if self.available_index is None:
+                    self.available_index = problem.spatial_index.copy()
+
+                planned = []
+                if self.use_trip_plan:
+                    planned = self._next_planned_trip(
+                        state, problem, accel_table, all_gifts_map
+                    )
+                self.load_queue = deque(
+                    planned
+                    or plan_delivery_batch(
+                        state.available_gifts,
+                        all_gifts_map,
+                        state.sleigh_weight,
+                        accel_table,
+                        spatial_index=self.available_index,
+                        time_left=problem.T - state.current_time,
+                        range_d=problem.D,
+                        selector=self._selector(problem, accel_table, all_gifts_map),
+                        travel_times=problem.travel_times,
+                    )
                 )
 
-                if not to_load:
+                if not self.load_queue:
                     return Action.Floating, 1
 
-                try:
-                    target_gift_name = to_load[0]
-                    target_idx = state.available_gifts.index(target_gift_name)
-                    return Action.LoadGifts, target_idx
-                except ValueError:
-                    return Action.Floating, 1
+            if self.load_queue:
+                return Action.LoadGifts, self.load_queue.popleft()
 
             if not self.delivery_queue:
-                self.delivery_queue = sort_route_tsp(
-                    state.loaded_gifts, all_gifts_map, lapland
+                self.delivery_queue = improve_route(
+                    sort_route_tsp(state.loaded_gifts, all_gifts_map, lapland),
+                    all_gifts_map,
+                    lapland,
+                    max_checks=self.route_max_checks,
+                    time_budget=self.route_time_budget,
                 )
                 self.mission_state = MissionState.DELIVERING
+                missing = self._carrots_needed(
+                    state, problem, accel_table, all_gifts_map
+                )
+                if missing > 0:
+                    return Action.LoadCarrots, missing
 
         if self.mission_state == MissionState.DELIVERING:
             if not self.delivery_queue:
                 self.mission_state = MissionState.RETURNING
                 return Action.Floating, 1
 
-            target_gift_name = self.delivery_queue[0]
-            target_gift = all_gifts_map[target_gift_name]
+            target_gift_id = self.delivery_queue[0]
+            target_gift = all_gifts_map[target_gift_id]
 
             curr_dist = distance(state.position, target_gift.destination)
 
             if curr_dist <= problem.D:
-                try:
-                    idx = state.loaded_gifts.index(target_gift_name)
+                self.leg.clear()
+                self.leg_target = None
+                if target_gift_id in state.loaded_gifts:
                     self.delivery_queue.pop(0)
-                    return Action.DeliverGift, idx
-                except ValueError:
-                    self.mission_state = MissionState.RETURNING
+                    return Action.DeliverGift, target_gift_id
+                self.mission_state = MissionState.RETURNING
 
-            return get_move_action(state, target_gift.destination)
+            return self._move(state, problem, accel_table, target_gift.destination)
 
         if self.mission_state == MissionState.RETURNING:
-            if distance(state.position, lapland) <= problem.D:
+            # Z harmonogramem dolatujemy do końca odcinka, żeby stanąć w bazie
+            if distance(state.position, lapland) <= problem.D and not self.leg:
                 self.mission_state = MissionState.AT_BASE
                 self.delivery_queue = []
                 return Action.Floating, 1
 
-            return get_move_action(state, lapland)
+            return self._move(state, problem, accel_table, lapland)
 
         return Action.Floating, 1
+
+    def _next_planned_trip(self, state, problem, accel_table, all_gifts_map):
+        """
+        Następny kurs z planu misji, przycięty do obecnej wagi i czasu oraz
+        tak, żeby zostało miejsce na marchewki potrzebne na trasę. Prezenty
+        odcięte przy przycinaniu wracają na początek planu jako osobny kurs.
+        """
+        time_left = problem.T - state.current_time
+        if self.trips is None:
+            self.trips = deque(
+                plan_trips(
+                    all_gifts_map,
+                    accel_table,
+                    problem.D,
+                    time_limit=time_left,
+                    base_weight=state.sleigh_weight,
+                    travel_times=problem.travel_times,
+                )
+            )
+
+        loader = self._selector(problem, accel_table, all_gifts_map)
+        loader = loader or TripLoader.from_table(accel_table, all_gifts_map)
+        while self.trips:
+            trip = self.trips.popleft()
+            if trip.est_time > time_left:
+                continue
+            gift_ids = [g for g in trip.gift_ids if g in state.available_gifts]
+            chosen = set(loader.select(gift_ids, state.sleigh_weight).tolist())
+            while len(chosen) > 1 and not self._carrots_fit(
+                state, problem, accel_table, all_gifts_map, chosen
+            ):
+                # Odpada prezent z najmniejszą liczbą punktów na jednostkę wagi
+                chosen.remove(
+                    min(
+                        chosen,
+                        key=lambda g: all_gifts_map.scores[g]
+                        / max(all_gifts_map.weights[g], 1),
+                    )
+                )
+            if chosen:
+                leftover = [g for g in gift_ids if g not in chosen]
+                if leftover:
+                    # Prezenty, które się nie zmieściły, lecą następnym kursem
+                    self.trips.appendleft(
+                        Trip(
+                            gift_ids=leftover,
+                            weight=int(all_gifts_map.weights[leftover].sum()),
+                            score=int(all_gifts_map.scores[leftover].sum()),
+                            est_time=trip.est_time,
+                        )
+                    )
+                return [g for g in gift_ids if g in chosen]
+        return []
+
+    def _carrots_fit(self, state, problem, accel_table, all_gifts_map, gift_ids):
+        """Czy z prezentami gift_ids zmieszczą się marchewki na ich trasę."""
+        gift_ids = list(gift_ids)
+        gifts_weight = int(all_gifts_map.weights[gift_ids].sum())
+        route = sort_route_tsp(gift_ids, all_gifts_map, Coordinate(0, 0))
+        need = self._route_accelerations(
+            state, problem, accel_table, all_gifts_map, gifts_weight, route
+        )
+        if need is None:
+            return False
+        missing = max(need + CARROT_RESERVE - state.carrot_count, 0)
+        weight = state.sleigh_weight + gifts_weight + missing
+        return accel_table.get_max_acceleration_for_weight(weight) > 0
+
+    def _carrots_needed(self, state, problem, accel_table, all_gifts_map) -> int:
+        """
+        Ile marchewek dobrać przed kursem. Odcinki trasy delivery_queue i
+        powrotu są odtwarzane tak, jak wykona je _move (plan_leg od miejsca,
+        w którym stanął poprzedni odcinek, przy malejącej wadze), bez
+        przekraczania wagi, przy której sanie mogą jeszcze przyspieszać.
+        """
+        extra = 0
+        for _ in range(3):
+            need = self._route_accelerations(
+                state, problem, accel_table, all_gifts_map, extra
+            )
+            if need is None or need + CARROT_RESERVE <= state.carrot_count + extra:
+                break
+            extra = need + CARROT_RESERVE - state.carrot_count
+
+        while extra > 0 and (
+            accel_table.get_max_acceleration_for_weight(state.sleigh_weight + extra)
+            <= 0
+        ):
+            extra //= 2
+        return extra
+
+    def _route_accelerations(
+        self, state, problem, accel_table, all_gifts_map, extra, route=None
+    ):
+        """
+        Przyspieszenia trasy route (domyślnie delivery_queue) przy dodatkowej
+        wadze extra - marchewkach albo prezentach jeszcze niezaładowanych
+        (None - brak ruchu).
+        """
+        weight = state.sleigh_weight + extra
+        c, r = state.position.c, state.position.r
+        vc, vr = state.velocity.vc, state.velocity.vr
+        route = self.delivery_queue if route is None else route
+        stops = [(g, all_gifts_map[g].destination) for g in route]
+
+        total = 0
+        for gift_id, target in stops + [(None, Coordinate(0, 0))]:
+            if (
+                gift_id is None
+                or (target.c - c) ** 2 + (target.r - r) ** 2 > problem.D**2
+            ):
+                # Waga spada do zera dopiero z ostatnią marchewką - szacunek
+                # liczy dalej, a brakujące marchewki dokłada extra
+                max_acc = accel_table.get_max_acceleration_for_weight(max(weight, 1))
+                if max_acc <= 0:
+                    return None
+                schedule = plan_leg(
+                    target.c - c, target.r - r, vc, vr, max_acc, problem.D
+                )
+                # Do prezentu odcinek urywa się w zasięgu, do bazy trwa do końca
+                c, r, vc, vr, accelerations = run_leg(
+                    c,
+                    r,
+                    vc,
+                    vr,
+                    schedule,
+                    target if gift_id is not None else None,
+                    problem.D,
+                )
+                total += accelerations
+                weight -= accelerations
+            if gift_id is not None:
+                weight -= all_gifts_map[gift_id].weight
+        return total
+
+    def _selector(self, problem, accel_table, all_gifts_map):
+        if self.use_branch_and_bound and self.selector is None:
+            self.selector = BranchAndBoundSelector.from_table(
+                accel_table, all_gifts_map, problem.D
+            )
+        return self.selector
+
+    def _move(self, state, problem, accel_table, target):
+        """
+        Odcinek do celu wykonywany wg harmonogramu z plan_leg. Gdy nie da się
+        go zaplanować (brak przyspieszenia lub marchewek), zostaje
+        get_move_action z lotem bez korekt jako jedno Float k - i tylko
+        dozwolone przyspieszenia.
+        """
+        # Planujemy raz na cel - nieudany plan nie jest powtarzany co krok
+        if self.leg_target != (target.c, target.r):
+            self.leg = self._plan_leg(state, problem, accel_table, target)
+            self.leg_target = (target.c, target.r)
+        if self.leg:
+            return self._next_leg_command(state, problem)
+
+        remaining = problem.T - state.current_time
+        action, value = get_move_action(state, target)
+        if action != Action.Floating:
+            max_acc = accel_table.get_max_acceleration_for_weight(state.sleigh_weight)
+            if state.carrot_count >= 1 and max_acc >= value:
+                return action, value
+            # Bez marchewek (albo przy zerowym przyspieszeniu) nie da się
+            # skręcić - sanie dryfują, aż cel wpadnie w zasięg albo minie czas
+            k = steps_until_in_range(state.position, state.velocity, target, problem.D)
+            return Action.Floating, max(1, min(k or remaining, remaining))
+
+        k = coast_steps(state, target, problem.D)
+        return Action.Floating, max(1, min(k, remaining))
+
+    def _plan_leg(self, state, problem, accel_table, target):
+        max_acc = accel_table.get_max_acceleration_for_weight(state.sleigh_weight)
+        if max_acc <= 0:
+            return deque()
+
+        schedule = plan_leg(
+            target.c - state.position.c,
+            target.r - state.position.r,
+            state.velocity.vc,
+            state.velocity.vr,
+            max_acc,
+            problem.D,
+        )
+        if count_accelerations(schedule) > state.carrot_count:
+            return deque()
+        return deque(schedule)
+
+    def _next_leg_command(self, state, problem):
+        action, value = self.leg.popleft()
+        if action == Action.Floating:
+            remaining = problem.T - state.current_time
+            if value >= remaining:
+                # Koniec czasu - reszta odcinka i tak się nie wykona
+                self.leg.clear()
+                value = max(1, remaining)
+        return action, value
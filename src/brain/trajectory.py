@@ -0,0 +1,147 @@
+import math
+from functools import lru_cache
+
+from brain.motion_control import get_stopping_distance
+from core.actions import Action
+
+# Bezpiecznik na wypadek nieosiągalnego celu
+MAX_LEG_TICKS = 100_000
+
+
+def _braking_distance(speed: int, max_acc: int, period: int) -> int:
+    """
+    Droga do zatrzymania od prędkości speed (licząc bieżący krok), gdy oś
+    dostaje slot na przyspieszenie tylko co period kroków.
+    """
+    return period * get_stopping_distance(speed, max_acc)
+
+
+def _max_safe_speed(dist: int, max_acc: int, period: int) -> int:
+    """Największa prędkość w stronę celu, przy której da się zatrzymać przed nim."""
+    low, high = 0, 1
+    while _braking_distance(high, max_acc, period) <= dist:
+        low, high = high, high * 2
+    while high - low > 1:
+        mid = (low + high) // 2
+        if _braking_distance(mid, max_acc, period) <= dist:
+            low = mid
+        else:
+            high = mid
+    return low
+
+
+def _axis_command(dist: int, vel: int, max_acc: int, period: int) -> tuple[int, int]:
+    """(przyspieszenie dla osi, pilność) - pilność > 0 oznacza hamowanie."""
+    if dist == 0:
+        return max(-max_acc, min(max_acc, -vel)), abs(vel)
+
+    direction = 1 if dist > 0 else -1
+    safe = direction * _max_safe_speed(abs(dist), max_acc, period)
+    accel = max(-max_acc, min(max_acc, safe - vel))
+
+    if vel * direction < 0:
+        overspeed = abs(vel)
+    else:
+        overspeed = max(0, abs(vel) - abs(safe))
+    return accel, overspeed
+
+
+def _append_float(schedule: list, k: int):
+    if schedule and schedule[-1][0] == Action.Floating:
+        schedule[-1] = (Action.Floating, schedule[-1][1] + k)
+    else:
+        schedule.append((Action.Floating, k))
+
+
+@lru_cache(maxsize=65536)
+def plan_leg(
+    dx: int, dy: int, vc: int, vr: int, max_acc: int, radius: int
+) -> tuple[tuple[Action, int], ...]:
+    """
+    Cały harmonogram przelotu o (dx, dy) z prędkością (vc, vr): komendy
+    przyspieszeń i Float k, po których sanie stoją w odległości <= radius
+    od celu. Na każdy krok przypada co najwyżej jedno przyspieszenie, więc
+    oś, która musi hamować, ma pierwszeństwo, a w pozostałych przypadkach
+    przyspiesza oś z większą różnicą do prędkości docelowej.
+    Zakłada stałą klasę przyspieszenia max_acc (waga spada przy każdym
+    przyspieszeniu, więc limit może tylko rosnąć). Wynik jest zapamiętywany.
+    """
+    if max_acc <= 0:
+        raise ValueError("Cannot plan a leg without acceleration")
+
+    # Cel jest osiągnięty, gdy obie osie są w tym zapasie - wtedy odległość
+    # jest na pewno <= radius
+    slack = int(radius / math.sqrt(2))
+
+    def effective(dist):
+        return 0 if abs(dist) <= slack else dist - slack * (1 if dist > 0 else -1)
+
+    schedule = []
+    for _ in range(MAX_LEG_TICKS):
+        if vc == 0 and vr == 0 and dx * dx + dy * dy <= radius * radius:
+            return tuple(schedule)
+
+        ec, er = effective(dx), effective(dy)
+        both_busy = (vc != 0 or ec != 0) and (vr != 0 or er != 0)
+
+        accel_c, urgency_c = _axis_command(ec, vc, max_acc, 2 if both_busy else 1)
+        accel_r, urgency_r = _axis_command(er, vr, max_acc, 2 if both_busy else 1)
+        if accel_c == 0 and accel_r == 0 and both_busy and vc == 0 and vr == 0:
+            # Obie osie stoją tuż przed celem - ostrożny model z dzielonymi
+            # slotami nie pozwoliłby ruszyć żadnej z nich
+            accel_c, urgency_c = _axis_command(ec, vc, max_acc, 1)
+            accel_r, urgency_r = _axis_command(er, vr, max_acc, 1)
+
+        if urgency_c > 0 or urgency_r > 0:
+            use_c = urgency_c >= urgency_r
+        else:
+            use_c = abs(accel_c) >= abs(accel_r)
+        if (use_c and accel_c == 0) or (not use_c and accel_r == 0):
+            use_c = not use_c
+
+        if use_c and accel_c != 0:
+            action = Action.AccRight if accel_c > 0 else Action.AccLeft
+            schedule.append((action, abs(accel_c)))
+            vc += accel_c
+        elif not use_c and accel_r != 0:
+            action = Action.AccUp if accel_r > 0 else Action.AccDown
+            schedule.append((action, abs(accel_r)))
+            vr += accel_r
+
+        _append_float(schedule, 1)
+        dx -= vc
+        dy -= vr
+
+    raise ValueError(f"Leg did not converge in {MAX_LEG_TICKS} ticks")
+
+
+def run_leg(c, r, vc, vr, schedule, target=None, radius=0):
+    """
+    Wykonuje harmonogram od (c, r) z prędkością (vc, vr) i zwraca
+    (c, r, vc, vr, wykonane przyspieszenia). Z target kończy po pierwszym
+    Float, po którym cel jest w zasięgu radius - tak jak solver, który
+    przerywa odcinek, gdy może już dostarczyć prezent.
+    """
+    accelerations = 0
+    for action, value in schedule:
+        if action == Action.Floating:
+            c += vc * value
+            r += vr * value
+            if target is not None:
+                if (target.c - c) ** 2 + (target.r - r) ** 2 <= radius * radius:
+                    break
+            continue
+        accelerations += 1
+        if action == Action.AccRight:
+            vc += value
+        elif action == Action.AccLeft:
+            vc -= value
+        elif action == Action.AccUp:
+            vr += value
+        elif action == Action.AccDown:
+            vr -= value
+    return c, r, vc, vr, accelerations
+
+
+def count_accelerations(schedule) -> int:
+    return sum(1 for action, _ in schedule if action != Action.Floating)
@@ -0,0 +1,142 @@
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from brain.route_planner import sort_route_tsp
+from core.acceleration_table import AccelerationTable
+from core.travel_time import TravelTimeMatrix, estimate_travel_time
+from core.trip_loader import default_speed
+from models.coordinate import Coordinate
+from models.gift_catalog import GiftCatalog
+
+
+@dataclass
+class Trip:
+    gift_ids: list[int]
+    weight: int
+    score: int
+    # Szacowany czas kursu - do ustalania kolejności kursów
+    est_time: int
+
+
+def default_capacity(accel_table: AccelerationTable, base_weight: float) -> int:
+    """
+    Ładowność kursu: klasa przyspieszenia z największym iloczynem
+    ładowność * speed(a) - przy pełnych kursach punkty rosną z wagą.
+    """
+    classes = [
+        (math.floor(r.max_weight_inclusive - base_weight), r.max_accel)
+        for r in accel_table.ranges
+        if r.max_accel > 0 and r.max_weight_inclusive > base_weight
+    ]
+    if not classes:
+        return 0
+    return max(classes, key=lambda c: c[0] * default_speed(c[1]))[0]
+
+
+def sweep_partition(
+    dest_c: np.ndarray, dest_r: np.ndarray, weights: np.ndarray, capacity: int
+) -> list[np.ndarray]:
+    """
+    Podział na kursy przez obrót promienia wokół bazy: prezenty posortowane
+    po kącie są cięte na kolejne grupy o łącznej wadze <= capacity.
+    Obrót zaczyna się w największej pustej luce kątowej, żeby nie przeciąć
+    skupiska leżącego na granicy -pi/pi. Cięcia wyznacza searchsorted na
+    sumach prefiksowych - pętla jest po kursach, nie po prezentach. Prezent
+    cięższy od capacity jest pomijany.
+    """
+    fits = np.flatnonzero(weights <= capacity)
+    angle = np.arctan2(dest_r[fits], dest_c[fits])
+    dist2 = dest_c[fits] ** 2 + dest_r[fits] ** 2
+    by_angle = np.lexsort((dist2, angle))
+    if len(by_angle) > 1:
+        sorted_angle = angle[by_angle]
+        # Luka za ostatnim kątem zawija przez pi do pierwszego
+        gaps = np.diff(sorted_angle, append=sorted_angle[0] + 2 * np.pi)
+        by_angle = np.roll(by_angle, -(int(np.argmax(gaps)) + 1))
+    order = fits[by_angle]
+
+    cumulative = np.cumsum(weights[order])
+    groups = []
+    start, used = 0, 0
+    while start < len(order):
+        stop = int(np.searchsorted(cumulative, used + capacity, side="right"))
+        groups.append(order[start:stop])
+        used = int(cumulative[stop - 1])
+        start = stop
+    return groups
+
+
+def plan_trips(
+    catalog: GiftCatalog,
+    accel_table: AccelerationTable,
+    range_d: int,
+    time_limit: Optional[int] = None,
+    base_weight: float = 0,
+    capacity: Optional[int] = None,
+    travel_times: Optional[TravelTimeMatrix] = None,
+) -> list[Trip]:
+    """
+    Plan całej misji z góry: podział celów na kursy mieszczące się w
+    ładowności (sweep_partition), kolejność przystanków w kursie (najbliższy
+    sąsiad) i kolejność kursów - najpierw te z największą liczbą punktów na
+    szacowaną jednostkę czasu. Z time_limit pomijane są prezenty, do których
+    nie da się dolecieć i wrócić nawet przy największym przyspieszeniu.
+    Z macierzą travel_times czasy przelotów są z niej odczytywane, a
+    przystanki ułożone po czasie zamiast po odległości.
+    """
+    if capacity is None:
+        capacity = default_capacity(accel_table, base_weight)
+    accels = [r.max_accel for r in accel_table.ranges if r.max_accel > 0]
+    if capacity <= 0 or not accels:
+        return []
+
+    dest_c, dest_r = catalog.dest_c, catalog.dest_r
+    weights, scores = catalog.weights, catalog.scores
+    # Czas z bazy przy przyspieszeniu klasy, w której będą latać kursy
+    trip_accel = accel_table.get_max_acceleration_for_weight(base_weight + capacity)
+    trip_accel = trip_accel or min(accels)
+    if travel_times is not None:
+        from_base = travel_times.base_times[travel_times.class_of(trip_accel), 1:]
+    else:
+        from_base = estimate_travel_time(dest_c, dest_r, trip_accel, range_d)
+
+    ids = np.arange(len(catalog))
+    if time_limit is not None:
+        fastest = estimate_travel_time(dest_c, dest_r, max(accels), range_d)
+        ids = ids[2 * fastest <= time_limit]
+
+    lapland = Coordinate(0, 0)
+    trips = []
+    for group in sweep_partition(dest_c[ids], dest_r[ids], weights[ids], capacity):
+        gift_ids = ids[group]
+        route = sort_route_tsp(
+            gift_ids.tolist(), catalog, lapland, travel_times, trip_accel
+        )
+        # Tam i z powrotem do najdalszego celu plus przeloty między celami
+        if travel_times is not None:
+            legs = np.array(
+                [
+                    travel_times.between(a, b, trip_accel)
+                    for a, b in zip(route, route[1:])
+                ],
+                dtype=np.int64,
+            )
+        else:
+            legs = estimate_travel_time(
+                np.diff(dest_c[route]), np.diff(dest_r[route]), trip_accel, range_d
+            )
+        est_time = int(2 * from_base[gift_ids].max() + legs.sum())
+        trips.append(
+            Trip(
+                gift_ids=route,
+                weight=int(weights[gift_ids].sum()),
+                score=int(scores[gift_ids].sum()),
+                est_time=max(est_time, 1),
+            )
+        )
+
+    trips.sort(key=lambda trip: trip.score / trip.est_time, reverse=True)
+    return trips
@@ -1,13 +1,68 @@
-from dataclasses import dataclass
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+import numpy as np
+
 from models.acceleration_range import AccelerationRange
 
+# Gęsta tablica waga -> przyspieszenie jest budowana tylko do tej wagi
+DENSE_WEIGHT_LIMIT = 1 << 20
+
 
 @dataclass
 class AccelerationTable:
+    """
+    Przedziały wagi skompilowane przy tworzeniu: posortowane górne granice
+    do bisect oraz (dla całkowitych wag) gęsta tablica waga -> max przyspieszenie.
+    Zakłada, że przedziały się nie nakładają - tak jak te z InputParser.
+    """
+
     ranges: list[AccelerationRange]
+    _upper: np.ndarray = field(init=False, repr=False, compare=False)
+    _lower: np.ndarray = field(init=False, repr=False, compare=False)
+    _accel: np.ndarray = field(init=False, repr=False, compare=False)
+    _upper_list: list = field(init=False, repr=False, compare=False)
+    _lower_list: list = field(init=False, repr=False, compare=False)
+    _accel_list: list = field(init=False, repr=False, compare=False)
+    _dense: list = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        ordered = sorted(self.ranges, key=lambda r: r.max_weight_inclusive)
+
+        self._upper = np.array(
+            [r.max_weight_inclusive for r in ordered], dtype=np.float64
+        )
+        self._lower = np.array(
+            [r.min_weight_exclusive for r in ordered], dtype=np.float64
+        )
+        self._accel = np.array([r.max_accel for r in ordered], dtype=np.int64)
+        self._upper_list = self._upper.tolist()
+        self._lower_list = self._lower.tolist()
+        self._accel_list = self._accel.tolist()
+
+        self._dense = []
+        if ordered and 0 <= self._upper[-1] <= DENSE_WEIGHT_LIMIT:
+            weights = np.arange(int(self._upper[-1]) + 1)
+            self._dense = self.get_max_acceleration_for_weights(weights).tolist()
 
     def get_max_acceleration_for_weight(self, weight: float) -> int:
-        for acceleration_range in self.ranges:
-            if acceleration_range.min_weight_exclusive < weight <= acceleration_range.max_weight_inclusive:
-                return acceleration_range.max_accel
-        return 0
\ No newline at end of file
+        int_weight = int(weight)
+        if int_weight == weight and 0 <= int_weight < len(self._dense):
+            return self._dense[int_weight]
+
+        i = bisect_left(self._upper_list, weight)
+        if i < len(self._upper_list) and self._lower_list[i] < weight:
+            return self._accel_list[i]
+        return 0
+
+    def get_max_acceleration_for_weights(self, weights: np.ndarray) -> np.ndarray:
+        """Wersja wektorowa - dla tablicy wag zwraca tablicę przyspieszeń."""
+        weights = np.asarray(weights)
+        if len(self._upper) == 0:
+            return np.zeros(weights.shape, dtype=np.int64)
+
+        i = np.searchsorted(self._upper, weights, side="left")
+        inside = i < len(self._upper)
+        i = np.minimum(i, len(self._upper) - 1)
+        inside &= self._lower[i] < weights
+        return np.where(inside, self._accel[i], 0)
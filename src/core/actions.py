@@ -1,10 +1,12 @@
 from enum import Enum, IntEnum, auto
-from typing import Mapping
+
+import numpy as np
 
 from core.acceleration_table import AccelerationTable
 from core.distance_utils import distance
+from core.trip_loader import TripLoader
 from models.coordinate import Coordinate
-from models.gift import Gift
+from models.gift_catalog import GiftCatalog
 from models.sleigh_state import SleighState
 
 
@@ -19,6 +21,19 @@ class Action(IntEnum):
     DeliverGift = 7
 
 
+# Nazwy komend w pliku rozwiązania
+COMMAND_NAMES = {
+    Action.AccUp: "AccUp",
+    Action.AccDown: "AccDown",
+    Action.AccLeft: "AccLeft",
+    Action.AccRight: "AccRight",
+    Action.Floating: "Float",
+    Action.LoadCarrots: "LoadCarrots",
+    Action.LoadGifts: "LoadGift",
+    Action.DeliverGift: "DeliverGift",
+}
+
+
 class Direction(Enum):
     UP = auto()
     DOWN = auto()
@@ -55,11 +70,14 @@ def accelerate(
     return new_state
 
 
-def floating(new_state: SleighState) -> SleighState:
-    new_state.position.c += new_state.velocity.vc
-    new_state.position.r += new_state.velocity.vr
+def floating(new_state: SleighState, k: int = 1) -> SleighState:
+    """Float k - k kroków ze stałą prędkością w O(1)."""
+    assert k >= 1
+
+    new_state.position.c += new_state.velocity.vc * k
+    new_state.position.r += new_state.velocity.vr * k
 
-    new_state.current_time += 1
+    new_state.current_time += k
 
     new_state.last_action_was_acceleration = False
     return new_state
@@ -67,19 +85,18 @@ def floating(new_state: SleighState) -> SleighState:
 
 def load_gifts(
     new_state: SleighState,
-    gift_index: int,
-    all_gifts_map: Mapping[str, Gift],
+    gift_id: int,
+    all_gifts_map: GiftCatalog,
     lapland_pos: Coordinate,
     range_d: int,
 ) -> SleighState:
     assert distance(new_state.position, lapland_pos) <= range_d
-    assert gift_index < len(new_state.available_gifts) and gift_index >= 0
+    assert gift_id in new_state.available_gifts
 
-    gift_name = new_state.available_gifts[gift_index]
-    gift = all_gifts_map[gift_name]
+    gift = all_gifts_map[gift_id]
 
-    new_state.available_gifts.remove(gift_name)
-    new_state.loaded_gifts.append(gift_name)
+    new_state.available_gifts.remove(gift_id)
+    new_state.loaded_gifts.add(gift_id)
     new_state.sleigh_weight += gift.weight
 
     return new_state
@@ -87,19 +104,18 @@ def load_gifts(
 
 def deliver_gift(
     new_state: SleighState,
-    gift_index: int,
-    all_gifts_map: Mapping[str, Gift],
+    gift_id: int,
+    all_gifts_map: GiftCatalog,
     range_d: int,
 ) -> SleighState:
-    assert gift_index < len(new_state.loaded_gifts) and gift_index >= 0
+    assert gift_id in new_state.loaded_gifts
 
-    gift_name = new_state.loaded_gifts[gift_index]
-    gift = all_gifts_map[gift_name]
+    gift = all_gifts_map[gift_id]
 
     assert distance(new_state.position, gift.destination) <= range_d
 
-    new_state.loaded_gifts.remove(gift_name)
-    new_state.delivered_gifts.append(gift_name)
+    new_state.loaded_gifts.remove(gift_id)
+    new_state.delivered_gifts.add(gift_id)
     new_state.sleigh_weight -= gift.weight
 
     return new_state
@@ -118,24 +134,13 @@ def load_carrots(
 
 
 def solve_knapsack_greedy(available_gifts_ids, gifts_map, max_weight, current_weight):
-    remaining_capacity = max_weight - current_weight
-    if remaining_capacity <= 0:
+    """
+    Najlepszy zestaw prezentów do limitu wagi max_weight. Nazwa historyczna -
+    teraz to plecak z core.trip_loader z jedną klasą przyspieszenia.
+    """
+    if max_weight - current_weight <= 0:
         return []
 
-    candidates = []
-    for g_id in available_gifts_ids:
-        gift = gifts_map[g_id]
-        if gift.weight <= remaining_capacity:
-            weight = max(0.1, gift.weight)
-            ratio = gift.score / weight
-            candidates.append((g_id, gift, ratio))
-
-    candidates.sort(key=lambda x: (x[2], -x[1].weight), reverse=True)
-
-    to_load = []
-    for g_id, gift, ratio in candidates:
-        if gift.weight <= remaining_capacity:
-            to_load.append(g_id)
-            remaining_capacity -= gift.weight
-
-    return to_load
+    loader = TripLoader([(max_weight, 1)], gifts_map.weights, gifts_map.scores)
+    ids = np.fromiter(available_gifts_ids, dtype=np.int64)
+    return loader.select(ids, current_weight).tolist()
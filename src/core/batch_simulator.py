@@ -0,0 +1,201 @@
+import numpy as np
+
+from core.acceleration_table import AccelerationTable
+from core.trip_loader import TripLoader
+from models.coordinate import Coordinate
+from models.gift_catalog import GiftCatalog
+from models.gift_set import GiftSet
+from models.sleigh_state import SleighState
+from models.velocity import Velocity
+
+
+class BatchSimulator:
+    """
+    Wektorowa wersja Simulatora - N sań krokowanych jednocześnie.
+    Stan każdych sań to jeden wiersz w tablicach NumPy, a step/handle_action
+    przyjmują tablice (N,) lub skalary rozgłaszane na wszystkie sanie.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        t_limit: int,
+        range_d: int,
+        accel_table: AccelerationTable,
+        all_gifts_map: GiftCatalog,
+        lapland_pos: Coordinate = Coordinate(0, 0),
+        knapsack_load: bool = False,
+    ):
+        """knapsack_load: załadunek plecakiem z TripLoader, jak w Simulatorze."""
+        self.n = n
+        self.t_limit = t_limit
+        self.range_d = range_d
+        self.accel_table = accel_table
+        self.all_gifts_map = all_gifts_map
+        self.lapland_pos = lapland_pos
+
+        self.MAX_FUEL = 100
+        self.START_WEIGHT = 10.0
+        self.knapsack_load = knapsack_load
+        self.trip_loader = (
+            TripLoader.from_table(accel_table, all_gifts_map) if knapsack_load else None
+        )
+        self.gift_scores = all_gifts_map.scores
+
+        self.gift_weights = all_gifts_map.weights.astype(np.float64)
+        self.gift_dest_c = all_gifts_map.dest_c.astype(np.float64)
+        self.gift_dest_r = all_gifts_map.dest_r.astype(np.float64)
+        n_gifts = len(all_gifts_map)
+
+        self.pos_c = np.zeros(n, dtype=np.float64)
+        self.pos_r = np.zeros(n, dtype=np.float64)
+        self.vel_c = np.zeros(n, dtype=np.float64)
+        self.vel_r = np.zeros(n, dtype=np.float64)
+        self.weight = np.zeros(n, dtype=np.float64)
+        self.carrots = np.zeros(n, dtype=np.int64)
+        self.time = np.zeros(n, dtype=np.int64)
+        self.last_accel = np.zeros(n, dtype=bool)
+
+        self.available = np.zeros((n, n_gifts), dtype=bool)
+        self.loaded = np.zeros((n, n_gifts), dtype=bool)
+        self.delivered = np.zeros((n, n_gifts), dtype=bool)
+
+    @classmethod
+    def from_simulator(cls, simulator, n: int) -> "BatchSimulator":
+        return cls(
+            n=n,
+            t_limit=simulator.t_limit,
+            range_d=simulator.range_d,
+            accel_table=simulator.accel_table,
+            all_gifts_map=simulator.all_gifts_map,
+            lapland_pos=simulator.lapland_pos,
+            knapsack_load=simulator.knapsack_load,
+        )
+
+    def reset(self, mask=None):
+        """Resetuje wszystkie sanie albo tylko te wskazane maską (N,)."""
+        rows = slice(None) if mask is None else np.asarray(mask, dtype=bool)
+
+        self.pos_c[rows] = self.lapland_pos.c
+        self.pos_r[rows] = self.lapland_pos.r
+        self.vel_c[rows] = 0
+        self.vel_r[rows] = 0
+        self.weight[rows] = self.START_WEIGHT
+        self.carrots[rows] = self.MAX_FUEL
+        self.time[rows] = 0
+        self.last_accel[rows] = False
+
+        self.available[rows] = True
+        self.loaded[rows] = False
+        self.delivered[rows] = False
+
+    def step(self, mask=None, k=1):
+        """
+        Fizyka ruchu i upływ czasu dla wszystkich (lub wybranych) sań.
+        k: liczba kroków - skalar albo tablica (N,) z osobnym k dla każdych sań.
+        """
+        k = np.asarray(k)
+        if mask is None:
+            self.pos_c += self.vel_c * k
+            self.pos_r += self.vel_r * k
+            self.time += k
+            self.last_accel[:] = False
+            return
+
+        mask = np.asarray(mask, dtype=bool)
+        if k.ndim:
+            k = k[mask]
+        self.pos_c[mask] += self.vel_c[mask] * k
+        self.pos_r[mask] += self.vel_r[mask] * k
+        self.time[mask] += k
+        self.last_accel[mask] = False
+
+    def handle_action(self, ax, ay, load_cmd, fuel_cmd):
+        ax = np.broadcast_to(np.asarray(ax, dtype=np.float64), (self.n,))
+        ay = np.broadcast_to(np.asarray(ay, dtype=np.float64), (self.n,))
+        load_cmd = np.broadcast_to(np.asarray(load_cmd), (self.n,))
+        fuel_cmd = np.broadcast_to(np.asarray(fuel_cmd), (self.n,))
+
+        accelerating = (ax != 0) | (ay != 0)
+        self.vel_c += ax
+        self.vel_r += ay
+        self.last_accel |= accelerating
+        self.carrots -= accelerating
+
+        refuel = fuel_cmd > 0
+        self.carrots[refuel] = self.MAX_FUEL
+        self.last_accel[refuel] = False
+
+        loading = load_cmd == 1
+        delivering = load_cmd == -1
+        self.last_accel[loading | delivering] = False
+
+        if loading.any():
+            self._load(np.flatnonzero(loading))
+        if delivering.any():
+            self._deliver(np.flatnonzero(delivering))
+
+    def max_acceleration(self, weights: np.ndarray) -> np.ndarray:
+        return self.accel_table.get_max_acceleration_for_weights(weights)
+
+    def _load(self, rows: np.ndarray):
+        if self.knapsack_load:
+            self._load_knapsack(rows)
+            return
+
+        available = self.available[rows]
+        curr_weight = self.weight[rows].copy()
+        taken = np.zeros_like(available)
+
+        # Załadunek jest zachłanny w kolejności prezentów, więc pętla idzie po
+        # prezentach, a wektoryzacja po saniach.
+        for g in np.flatnonzero(available.any(axis=0)):
+            new_weight = curr_weight + self.gift_weights[g]
+            fits = available[:, g] & (self.max_acceleration(new_weight) > 0)
+            taken[:, g] = fits
+            curr_weight[fits] = new_weight[fits]
+
+        self.available[rows] = available & ~taken
+        self.loaded[rows] |= taken
+        self.weight[rows] = curr_weight
+
+    def _load_knapsack(self, rows: np.ndarray):
+        # Plecak jest liczony osobno dla każdych sań - tak jak w Simulatorze;
+        # sanie w tym samym stanie trafiają w cache TripLoader.select
+        for row in rows.tolist():
+            loaded_score = self.gift_scores[self.loaded[row]].sum()
+            to_load = self.trip_loader.select(
+                np.flatnonzero(self.available[row]), self.weight[row], loaded_score
+            )
+            self.available[row, to_load] = False
+            self.loaded[row, to_load] = True
+            self.weight[row] += self.gift_weights[to_load].sum()
+
+    def first_loaded(self, rows=slice(None)) -> np.ndarray:
+        """Najmniejsze załadowane id (jak GiftSet.first()) albo -1."""
+        loaded = self.loaded[rows]
+        return np.where(loaded.any(axis=1), loaded.argmax(axis=1), -1)
+
+    def _deliver(self, rows: np.ndarray):
+        first = self.first_loaded(rows)
+        rows, first = rows[first >= 0], first[first >= 0]
+        if rows.size == 0:
+            return
+
+        self.loaded[rows, first] = False
+        self.delivered[rows, first] = True
+        self.weight[rows] -= self.gift_weights[first]
+
+    def get_state(self, i: int) -> SleighState:
+        """Materializuje stan i-tych sań jako SleighState (np. dla solverów)."""
+        return SleighState(
+            current_time=int(self.time[i]),
+            position=Coordinate(self.pos_c[i].item(), self.pos_r[i].item()),
+            velocity=Velocity(self.vel_c[i].item(), self.vel_r[i].item()),
+            sleigh_weight=self.weight[i].item(),
+            carrot_count=int(self.carrots[i]),
+            loaded_gifts=GiftSet.from_mask(self.loaded[i]),
+            available_gifts=GiftSet.from_mask(self.available[i]),
+            delivered_gifts=GiftSet.from_mask(self.delivered[i]),
+            last_action_was_acceleration=bool(self.last_accel[i]),
+        )
@@ -1,20 +1,93 @@
+import os
+from typing import Optional
+
 from core.acceleration_table import AccelerationTable
+from core.problem_cache import (
+    file_digest,
+    load_cached_problem,
+    load_cached_travel_times,
+    save_problem,
+    save_travel_times,
+)
 from core.simulator import Simulator
+from core.spatial_index import GiftSpatialIndex
+from core.travel_time import DEFAULT_NEIGHBOURS, DENSE_LIMIT, TravelTimeMatrix
 from models.problem import Problem
 
 
-def load_problem(path: str):
-    problem = Problem(path)
+def instance_name(path: str) -> str:
+    """data/b_better_hurry.in.txt -> b_better_hurry"""
+    name = os.path.basename(path)
+    for suffix in (".txt", ".in"):
+        name = name.removesuffix(suffix)
+    return name
 
-    accel_table = AccelerationTable(problem.acceleration_ranges)
 
-    all_gifts_map = {gift.name: gift for gift in problem.gifts}
+def load_problem(path: str, use_cache: bool = False, cache_dir: Optional[str] = None):
+    """
+    Wczytuje problem. Z use_cache sparsowany problem jest zapisywany
+    (.cache.npz) obok pliku wejściowego albo w cache_dir i odczytywany,
+    dopóki plik się nie zmieni. Domyślnie bez cache - wywołanie z biblioteki
+    nie zapisuje plików obok danych.
+    """
+    problem = None
+    if use_cache:
+        digest = file_digest(path)
+        problem = load_cached_problem(path, digest, cache_dir)
+
+    if problem is None:
+        problem = Problem(path)
+        catalog = problem.catalog
+        problem.spatial_index = GiftSpatialIndex(catalog.dest_c, catalog.dest_r)
+
+        if use_cache:
+            try:
+                save_problem(path, problem, digest, cache_dir)
+            except OSError:
+                # Katalog tylko do odczytu - po prostu bez cache
+                pass
+
+    return problem, make_simulator(problem)
+
 
-    simulator = Simulator(
+def make_simulator(problem) -> Simulator:
+    accel_table = AccelerationTable(problem.acceleration_ranges)
+    return Simulator(
         t_limit=problem.T,
         range_d=problem.D,
         accel_table=accel_table,
-        all_gifts_map=all_gifts_map,
+        all_gifts_map=problem.catalog,
     )
 
-    return problem, simulator
+
+def load_travel_times(
+    path: str,
+    problem,
+    k=None,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+):
+    """
+    Macierz czasów przelotu dla problemu wczytanego z path (TravelTimeMatrix.build).
+    Z use_cache zapisywana (.travel.npz) obok pliku wejściowego albo w cache_dir.
+    """
+    expected_k = k
+    if k is None and problem.G + 1 > DENSE_LIMIT:
+        expected_k = DEFAULT_NEIGHBOURS
+
+    digest = file_digest(path) if use_cache else None
+    if use_cache:
+        matrix = load_cached_travel_times(path, digest, cache_dir)
+        # Cache policzony dla innego k jest traktowany jak nieaktualny
+        if matrix is not None and matrix.k == expected_k:
+            return matrix
+
+    matrix = TravelTimeMatrix.build(
+        problem.catalog, problem.acceleration_ranges, problem.D, k=k
+    )
+    if use_cache:
+        try:
+            save_travel_times(path, matrix, digest, cache_dir)
+        except OSError:
+            pass
+    return matrix
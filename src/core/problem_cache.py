@@ -0,0 +1,172 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+from typing import Optional
+
+import numpy as np
+
+from core.spatial_index import GiftSpatialIndex
+from core.travel_time import TravelTimeMatrix
+from models.acceleration_range import AccelerationRange
+from models.gift_catalog import GiftCatalog
+from models.problem import Problem
+
+# Podbijać przy każdej zmianie zawartości pliku cache
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".cache.npz"
+TRAVEL_SUFFIX = ".travel.npz"
+
+
+def _cache_file(path: str, suffix: str, cache_dir: Optional[str]) -> str:
+    """Plik cache obok pliku wejściowego albo w cache_dir."""
+    if cache_dir is None:
+        return path + suffix
+    return os.path.join(cache_dir, os.path.basename(path) + suffix)
+
+
+def cache_path_for(path: str, cache_dir: Optional[str] = None) -> str:
+    return _cache_file(path, CACHE_SUFFIX, cache_dir)
+
+
+def travel_cache_path_for(path: str, cache_dir: Optional[str] = None) -> str:
+    return _cache_file(path, TRAVEL_SUFFIX, cache_dir)
+
+
+def file_digest(path: str, chunk_size: int = 1 << 22) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as file:
+        while block := file.read(chunk_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def problem_arrays(problem: Problem) -> dict:
+    """
+    Problem jako słownik tablic: kolumny prezentów, tablica przyspieszeń i
+    indeks przestrzenny (klucze index_*). Odwrotność problem_from_arrays.
+    """
+    catalog = problem.catalog
+    ranges = problem.acceleration_ranges
+    arrays = dict(
+        config=np.array([problem.T, problem.D, problem.W, problem.G], np.int64),
+        accel_limits=np.array([r.max_weight_inclusive for r in ranges], np.int64),
+        accel_values=np.array([r.max_accel for r in ranges], np.int64),
+        names=catalog.names,
+        scores=catalog.scores,
+        weights=catalog.weights,
+        dest_c=catalog.dest_c,
+        dest_r=catalog.dest_r,
+    )
+    for key, value in problem.spatial_index.arrays().items():
+        arrays["index_" + key] = value
+    return arrays
+
+
+def problem_from_arrays(arrays) -> Problem:
+    """Problem z tablic problem_arrays - kolumny nie są kopiowane."""
+    T, D, W, G = arrays["config"].tolist()
+
+    acceleration_ranges = []
+    last_max_weight = 0.0
+    for limit, accel in zip(
+        arrays["accel_limits"].tolist(), arrays["accel_values"].tolist()
+    ):
+        acceleration_ranges.append(
+            AccelerationRange(
+                min_weight_exclusive=last_max_weight,
+                max_weight_inclusive=limit,
+                max_accel=accel,
+            )
+        )
+        last_max_weight = limit
+
+    catalog = GiftCatalog.from_columns(
+        names=arrays["names"],
+        scores=arrays["scores"],
+        weights=arrays["weights"],
+        dest_c=arrays["dest_c"],
+        dest_r=arrays["dest_r"],
+    )
+    spatial_index = GiftSpatialIndex.from_arrays(
+        **{
+            key[len("index_") :]: arrays[key]
+            for key in arrays.keys()
+            if key.startswith("index_")
+        }
+    )
+
+    problem = Problem.from_parts(T, D, W, G, acceleration_ranges, catalog)
+    problem.spatial_index = spatial_index
+    return problem
+
+
+def save_problem(
+    path: str, problem: Problem, digest: str, cache_dir: Optional[str] = None
+):
+    """
+    Zapisuje sparsowany problem (kolumny prezentów, tablicę przyspieszeń i
+    indeks przestrzenny) obok pliku wejściowego albo w cache_dir. Zapis jest
+    atomowy.
+    """
+    arrays = dict(version=np.int64(CACHE_VERSION), digest=np.array(digest))
+    arrays.update(problem_arrays(problem))
+    _atomic_savez(cache_path_for(path, cache_dir), arrays)
+
+
+def _atomic_savez(target: str, arrays: dict):
+    os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(target)), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            np.savez(file, **arrays)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_cached_problem(
+    path: str, digest: str, cache_dir: Optional[str] = None
+) -> Optional[Problem]:
+    """Problem z cache albo None, jeśli cache nie istnieje lub jest nieaktualny."""
+    try:
+        data = np.load(cache_path_for(path, cache_dir))
+    except (OSError, ValueError, zipfile.BadZipFile):
+        return None
+
+    with data:
+        if "version" not in data or int(data["version"]) != CACHE_VERSION:
+            return None
+        if str(data["digest"]) != digest:
+            return None
+        return problem_from_arrays({key: data[key] for key in data.files})
+
+
+def save_travel_times(
+    path: str, matrix: TravelTimeMatrix, digest: str, cache_dir: Optional[str] = None
+):
+    """Zapisuje macierz czasów przelotu obok pliku wejściowego albo w cache_dir."""
+    arrays = dict(version=np.int64(CACHE_VERSION), digest=np.array(digest))
+    arrays.update(matrix.arrays())
+    _atomic_savez(travel_cache_path_for(path, cache_dir), arrays)
+
+
+def load_cached_travel_times(
+    path: str, digest: str, cache_dir: Optional[str] = None
+) -> Optional[TravelTimeMatrix]:
+    try:
+        data = np.load(travel_cache_path_for(path, cache_dir))
+    except (OSError, ValueError, zipfile.BadZipFile):
+        return None
+
+    with data:
+        if "version" not in data or int(data["version"]) != CACHE_VERSION:
+            return None
+        if str(data["digest"]) != digest:
+            return None
+        return TravelTimeMatrix.from_arrays(
+            **{key: data[key] for key in data.files if key not in ("version", "digest")}
+        )
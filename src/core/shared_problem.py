@@ -0,0 +1,112 @@
+import sys
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional
+
+import numpy as np
+
+from core.loader import make_simulator
+from core.problem_cache import problem_arrays, problem_from_arrays
+from core.travel_time import TravelTimeMatrix
+
+# Początki tablic w bloku wyrównane do linii pamięci podręcznej
+ALIGNMENT = 64
+TRAVEL_PREFIX = "travel_"
+
+
+@dataclass(frozen=True)
+class SharedProblemHandle:
+    """
+    Opis opublikowanego problemu - mały i tani do przesłania do procesu
+    roboczego (np. przez initargs puli). layout: (klucz, dtype, kształt,
+    przesunięcie) każdej tablicy w bloku pamięci name.
+    """
+
+    name: str
+    layout: tuple
+
+
+class SharedProblem:
+    """
+    Jednorazowa publikacja sparsowanego problemu (kolumny prezentów, tablica
+    przyspieszeń, indeks przestrzenny i opcjonalnie macierz czasów
+    przelotu) w jednym bloku multiprocessing.shared_memory. Procesy robocze
+    dołączają przez attach_problem(handle) bez kopiowania i parsowania.
+    Właściciel zwalnia blok przez close() albo wyjście z bloku with.
+    """
+
+    def __init__(self, problem, travel_times: Optional[TravelTimeMatrix] = None):
+        arrays = problem_arrays(problem)
+        if travel_times is not None:
+            for key, value in travel_times.arrays().items():
+                arrays[TRAVEL_PREFIX + key] = value
+
+        layout = []
+        size = 0
+        for key, value in arrays.items():
+            value = np.asarray(value, order="C")
+            arrays[key] = value
+            offset = -(-size // ALIGNMENT) * ALIGNMENT
+            layout.append((key, value.dtype.str, value.shape, offset))
+            size = offset + value.nbytes
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for key, dtype, shape, offset in layout:
+            view = np.ndarray(shape, dtype, buffer=self.shm.buf, offset=offset)
+            view[...] = arrays[key]
+        self.handle = SharedProblemHandle(self.shm.name, tuple(layout))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Zwalnia blok - dołączone procesy muszą już z niego nie korzystać."""
+        if self.shm is None:
+            return
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+
+
+def _attach_memory(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Przed 3.13 dołączenie zawsze rejestruje blok w resource_tracker, który
+    # usunąłby blok właściciela przy wyjściu procesu roboczego albo zgubił
+    # rejestrację właściciela - blok śledzi tylko ten, kto go utworzył
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def attach_problem(handle: SharedProblemHandle):
+    """
+    (problem, simulator) jak z load_problem, ale kolumny, tablica
+    przyspieszeń i indeksy są widokami na pamięć współdzieloną (tylko do
+    odczytu). Stan zmieniany w procesie (alive indeksu przestrzennego,
+    symulator) jest prywatny. Opublikowana macierz czasów przelotu trafia do
+    problem.travel_times (inaczej None).
+    """
+    shm = _attach_memory(handle.name)
+    arrays = {}
+    for key, dtype, shape, offset in handle.layout:
+        view = np.ndarray(shape, dtype, buffer=shm.buf, offset=offset)
+        view.flags.writeable = False
+        arrays[key] = view
+
+    problem = problem_from_arrays(arrays)
+    travel = {
+        key[len(TRAVEL_PREFIX) :]: value
+        for key, value in arrays.items()
+        if key.startswith(TRAVEL_PREFIX)
+    }
+    problem.travel_times = TravelTimeMatrix.from_arrays(**travel) if travel else None
+    # Widoki trzymają bufor bloku - referencja wiąże jego czas życia z problemem
+    problem.shared_memory = shm
+    return problem, make_simulator(problem)
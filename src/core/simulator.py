@@ -1,8 +1,8 @@
-from typing import Mapping
-
 from core.acceleration_table import AccelerationTable
+from core.trip_loader import TripLoader
 from models.coordinate import Coordinate
-from models.gift import Gift
+from models.gift_catalog import GiftCatalog
+from models.gift_set import GiftSet
 from models.sleigh_state import SleighState
 from models.velocity import Velocity
 
@@ -13,14 +13,24 @@ class Simulator:
         t_limit: int,
         range_d: int,
         accel_table: AccelerationTable,
-        all_gifts_map: Mapping[str, Gift],
+        all_gifts_map: GiftCatalog,
         lapland_pos: Coordinate = Coordinate(0, 0),
+        knapsack_load: bool = False,
     ):
+        """
+        knapsack_load: load_cmd=1 ładuje zestaw wybrany plecakiem z TripLoader
+        zamiast po kolei wszystkich prezentów, przy których sanie mogą
+        jeszcze przyspieszać.
+        """
         self.t_limit = t_limit
         self.range_d = range_d
         self.accel_table = accel_table
         self.all_gifts_map = all_gifts_map
         self.lapland_pos = lapland_pos
+        self.knapsack_load = knapsack_load
+        self.trip_loader = (
+            TripLoader.from_table(accel_table, all_gifts_map) if knapsack_load else None
+        )
 
         self.MAX_FUEL = 100
 
@@ -35,18 +45,18 @@ class Simulator:
             velocity=Velocity(0, 0),
             carrot_count=self.MAX_FUEL,
             sleigh_weight=10.0,
-            available_gifts=list(self.all_gifts_map.keys()),
-            loaded_gifts=[],
-            delivered_gifts=[],
+            available_gifts=GiftSet.full(len(self.all_gifts_map)),
+            loaded_gifts=GiftSet(len(self.all_gifts_map)),
+            delivered_gifts=GiftSet(len(self.all_gifts_map)),
             last_action_was_acceleration=False,
         )
         return self.state
 
-    def step(self):
-        """Fizyka ruchu i upływ czasu."""
-        self.state.position.c += self.state.velocity.vc
-        self.state.position.r += self.state.velocity.vr
-        self.state.current_time += 1
+    def step(self, k: int = 1):
+        """Fizyka ruchu i upływ czasu - k kroków bez przyspieszania naraz."""
+        self.state.position.c += self.state.velocity.vc * k
+        self.state.position.r += self.state.velocity.vr * k
+        self.state.current_time += k
         self.state.last_action_was_acceleration = False
 
     def handle_action(self, ax: float, ay: float, load_cmd: int, fuel_cmd: int):
@@ -62,28 +72,37 @@ class Simulator:
             self.state.carrot_count = self.MAX_FUEL
             self.state.last_action_was_acceleration = False
 
-        if load_cmd == 1:
+        if load_cmd == 1 and not self.knapsack_load:
             self.state.last_action_was_acceleration = False
-            gifts_to_load = []
-            curr_weight = self.state.sleigh_weight
-
-            for gift_id in list(self.state.available_gifts):
+            for gift_id in self.state.available_gifts:
                 gift = self.all_gifts_map[gift_id]
-                new_weight = curr_weight + gift.weight
+                new_weight = self.state.sleigh_weight + gift.weight
                 if self.accel_table.get_max_acceleration_for_weight(new_weight) > 0:
-                    gifts_to_load.append(gift_id)
-                    curr_weight += gift.weight
+                    self.state.available_gifts.remove(gift_id)
+                    self.state.loaded_gifts.add(gift_id)
+                    self.state.sleigh_weight = new_weight
 
-            for g in gifts_to_load:
-                self.state.available_gifts.remove(g)
-                self.state.loaded_gifts.append(g)
-                self.state.sleigh_weight += gift.weight
+        elif load_cmd == 1:
+            self.state.last_action_was_acceleration = False
+            # Zestaw na kurs wybiera plecak z TripLoader
+            loaded_score = self.all_gifts_map.scores[
+                self.state.loaded_gifts.ids()
+            ].sum()
+            to_load = self.trip_loader.select(
+                self.state.available_gifts.ids(),
+                self.state.sleigh_weight,
+                loaded_score,
+            )
+            for gift_id in to_load.tolist():
+                self.state.available_gifts.remove(gift_id)
+                self.state.loaded_gifts.add(gift_id)
+            self.state.sleigh_weight += int(self.all_gifts_map.weights[to_load].sum())
 
         elif load_cmd == -1:
             self.state.last_action_was_acceleration = False
-            if self.state.loaded_gifts:
-                gift_id = self.state.loaded_gifts[0]
+            gift_id = self.state.loaded_gifts.first()
+            if gift_id is not None:
                 gift = self.all_gifts_map[gift_id]
-                self.state.loaded_gifts.pop(0)
-                self.state.delivered_gifts.append(gift_id)
+                self.state.loaded_gifts.remove(gift_id)
+                self.state.delivered_gifts.add(gift_id)
                 self.state.sleigh_weight -= gift.weight
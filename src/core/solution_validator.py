@@ -0,0 +1,191 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from core.acceleration_table import AccelerationTable
+from core.actions import (
+    COMMAND_NAMES,
+    Action,
+    Direction,
+    accelerate,
+    deliver_gift,
+    floating,
+    load_carrots,
+    load_gifts,
+)
+from models.coordinate import Coordinate
+from models.gift_set import GiftSet
+from models.sleigh_state import SleighState
+from models.velocity import Velocity
+
+COMMANDS = {name: action for action, name in COMMAND_NAMES.items()}
+
+DIRECTIONS = {
+    Action.AccUp: Direction.UP,
+    Action.AccDown: Direction.DOWN,
+    Action.AccLeft: Direction.LEFT,
+    Action.AccRight: Direction.RIGHT,
+}
+
+
+class SolutionError(ValueError):
+    """Naruszenie zasad przez komendę rozwiązania."""
+
+
+@dataclass
+class ValidationResult:
+    score: int
+    commands: int
+    violation: Optional[str] = None
+    line: Optional[int] = None
+
+    @property
+    def valid(self) -> bool:
+        return self.violation is None
+
+
+class SolutionValidator:
+    """
+    Odtwarza rozwiązanie na przejściach z core.actions, sprawdzając przed
+    każdą komendą zasady zadania. Float k to jeden krok O(1).
+    """
+
+    def __init__(self, problem, accel_table: AccelerationTable = None):
+        self.problem = problem
+        self.catalog = problem.catalog
+        self.accel_table = accel_table or AccelerationTable(problem.acceleration_ranges)
+        self.lapland_pos = Coordinate(0, 0)
+        self.reset()
+
+    def reset(self):
+        size = len(self.catalog)
+        self.state = SleighState(
+            current_time=0,
+            position=Coordinate(0, 0),
+            velocity=Velocity(0, 0),
+            sleigh_weight=0,
+            carrot_count=0,
+            loaded_gifts=GiftSet(size),
+            available_gifts=GiftSet.full(size),
+            delivered_gifts=GiftSet(size),
+            last_action_was_acceleration=False,
+        )
+        self.score = 0
+
+    def _in_range(self, c: int, r: int) -> bool:
+        dc = self.state.position.c - c
+        dr = self.state.position.r - r
+        return dc * dc + dr * dr <= self.problem.D * self.problem.D
+
+    def apply(self, action: Action, value):
+        """
+        Wykonuje jedną komendę. value: liczba albo id prezentu dla
+        LoadGifts/DeliverGift. Przy naruszeniu zasad rzuca SolutionError.
+        """
+        state = self.state
+
+        if action == Action.Floating:
+            if value < 1:
+                raise SolutionError(f"Float {value}: k must be positive")
+            if state.current_time + value > self.problem.T:
+                raise SolutionError(f"Float {value}: exceeds time limit T")
+            floating(state, value)
+
+        elif action in DIRECTIONS:
+            if state.last_action_was_acceleration:
+                raise SolutionError("two accelerations without a Float between")
+            if state.carrot_count < 1:
+                raise SolutionError("acceleration without carrots")
+            max_a = self.accel_table.get_max_acceleration_for_weight(
+                state.sleigh_weight
+            )
+            if not 0 <= value <= max_a:
+                raise SolutionError(
+                    f"acceleration {value} outside 0..{max_a} "
+                    f"for weight {state.sleigh_weight}"
+                )
+            accelerate(state, self.accel_table, value, DIRECTIONS[action])
+
+        elif action == Action.LoadCarrots:
+            if value < 1:
+                raise SolutionError(f"LoadCarrots {value}: amount must be positive")
+            if not self._in_range(self.lapland_pos.c, self.lapland_pos.r):
+                raise SolutionError("LoadCarrots outside range of Lapland")
+            load_carrots(state, value, self.lapland_pos, self.problem.D)
+
+        elif action == Action.LoadGifts:
+            if value not in state.available_gifts:
+                raise SolutionError(f"LoadGift {self._name(value)}: not available")
+            if not self._in_range(self.lapland_pos.c, self.lapland_pos.r):
+                raise SolutionError("LoadGift outside range of Lapland")
+            load_gifts(state, value, self.catalog, self.lapland_pos, self.problem.D)
+
+        elif action == Action.DeliverGift:
+            if value not in state.loaded_gifts:
+                raise SolutionError(f"DeliverGift {self._name(value)}: not loaded")
+            if not self._in_range(
+                self.catalog.dest_c[value], self.catalog.dest_r[value]
+            ):
+                raise SolutionError(
+                    f"DeliverGift {self._name(value)}: destination out of range"
+                )
+            deliver_gift(state, value, self.catalog, self.problem.D)
+            self.score += int(self.catalog.scores[value])
+
+        else:
+            raise SolutionError(f"unknown action {action}")
+
+    def _name(self, gift_id: int) -> str:
+        return self.catalog.name_of(gift_id)
+
+    def _parse_value(self, action: Action, token: str):
+        if action == Action.LoadGifts or action == Action.DeliverGift:
+            try:
+                return self.catalog.id_of(token)
+            except KeyError:
+                raise SolutionError(f"unknown gift {token}") from None
+        try:
+            return int(token)
+        except ValueError:
+            raise SolutionError(f"invalid number {token}") from None
+
+    def validate_lines(self, lines) -> ValidationResult:
+        """
+        Sprawdza rozwiązanie podane jako linie pliku (pierwsza to liczba
+        komend). Zatrzymuje się na pierwszym naruszeniu.
+        """
+        self.reset()
+        lines = iter(lines)
+        commands = 0
+        line_no = 1
+
+        try:
+            header = next(lines, "").strip()
+            try:
+                declared = int(header)
+            except ValueError:
+                raise SolutionError(f"invalid command count {header!r}") from None
+
+            for line_no, line in enumerate(lines, start=2):
+                parts = line.split()
+                if not parts:
+                    continue
+                if len(parts) != 2 or parts[0] not in COMMANDS:
+                    raise SolutionError(f"malformed command {line.strip()!r}")
+
+                action = COMMANDS[parts[0]]
+                self.apply(action, self._parse_value(action, parts[1]))
+                commands += 1
+
+            if commands != declared:
+                line_no = 1
+                raise SolutionError(f"declared {declared} commands, found {commands}")
+        except SolutionError as e:
+            return ValidationResult(
+                score=self.score, commands=commands, violation=str(e), line=line_no
+            )
+
+        return ValidationResult(score=self.score, commands=commands)
+
+    def validate_file(self, path: str) -> ValidationResult:
+        with open(path) as file:
+            return self.validate_lines(file)
@@ -0,0 +1,201 @@
+import heapq
+import math
+from typing import Iterator, Optional
+
+import numpy as np
+
+
+class GiftSpatialIndex:
+    """
+    Siatka jednorodna nad celami prezentów.
+    Punkty są posortowane po kluczu komórki (układ CSR), więc zapytanie o
+    wiersz komórek to jedno searchsorted. Usuwanie tylko gasi bit w masce.
+    """
+
+    def __init__(
+        self,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        ids: Optional[np.ndarray] = None,
+        cell_size: Optional[float] = None,
+    ):
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        ids = np.arange(len(xs)) if ids is None else np.asarray(ids, dtype=np.int64)
+
+        self.x0 = float(xs.min()) if len(xs) else 0.0
+        self.y0 = float(ys.min()) if len(ys) else 0.0
+        width = float(xs.max()) - self.x0 if len(xs) else 0.0
+        height = float(ys.max()) - self.y0 if len(ys) else 0.0
+
+        if cell_size is None:
+            # ~2 punkty na komórkę przy równomiernym rozkładzie
+            cell_size = math.sqrt(max(width * height, 1.0) * 2.0 / max(len(xs), 1))
+        self.cell_size = max(float(cell_size), 1.0)
+
+        self.n_cols = int(width // self.cell_size) + 1
+        self.n_rows = int(height // self.cell_size) + 1
+
+        cx = ((xs - self.x0) // self.cell_size).astype(np.int64)
+        cy = ((ys - self.y0) // self.cell_size).astype(np.int64)
+        keys = cy * self.n_cols + cx
+
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.ids = ids[order]
+        self.xs = xs[order]
+        self.ys = ys[order]
+
+        size = int(ids.max()) + 1 if len(ids) else 0
+        self.alive = np.zeros(size, dtype=bool)
+        self.alive[ids] = True
+        self.count = len(ids)
+
+    # Atrybuty potrzebne do odtworzenia indeksu bez ponownego sortowania
+    _ARRAY_FIELDS = ("keys", "ids", "xs", "ys")
+    _SCALAR_FIELDS = ("x0", "y0", "cell_size", "n_cols", "n_rows")
+
+    def arrays(self) -> dict:
+        """Siatka jako słownik tablic (np. do np.savez). Pomija usunięcia."""
+        result = {name: getattr(self, name) for name in self._ARRAY_FIELDS}
+        for name in self._SCALAR_FIELDS:
+            result[name] = np.array(getattr(self, name))
+        return result
+
+    @classmethod
+    def from_arrays(cls, **arrays) -> "GiftSpatialIndex":
+        index = cls.__new__(cls)
+        for name in cls._ARRAY_FIELDS:
+            setattr(index, name, np.asarray(arrays[name]))
+        for name in cls._SCALAR_FIELDS:
+            setattr(index, name, np.asarray(arrays[name]).item())
+
+        size = int(index.ids.max()) + 1 if len(index.ids) else 0
+        index.alive = np.zeros(size, dtype=bool)
+        index.alive[index.ids] = True
+        index.count = len(index.ids)
+        return index
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, gift_id: int) -> bool:
+        return 0 <= gift_id < len(self.alive) and bool(self.alive[gift_id])
+
+    def remove(self, gift_id: int):
+        if self.alive[gift_id]:
+            self.alive[gift_id] = False
+            self.count -= 1
+
+    def copy(self) -> "GiftSpatialIndex":
+        """Kopia z własną maską usunięć - tablice siatki są współdzielone."""
+        clone = GiftSpatialIndex.__new__(GiftSpatialIndex)
+        clone.__dict__.update(self.__dict__)
+        clone.alive = self.alive.copy()
+        return clone
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return (
+            int((x - self.x0) // self.cell_size),
+            int((y - self.y0) // self.cell_size),
+        )
+
+    def _row_slice(self, cy: int, cx_from: int, cx_to: int) -> slice:
+        if cy < 0 or cy >= self.n_rows:
+            return slice(0, 0)
+        cx_from = max(cx_from, 0)
+        cx_to = min(cx_to, self.n_cols - 1)
+        if cx_from > cx_to:
+            return slice(0, 0)
+        start, stop = np.searchsorted(
+            self.keys, [cy * self.n_cols + cx_from, cy * self.n_cols + cx_to + 1]
+        )
+        return slice(start, stop)
+
+    def square(self, cx: int, cy: int, ring: int) -> np.ndarray:
+        """Pozycje w tablicach siatki z kwadratu komórek wokół (cx, cy), z usuniętymi."""
+        parts = [
+            np.arange(rows.start, rows.stop)
+            for rows in (
+                self._row_slice(row, cx - ring, cx + ring)
+                for row in range(max(cy - ring, 0), min(cy + ring, self.n_rows - 1) + 1)
+            )
+        ]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(parts)
+
+    def within(self, x: float, y: float, radius: float) -> np.ndarray:
+        """Wszystkie nieusunięte id w odległości <= radius od punktu."""
+        cx0, cy0 = self._cell(x - radius, y - radius)
+        cx1, cy1 = self._cell(x + radius, y + radius)
+
+        found = []
+        for cy in range(max(cy0, 0), min(cy1, self.n_rows - 1) + 1):
+            rows = self._row_slice(cy, cx0, cx1)
+            ids = self.ids[rows]
+            dx = self.xs[rows] - x
+            dy = self.ys[rows] - y
+            hit = (dx * dx + dy * dy <= radius * radius) & self.alive[ids]
+            found.append(ids[hit])
+
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(found)
+
+    def _ring_slices(self, cx: int, cy: int, ring: int) -> Iterator[slice]:
+        if ring == 0:
+            yield self._row_slice(cy, cx, cx)
+            return
+        yield self._row_slice(cy - ring, cx - ring, cx + ring)
+        yield self._row_slice(cy + ring, cx - ring, cx + ring)
+        for row in range(
+            max(cy - ring + 1, 0), min(cy + ring - 1, self.n_rows - 1) + 1
+        ):
+            yield self._row_slice(row, cx - ring, cx - ring)
+            yield self._row_slice(row, cx + ring, cx + ring)
+
+    def iter_nearest(self, x: float, y: float) -> Iterator[int]:
+        """
+        Leniwie zwraca nieusunięte id w kolejności rosnącej odległości
+        (remisy - mniejsze id pierwsze). Przeszukuje pierścienie komórek.
+        """
+        cx, cy = self._cell(x, y)
+        max_ring = max(
+            abs(cx), abs(cy), abs(self.n_cols - 1 - cx), abs(self.n_rows - 1 - cy)
+        )
+        heap = []
+
+        for ring in range(max_ring + 1):
+            for rows in self._ring_slices(cx, cy, ring):
+                if rows.stop == rows.start:
+                    continue
+                ids = self.ids[rows]
+                alive = self.alive[ids]
+                dx = self.xs[rows][alive] - x
+                dy = self.ys[rows][alive] - y
+                for d, gift_id in zip(
+                    (dx * dx + dy * dy).tolist(), ids[alive].tolist()
+                ):
+                    heapq.heappush(heap, (d, gift_id))
+
+            # Wszystko, czego jeszcze nie widzieliśmy, jest dalej niż ring * cell_size
+            safe = (ring * self.cell_size) ** 2
+            while heap and heap[0][0] <= safe:
+                _, gift_id = heapq.heappop(heap)
+                if self.alive[gift_id]:
+                    yield gift_id
+
+        while heap:
+            _, gift_id = heapq.heappop(heap)
+            if self.alive[gift_id]:
+                yield gift_id
+
+    def nearest(self, x: float, y: float, k: int = 1) -> list[int]:
+        """k najbliższych nieusuniętych id."""
+        result = []
+        for gift_id in self.iter_nearest(x, y):
+            result.append(gift_id)
+            if len(result) == k:
+                break
+        return result
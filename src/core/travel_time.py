@@ -0,0 +1,258 @@
+import math
+from typing import Optional
+
+import numpy as np
+
+from core.spatial_index import GiftSpatialIndex
+
+# Do tylu punktów (baza + prezenty) macierz jest pełna, powyżej - k najbliższych
+DENSE_LIMIT = 1024
+DEFAULT_NEIGHBOURS = 16
+
+# Punkt 0 to baza w Laponii, prezent o id g to punkt g + 1
+BASE = 0
+
+
+def straight_travel_time(dist, max_acc: int) -> np.ndarray:
+    """
+    Najmniejsza liczba kroków (Float) na przelot o dist wzdłuż osi od postoju
+    do postoju, gdy co krok wolno zmienić prędkość o max_acc. Po 2n-1
+    krokach da się przebyć a*n^2, po 2n krokach a*n*(n+1).
+    """
+    dist = np.maximum(np.asarray(dist, dtype=np.int64), 0)
+    n = np.ceil(np.sqrt(dist / max_acc)).astype(np.int64)
+    # Poprawka na błąd zaokrąglenia sqrt: n to najmniejsze z a*n^2 >= dist
+    n += max_acc * n * n < dist
+    n -= (n > 0) & (max_acc * (n - 1) * (n - 1) >= dist)
+
+    even_enough = max_acc * (n - 1) * n >= dist
+    ticks = np.where(even_enough, 2 * (n - 1), 2 * n - 1)
+    return np.where(dist == 0, 0, ticks)
+
+
+def estimate_travel_time(dc, dr, max_acc: int, range_d: int) -> np.ndarray:
+    """
+    Oszacowanie czasu przelotu o (dc, dr) i zatrzymania w zasięgu range_d.
+    Osie dzielą sloty na przyspieszenia, więc liczy się droga w metryce
+    miejskiej, skrócona o zasięg.
+    """
+    manhattan = np.abs(np.asarray(dc, dtype=np.int64)) + np.abs(
+        np.asarray(dr, dtype=np.int64)
+    )
+    return straight_travel_time(manhattan - range_d, max_acc)
+
+
+def nearest_neighbours(xs: np.ndarray, ys: np.ndarray, k: int) -> np.ndarray:
+    """
+    (n, k) - dla każdego punktu k najbliższych innych punktów, rosnąco po
+    odległości euklidesowej. Liczone blokami: punkty jednej komórki siatki
+    naraz, z poszerzaniem kwadratu komórek aż wynik będzie pewny.
+    """
+    n = len(xs)
+    k = min(k, n - 1)
+    neighbours = np.empty((n, max(k, 0)), dtype=np.int32)
+    if k <= 0:
+        return neighbours
+
+    width = float(np.ptp(xs)) if n else 0.0
+    height = float(np.ptp(ys)) if n else 0.0
+    cell_size = math.sqrt(max(width * height, 1.0) * k / n)
+    index = GiftSpatialIndex(xs, ys, cell_size=cell_size)
+
+    cell_keys, starts = np.unique(index.keys, return_index=True)
+    stops = np.append(starts[1:], len(index.keys))
+    max_ring = max(index.n_cols, index.n_rows)
+
+    for key, start, stop in zip(cell_keys.tolist(), starts.tolist(), stops.tolist()):
+        cy, cx = divmod(key, index.n_cols)
+        own = index.ids[start:stop]
+        qx = index.xs[start:stop, None]
+        qy = index.ys[start:stop, None]
+
+        ring = 1
+        while True:
+            candidates = index.square(cx, cy, ring)
+            if len(candidates) > k:
+                d2 = (index.xs[candidates] - qx) ** 2 + (index.ys[candidates] - qy) ** 2
+                d2[index.ids[candidates][None, :] == own[:, None]] = np.inf
+                part = np.argpartition(d2, k - 1, axis=1)[:, :k]
+                part_d2 = np.take_along_axis(d2, part, axis=1)
+                # Poza kwadratem wszystko jest dalej niż ring * cell_size
+                if part_d2.max() <= (ring * index.cell_size) ** 2 or ring >= max_ring:
+                    break
+            ring += 1
+
+        order = np.argsort(part_d2, axis=1, kind="stable")
+        part = np.take_along_axis(part, order, axis=1)
+        neighbours[own] = index.ids[candidates][part]
+
+    return neighbours
+
+
+class TravelTimeMatrix:
+    """
+    Szacowane czasy przelotu między bazą a celami prezentów, osobno dla
+    każdej klasy przyspieszenia z tablicy. Dla małych problemów macierz jest
+    pełna, dla dużych - tylko k najbliższych sąsiadów każdego punktu.
+    Czasy z bazy do wszystkich punktów są zawsze pełne.
+    """
+
+    def __init__(
+        self,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        accels: np.ndarray,
+        range_d: int,
+        times: np.ndarray,
+        base_times: np.ndarray,
+        neighbours: Optional[np.ndarray] = None,
+    ):
+        self.xs = np.asarray(xs, dtype=np.int64)
+        self.ys = np.asarray(ys, dtype=np.int64)
+        self.accels = np.asarray(accels, dtype=np.int64)
+        self.range_d = int(range_d)
+        self.times = times
+        self.base_times = base_times
+        self.neighbours = neighbours
+        self._accel_list = self.accels.tolist()
+
+    @classmethod
+    def build(
+        cls,
+        catalog,
+        acceleration_ranges,
+        range_d: int,
+        k: Optional[int] = None,
+        dense_limit: int = DENSE_LIMIT,
+    ) -> "TravelTimeMatrix":
+        """
+        k=None: pełna macierz do dense_limit punktów, powyżej
+        DEFAULT_NEIGHBOURS sąsiadów. Podane k wymusza wersję z sąsiadami.
+        """
+        xs = np.concatenate([[0], catalog.dest_c]).astype(np.int64)
+        ys = np.concatenate([[0], catalog.dest_r]).astype(np.int64)
+        accels = np.unique(
+            [r.max_accel for r in acceleration_ranges if r.max_accel > 0]
+        )
+        accels = accels.astype(np.int64)
+        n = len(xs)
+
+        base_times = np.empty((len(accels), n), dtype=np.int32)
+        for i, a in enumerate(accels.tolist()):
+            base_times[i] = estimate_travel_time(xs, ys, a, range_d)
+
+        if k is None and n <= dense_limit:
+            dc = xs[:, None] - xs[None, :]
+            dr = ys[:, None] - ys[None, :]
+            times = np.empty((len(accels), n, n), dtype=np.int32)
+            for i, a in enumerate(accels.tolist()):
+                times[i] = estimate_travel_time(dc, dr, a, range_d)
+            return cls(xs, ys, accels, range_d, times, base_times)
+
+        neighbours = nearest_neighbours(xs, ys, DEFAULT_NEIGHBOURS if k is None else k)
+        dc = xs[neighbours] - xs[:, None]
+        dr = ys[neighbours] - ys[:, None]
+        times = np.empty((len(accels),) + neighbours.shape, dtype=np.int32)
+        for i, a in enumerate(accels.tolist()):
+            times[i] = estimate_travel_time(dc, dr, a, range_d)
+        return cls(xs, ys, accels, range_d, times, base_times, neighbours)
+
+    @property
+    def dense(self) -> bool:
+        return self.neighbours is None
+
+    @property
+    def k(self) -> Optional[int]:
+        """Liczba sąsiadów na punkt albo None dla pełnej macierzy."""
+        return None if self.dense else self.neighbours.shape[1]
+
+    def class_of(self, max_acc: int) -> int:
+        """Indeks klasy przyspieszenia (KeyError dla wartości spoza tablicy)."""
+        i = np.searchsorted(self.accels, max_acc)
+        if i == len(self.accels) or self._accel_list[i] != max_acc:
+            raise KeyError(f"No acceleration class {max_acc}")
+        return int(i)
+
+    def time(self, p: int, q: int, max_acc: int) -> int:
+        """Czas przelotu między punktami p i q (BASE albo id prezentu + 1)."""
+        c = self.class_of(max_acc)
+        if p == BASE:
+            return int(self.base_times[c, q])
+        if q == BASE:
+            return int(self.base_times[c, p])
+        if self.dense:
+            return int(self.times[c, p, q])
+
+        hit = np.flatnonzero(self.neighbours[p] == q)
+        if len(hit):
+            return int(self.times[c, p, hit[0]])
+        # Poza listą sąsiadów - liczymy na miejscu
+        return int(
+            estimate_travel_time(
+                self.xs[q] - self.xs[p], self.ys[q] - self.ys[p], max_acc, self.range_d
+            )
+        )
+
+    def from_base(self, gift_id: int, max_acc: int) -> int:
+        return int(self.base_times[self.class_of(max_acc), gift_id + 1])
+
+    def between(self, gift_a: int, gift_b: int, max_acc: int) -> int:
+        return self.time(gift_a + 1, gift_b + 1, max_acc)
+
+    def times_from(self, p: int, points: np.ndarray, max_acc: int) -> np.ndarray:
+        """Wektorowo: czasy z punktu p do wielu punktów."""
+        points = np.asarray(points, dtype=np.int64)
+        c = self.class_of(max_acc)
+        if p == BASE:
+            return self.base_times[c, points]
+        if self.dense:
+            return self.times[c, p, points]
+
+        # Sąsiedzi p z macierzy, reszta liczona na miejscu
+        row = self.neighbours[p]
+        order = np.argsort(row, kind="stable")
+        slot = np.searchsorted(row[order], points).clip(max=len(row) - 1)
+        hit = row[order][slot] == points
+        result = np.empty(len(points), dtype=self.times.dtype)
+        result[hit] = self.times[c, p, order[slot[hit]]]
+        miss = points[~hit]
+        result[~hit] = estimate_travel_time(
+            self.xs[miss] - self.xs[p],
+            self.ys[miss] - self.ys[p],
+            max_acc,
+            self.range_d,
+        )
+        return result
+
+    def neighbours_of(self, gift_id: int) -> np.ndarray:
+        """Id prezentów najbliższych celowi gift_id (bez bazy)."""
+        p = gift_id + 1
+        if self.dense:
+            d2 = (self.xs - self.xs[p]) ** 2 + (self.ys - self.ys[p]) ** 2
+            points = np.argsort(d2, kind="stable")
+        else:
+            points = self.neighbours[p]
+        points = np.asarray(points, dtype=np.int64)
+        return points[(points != BASE) & (points != p)] - 1
+
+    # Pola zapisywane przez arrays()/from_arrays()
+    _ARRAY_FIELDS = ("xs", "ys", "accels", "times", "base_times")
+
+    def arrays(self) -> dict:
+        result = {name: getattr(self, name) for name in self._ARRAY_FIELDS}
+        result["range_d"] = np.array(self.range_d)
+        if not self.dense:
+            result["neighbours"] = self.neighbours
+        return result
+
+    @classmethod
+    def from_arrays(cls, **arrays) -> "TravelTimeMatrix":
+        return cls(
+            *(np.asarray(arrays[name]) for name in cls._ARRAY_FIELDS[:3]),
+            range_d=int(arrays["range_d"]),
+            times=np.asarray(arrays["times"]),
+            base_times=np.asarray(arrays["base_times"]),
+            neighbours=(
+                np.asarray(arrays["neighbours"]) if "neighbours" in arrays else None
+            ),
+        )
@@ -0,0 +1,180 @@
+import hashlib
+import math
+from typing import Callable, Optional
+
+import numpy as np
+
+from core.acceleration_table import AccelerationTable
+
+# Największa pojemność liczona w DP wprost - powyżej wagi są skalowane w górę
+MAX_DP_CAPACITY = 4096
+# Limit komórek tablicy decyzji (prezenty x pojemności) - powyżej zostają
+# tylko prezenty z najlepszym stosunkiem punktów do wagi
+DP_CELL_LIMIT = 1 << 24
+# Liczba zapamiętanych wyników select - np. ten sam pierwszy załadunek w
+# każdym epizodzie SleighEnv nie liczy DP od nowa
+SELECT_CACHE_SIZE = 256
+
+
+def knapsack_table(weights: np.ndarray, values: np.ndarray, capacity: int):
+    """
+    Plecak 0/1: best[c] - najlepsza wartość przy łącznej wadze <= c oraz
+    bity decyzji keep (przedmiot x pojemność) do odtworzenia wyboru.
+    Pętla idzie po przedmiotach, a każdy krok jest wektorowy po pojemnościach.
+    """
+    best = np.zeros(capacity + 1, dtype=np.float64)
+    keep = np.zeros((len(weights), capacity + 1), dtype=bool)
+    for i, (w, v) in enumerate(zip(weights.tolist(), values.tolist())):
+        if w > capacity:
+            continue
+        with_item = best[: capacity + 1 - w] + v
+        better = with_item > best[w:]
+        keep[i, w:] = better
+        best[w:][better] = with_item[better]
+    return best, keep
+
+
+def knapsack_choice(keep: np.ndarray, weights: np.ndarray, capacity: int) -> list:
+    """Indeksy przedmiotów optymalnego wyboru dla pojemności capacity."""
+    chosen = []
+    for i in range(len(weights) - 1, -1, -1):
+        if keep[i, capacity]:
+            chosen.append(i)
+            capacity -= int(weights[i])
+    chosen.reverse()
+    return chosen
+
+
+def default_speed(max_acc: int) -> float:
+    """Czas przelotu maleje jak 1/sqrt(a) (patrz core.travel_time)."""
+    return math.sqrt(max_acc)
+
+
+class TripLoader:
+    """
+    Wybór prezentów na kurs. Dla każdej klasy przyspieszenia z tablicy
+    rozwiązuje plecak z pojemnością do górnej granicy wagi tej klasy (jedno
+    DP daje wyniki dla wszystkich pojemności) i wybiera klasę z największym
+    (punkty na pokładzie + punkty nowych prezentów) * speed(przyspieszenie).
+    Zakłada, że przyspieszenie nie rośnie z wagą - tak jak w danych zadania.
+    """
+
+    def __init__(
+        self,
+        classes: list[tuple[float, int]],
+        gift_weights: np.ndarray,
+        gift_scores: np.ndarray,
+        speed: Optional[Callable[[int], float]] = None,
+    ):
+        """classes: pary (górna granica wagi, przyspieszenie) dla a > 0."""
+        self.classes = sorted(classes)
+        self.gift_weights = np.asarray(gift_weights, dtype=np.int64)
+        self.gift_scores = np.asarray(gift_scores, dtype=np.float64)
+        self.speed = speed or default_speed
+        self._cache = {}
+
+    @classmethod
+    def from_table(
+        cls, accel_table: AccelerationTable, catalog, speed=None
+    ) -> "TripLoader":
+        classes = [
+            (r.max_weight_inclusive, r.max_accel)
+            for r in accel_table.ranges
+            if r.max_accel > 0
+        ]
+        return cls(classes, catalog.weights, catalog.scores, speed)
+
+    def select(
+        self, candidates, current_weight: float, loaded_score: float = 0
+    ) -> np.ndarray:
+        """
+        Id prezentów z candidates do załadowania przy obecnej wadze sań.
+        Pusty wynik, gdy żaden prezent nie poprawia wartości kursu.
+        Wynik jest tylko do odczytu - powtórzone zapytania zwracają go z cache.
+        """
+        candidates = np.asarray(candidates, dtype=np.int64)
+        digest = hashlib.blake2b(candidates.tobytes(), digest_size=16).digest()
+        key = (digest, float(current_weight), float(loaded_score))
+        chosen = self._cache.get(key)
+        if chosen is None:
+            chosen = self._select(candidates, current_weight, loaded_score)
+            chosen.setflags(write=False)
+            if len(self._cache) >= SELECT_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[key] = chosen
+        return chosen
+
+    def _select(
+        self, candidates: np.ndarray, current_weight: float, loaded_score: float
+    ) -> np.ndarray:
+        capacities = [
+            (math.floor(limit - current_weight), accel)
+            for limit, accel in self.classes
+            if limit >= current_weight
+        ]
+        if not capacities or len(candidates) == 0:
+            return np.empty(0, dtype=np.int64)
+        max_capacity = capacities[-1][0]
+
+        weights = self.gift_weights[candidates]
+        scores = self.gift_scores[candidates]
+        useful = (weights <= max_capacity) & (scores > 0)
+        candidates, weights, scores = (
+            candidates[useful],
+            weights[useful],
+            scores[useful],
+        )
+
+        # Prezenty bez wagi nic nie kosztują
+        free = weights <= 0
+        free_ids = candidates[free]
+        loaded_score += scores[free].sum()
+        candidates, weights, scores = candidates[~free], weights[~free], scores[~free]
+
+        # Z prezentów o tej samej wadze w zmieści się najwyżej max_capacity // w,
+        # więc pozostałe (o mniejszych punktach) można pominąć bez straty
+        order = np.lexsort((-scores, weights))
+        sorted_weights = weights[order]
+        rank = np.arange(len(order)) - np.searchsorted(sorted_weights, sorted_weights)
+        order = np.sort(order[rank < max_capacity // np.maximum(sorted_weights, 1)])
+        candidates, weights, scores = candidates[order], weights[order], scores[order]
+
+        scale = max(1, math.ceil(max_capacity / MAX_DP_CAPACITY))
+        # Zaokrąglenie wag w górę - wybór po skalowaniu na pewno się zmieści
+        dp_weights = -(-weights // scale)
+        dp_capacity = max_capacity // scale
+
+        max_items = max(1, DP_CELL_LIMIT // (dp_capacity + 1))
+        if len(candidates) > max_items:
+            ratio = scores / weights
+            top = np.argpartition(-ratio, max_items - 1)[:max_items]
+            top.sort()
+        else:
+            top = np.arange(len(candidates))
+
+        best, keep = knapsack_table(dp_weights[top], scores[top], dp_capacity)
+
+        def value(i):
+            capacity, accel = capacities[i]
+            return (loaded_score + best[capacity // scale]) * self.speed(accel)
+
+        chosen_class = max(range(len(capacities)), key=value)
+        capacity = capacities[chosen_class][0]
+        chosen = top[knapsack_choice(keep, dp_weights[top], capacity // scale)]
+
+        if scale > 1 or len(top) < len(candidates):
+            chosen = self._fill(chosen, weights, scores, capacity)
+
+        return np.concatenate([free_ids, np.sort(candidates[chosen])])
+
+    @staticmethod
+    def _fill(chosen, weights, scores, capacity) -> np.ndarray:
+        """Dopełnia przybliżone rozwiązanie prezentami w kolejności punkty/waga."""
+        rest = np.ones(len(weights), dtype=bool)
+        rest[chosen] = False
+        left = capacity - weights[chosen].sum()
+
+        others = np.flatnonzero(rest)
+        others = others[np.argsort(-scores[others] / weights[others], kind="stable")]
+        fits = np.cumsum(weights[others]) <= left
+        return np.concatenate([chosen, others[fits]]).astype(np.int64)
@@ -0,0 +1,231 @@
+import math
+import time
+from bisect import bisect_left, bisect_right
+from typing import Optional
+
+import numpy as np
+
+from core.acceleration_table import AccelerationTable
+from core.travel_time import estimate_travel_time
+
+# Domyślny budżet jednego wyboru - ok. 0.02 s, ale niezależny od zegara
+DEFAULT_MAX_NODES = 10000
+
+
+class BranchAndBoundSelector:
+    """
+    Wybór prezentów na kurs metodą podziału i ograniczeń. Kurs jest oceniany
+    jako punkty na krok: punkty / (2 * czas przelotu do najdalszego celu
+    przy przyspieszeniu klasy wagi sań). Gałęzie są odcinane, gdy górne
+    ograniczenie - plecak ułamkowy na punktach podzielony przez dolne
+    ograniczenie czasu - nie przebija najlepszego kursu. Przeszukiwanie
+    przerywa max_nodes węzłów albo - tylko gdy podano time_budget - tyle
+    sekund, a wynikiem jest najlepszy znaleziony kurs (na starcie zachłanny).
+
+    Eksperymentalny: czas kursu nie obejmuje przelotów między przystankami,
+    więc cel faworyzuje małe kursy blisko bazy i zwykle przegrywa z plecakiem
+    z TripLoader. Dlatego SmartSolver używa go tylko z use_branch_and_bound.
+    """
+
+    def __init__(
+        self,
+        classes: list[tuple[float, int]],
+        gift_weights: np.ndarray,
+        gift_scores: np.ndarray,
+        dest_c: np.ndarray,
+        dest_r: np.ndarray,
+        range_d: int,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        time_budget: Optional[float] = None,
+    ):
+        """classes: pary (górna granica wagi, przyspieszenie) dla a > 0."""
+        self.classes = sorted(classes)
+        self.gift_weights = np.asarray(gift_weights, dtype=np.int64)
+        self.gift_scores = np.asarray(gift_scores, dtype=np.int64)
+        self.dest_c = np.asarray(dest_c, dtype=np.int64)
+        self.dest_r = np.asarray(dest_r, dtype=np.int64)
+        self.range_d = range_d
+        self.max_nodes = max_nodes
+        self.time_budget = time_budget
+        # Statystyki ostatniego wyboru
+        self.nodes = 0
+        self.exhausted = False
+
+    @classmethod
+    def from_table(
+        cls, accel_table: AccelerationTable, catalog, range_d: int, **budgets
+    ) -> "BranchAndBoundSelector":
+        classes = [
+            (r.max_weight_inclusive, r.max_accel)
+            for r in accel_table.ranges
+            if r.max_accel > 0
+        ]
+        return cls(
+            classes,
+            catalog.weights,
+            catalog.scores,
+            catalog.dest_c,
+            catalog.dest_r,
+            range_d,
+            **budgets,
+        )
+
+    def select(
+        self,
+        candidates,
+        current_weight: float,
+        loaded_score: float = 0,
+        time_left: Optional[int] = None,
+        loaded=(),
+    ) -> np.ndarray:
+        """
+        Id prezentów z candidates na kurs z największą liczbą punktów na krok.
+        Z time_left pomijane są kursy, z których nie da się wrócić na czas.
+        loaded_score, loaded: punkty i id prezentów już na saniach - kurs
+        trwa co najmniej do najdalszego z nich i z powrotem.
+        """
+        self.nodes = 0
+        self.exhausted = False
+        candidates = np.asarray(candidates, dtype=np.int64)
+        limits = [
+            math.floor(limit - current_weight)
+            for limit, _ in self.classes
+            if limit >= current_weight
+        ]
+        accels = [accel for limit, accel in self.classes if limit >= current_weight]
+        if not limits or len(candidates) == 0:
+            return np.empty(0, dtype=np.int64)
+        max_capacity = limits[-1]
+
+        weights = self.gift_weights[candidates]
+        scores = self.gift_scores[candidates]
+        manhattan = np.abs(self.dest_c[candidates]) + np.abs(self.dest_r[candidates])
+        # Czas w jedną stronę dla każdej klasy: (klasy, prezenty)
+        one_way = np.stack(
+            [
+                estimate_travel_time(manhattan, 0, accel, self.range_d)
+                for accel in accels
+            ]
+        )
+        loaded = np.asarray(loaded, dtype=np.int64)
+        loaded_far = 0
+        if len(loaded):
+            loaded_far = int(
+                (np.abs(self.dest_c[loaded]) + np.abs(self.dest_r[loaded])).max()
+            )
+        # Czas w jedną stronę do najdalszego załadowanego celu dla każdej klasy
+        base_time = [
+            int(estimate_travel_time(loaded_far, 0, accel, self.range_d))
+            for accel in accels
+        ]
+        useful = (weights <= max_capacity) & (scores > 0)
+        if time_left is not None:
+            useful &= 2 * np.maximum(one_way[0], base_time[0]) <= time_left
+        # Prezenty bez wagi trafiają na kurs zawsze - jak w TripLoader
+        free = useful & (weights <= 0)
+        useful &= weights > 0
+
+        # Kolejność punkty/waga malejąco - potrzebna do plecaka ułamkowego
+        order = np.flatnonzero(useful)
+        order = order[np.argsort(-scores[order] / weights[order], kind="stable")]
+        chosen = self._search(
+            weights[order].tolist(),
+            scores[order].tolist(),
+            manhattan[order].tolist(),
+            one_way[:, order].tolist(),
+            base_time,
+            limits,
+            loaded_score + int(scores[free].sum()),
+            time_left,
+        )
+        picked = np.concatenate([np.flatnonzero(free), order[chosen]])
+        return np.sort(candidates[picked])
+
+    def _search(
+        self, w, s, dist, times, base_time, limits, base_score, time_left
+    ) -> list:
+        """Indeksy (w kolejności punkty/waga) najlepszego kursu."""
+        n = len(w)
+        if n == 0:
+            self.exhausted = True
+            return []
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.perf_counter() + self.time_budget
+        max_capacity = limits[-1]
+
+        cum_w, cum_s = [0], [0]
+        for wi, si in zip(w, s):
+            cum_w.append(cum_w[-1] + wi)
+            cum_s.append(cum_s[-1] + si)
+        # Najbliższy cel w sufiksie - dolne ograniczenie czasu pustego kursu
+        nearest = [0] * n
+        nearest[-1] = n - 1
+        for i in range(n - 2, -1, -1):
+            j = nearest[i + 1]
+            nearest[i] = i if dist[i] <= dist[j] else j
+
+        def fractional(i, capacity):
+            j = bisect_right(cum_w, cum_w[i] + capacity) - 1
+            bound = cum_s[j] - cum_s[i]
+            if j < n:
+                bound += s[j] * (capacity - (cum_w[j] - cum_w[i])) / w[j]
+            return bound
+
+        def trip_time(weight, far):
+            c = bisect_left(limits, weight)
+            return max(1, 2 * times[c][far], 2 * base_time[c])
+
+        def fits_in_time(weight, far):
+            return time_left is None or trip_time(weight, far) <= time_left
+
+        # Rozwiązanie startowe: zachłannie po punkty/waga
+        best, best_value = [], 0.0
+        greedy, weight, score, far = [], 0, base_score, -1
+        for i in range(n):
+            new_far = i if far < 0 or dist[i] > dist[far] else far
+            if weight + w[i] <= max_capacity and fits_in_time(weight + w[i], new_far):
+                greedy.append(i)
+                weight, score, far = weight + w[i], score + s[i], new_far
+                if score / trip_time(weight, far) > best_value:
+                    best, best_value = list(greedy), score / trip_time(weight, far)
+
+        # Węzeł: (następny prezent, waga, punkty, najdalszy cel, wybrane)
+        stack = [(0, 0, base_score, -1, ())]
+        nodes = 0
+        while stack:
+            nodes += 1
+            if nodes > self.max_nodes or (
+                deadline is not None
+                and nodes & 255 == 0
+                and time.perf_counter() > deadline
+            ):
+                break
+            i, weight, score, far, chosen = stack.pop()
+
+            if far >= 0 and fits_in_time(weight, far):
+                value = score / trip_time(weight, far)
+                if value > best_value:
+                    best, best_value = list(chosen), value
+            if i == n:
+                continue
+
+            # Dokładane prezenty mogą tylko zwolnić sanie i wydłużyć kurs
+            time_bound = trip_time(weight, far if far >= 0 else nearest[i])
+            if time_left is not None and time_bound > time_left:
+                continue
+            bound = score + fractional(i, max_capacity - weight)
+            if bound / time_bound <= best_value:
+                continue
+
+            stack.append((i + 1, weight, score, far, chosen))
+            if weight + w[i] <= max_capacity:
+                new_far = i if far < 0 or dist[i] > dist[far] else far
+                stack.append(
+                    (i + 1, weight + w[i], score + s[i], new_far, chosen + (i,))
+                )
+        else:
+            self.exhausted = True
+
+        self.nodes = nodes
+        return sorted(best)
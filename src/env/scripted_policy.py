@@ -0,0 +1,37 @@
+import numpy as np
+
+from core.distance_utils import distance
+from env.vector_sleigh_env import ACTION_DELIVER, ACTION_FUEL, ACTION_LOAD
+
+
+def scripted_action(env):
+    """Sztywna logika bazy i dostaw; None - decyduje sieć."""
+    dist_to_base = distance(env.state.position, env.sim.lapland_pos)
+
+    if dist_to_base <= env.problem.D:
+        if not env.state.loaded_gifts and env.state.available_gifts:
+            return ACTION_LOAD
+        if env.state.carrot_count < 20:
+            return ACTION_FUEL
+
+    if env.state.loaded_gifts:
+        tgt = env.gifts_map[env.state.loaded_gifts.first()]
+        if distance(env.state.position, tgt.destination) <= env.problem.D:
+            return ACTION_DELIVER
+    return None
+
+
+def scripted_actions(vec_env):
+    """scripted_action dla wszystkich kopii naraz (-1 = decyduje sieć)."""
+    sim = vec_env.sim
+    actions = np.full(vec_env.num_envs, -1, dtype=np.int64)
+
+    has_loaded = vec_env.first_loaded >= 0
+    in_base = vec_env.in_base()
+    load = in_base & ~has_loaded & sim.available.any(axis=1)
+    fuel = in_base & ~load & (sim.carrots < 20)
+
+    actions[vec_env.target_in_range()] = ACTION_DELIVER
+    actions[fuel] = ACTION_FUEL
+    actions[load] = ACTION_LOAD
+    return actions
@@ -1,24 +1,38 @@
 import math
 
+import numpy as np
 import torch
 
+from brain.motion_control import steps_until_in_range
+from core.actions import Action
 from core.distance_utils import distance
 
 
 class SleighEnv:
     ACTION_SPACE_SIZE = 12
-
-    def __init__(self, problem, simulator):
+    # Kierunki akcji ruchu: N=Up, S=Down, E=Right, W=Left
+    MOVE_COMMANDS = [Action.AccUp, Action.AccDown, Action.AccRight, Action.AccLeft]
+
+    def __init__(self, problem, simulator, coast=False):
+        """
+        coast: akcja FLOAT przelatuje naraz wszystkie kroki, zanim bieżący
+        cel wpadnie w zasięg (jedno Float k zamiast k decyzji Float 1).
+        """
         self.problem = problem
         self.sim = simulator
+        self.coast = coast
         self.state = None
         self.base_interaction_locked = False
 
+        # Z kolumn katalogu - bez budowania obiektu Gift dla każdego prezentu
+        catalog = problem.catalog
         max_dist = 1.0
-        for g in problem.gifts:
-            d = max(abs(g.destination.c), abs(g.destination.r))
-            if d > max_dist:
-                max_dist = d
+        if len(catalog):
+            max_dist = max(
+                max_dist,
+                float(np.abs(catalog.dest_c).max()),
+                float(np.abs(catalog.dest_r).max()),
+            )
 
         self.map_limit = max_dist * 1.2
         self.MAX_COORD = float(self.map_limit)
@@ -69,7 +83,10 @@ class SleighEnv:
 
                 self.sim.handle_action(ax, ay, 0, 0)
 
-            self.sim.step()
+            ticks = self._coast_ticks() if action_id == 8 and self.coast else 1
+            self.sim.step(ticks)
+            # Kara za czas jak przy ticks pojedynczych Float
+            reward -= 0.1 * (ticks - 1)
             if action_id < 8 and self.state.carrot_count < self.sim.state.carrot_count:
                 reward -= 0.5
 
@@ -100,7 +117,7 @@ class SleighEnv:
         # DELIVER (11)
         elif action_id == 11:
             if self.state.loaded_gifts:
-                target = self.sim.all_gifts_map[self.state.loaded_gifts[0]]
+                target = self.sim.all_gifts_map[self.state.loaded_gifts.first()]
                 dist_to_gift = distance(self.state.position, target.destination)
 
                 if dist_to_gift <= self.problem.D:
@@ -133,19 +150,65 @@ class SleighEnv:
 
         return self._get_observation(), reward, done, {}
 
-    def _get_distance_to_current_target(self):
-        """Metoda pomocnicza do obliczania dystansu dla shaping reward."""
+    def step_with_commands(self, action_id):
+        """
+        step() i komendy pliku rozwiązania, które odpowiadają temu krokowi:
+        (obserwacja, nagroda, koniec, lista par (Action, wartość)).
+        """
+        carrots_before = self.state.carrot_count
+        time_before = self.state.current_time
+        loaded_before = set(self.state.loaded_gifts)
+        delivered_before = set(self.state.delivered_gifts)
+        vc_before = self.state.velocity.vc
+        vr_before = self.state.velocity.vr
+
+        observation, reward, done, _ = self.step(action_id)
+
+        commands = []
+        if action_id < 8:
+            dv_c = abs(self.state.velocity.vc - vc_before)
+            dv_r = abs(self.state.velocity.vr - vr_before)
+            val = int(max(dv_c, dv_r))
+            if val == 0:
+                val = 1
+            commands.append((self.MOVE_COMMANDS[action_id % 4], val))
+            commands.append((Action.Floating, 1))
+        elif action_id == 8:
+            commands.append((Action.Floating, self.state.current_time - time_before))
+        elif action_id == 9:
+            for gid in set(self.state.loaded_gifts) - loaded_before:
+                commands.append((Action.LoadGifts, gid))
+        elif action_id == 10:
+            if self.state.carrot_count > carrots_before:
+                commands.append(
+                    (Action.LoadCarrots, self.state.carrot_count - carrots_before)
+                )
+        elif action_id == 11:
+            for gid in set(self.state.delivered_gifts) - delivered_before:
+                commands.append((Action.DeliverGift, gid))
+
+        return observation, reward, done, commands
+
+    def _coast_ticks(self):
+        """Kroki lotu bez zmian do wejścia w zasięg bieżącego celu (min. 1)."""
+        ticks = steps_until_in_range(
+            self.state.position,
+            self.state.velocity,
+            self._current_target(),
+            self.problem.D,
+        )
+        remaining = self.problem.T - self.state.current_time
+        return max(1, min(ticks or 1, remaining))
+
+    def _current_target(self):
         s = self.state
-        fuel_ratio = s.carrot_count / float(self.sim.MAX_FUEL)
+        if s.carrot_count / float(self.sim.MAX_FUEL) < 0.2 or not s.loaded_gifts:
+            return self.sim.lapland_pos
+        return self.sim.all_gifts_map[s.loaded_gifts.first()].destination
 
-        if fuel_ratio < 0.2:
-            target_pos = self.sim.lapland_pos
-        elif s.loaded_gifts:
-            target_pos = self.sim.all_gifts_map[s.loaded_gifts[0]].destination
-        else:
-            target_pos = self.sim.lapland_pos
-
-        return distance(s.position, target_pos)
+    def _get_distance_to_current_target(self):
+        """Metoda pomocnicza do obliczania dystansu dla shaping reward."""
+        return distance(self.state.position, self._current_target())
 
     def _get_observation(self):
         s = self.state
@@ -158,7 +221,7 @@ class SleighEnv:
         if fuel_ratio < 0.2:
             target_pos = self.sim.lapland_pos
         elif has_gift:
-            target_pos = self.sim.all_gifts_map[s.loaded_gifts[0]].destination
+            target_pos = self.sim.all_gifts_map[s.loaded_gifts.first()].destination
         else:
             target_pos = self.sim.lapland_pos
 
@@ -0,0 +1,218 @@
+import numpy as np
+import torch
+
+from core.batch_simulator import BatchSimulator
+from env.sleigh_env import SleighEnv
+
+ACTION_FLOAT = 8
+ACTION_LOAD = 9
+ACTION_FUEL = 10
+ACTION_DELIVER = 11
+
+
+class VectorSleighEnv:
+    """
+    N kopii SleighEnv na tym samym problemie, krokowanych jednym wywołaniem.
+    Nagrody i warunki końca są takie same jak w SleighEnv.
+    """
+
+    ACTION_SPACE_SIZE = SleighEnv.ACTION_SPACE_SIZE
+
+    def __init__(
+        self, problem, simulator, num_envs, autoreset=True, max_episode_steps=None
+    ):
+        self.problem = problem
+        self.num_envs = num_envs
+        self.sim = BatchSimulator.from_simulator(simulator, num_envs)
+        self.autoreset = autoreset
+        self.max_episode_steps = max_episode_steps
+
+        catalog = problem.catalog
+        max_dist = 1.0
+        if len(catalog):
+            max_dist = max(
+                max_dist,
+                float(np.abs(catalog.dest_c).max()),
+                float(np.abs(catalog.dest_r).max()),
+            )
+
+        self.map_limit = max_dist * 1.2
+        self.MAX_COORD = float(self.map_limit)
+        self.MAX_VEL = max(100.0, self.map_limit / 5.0)
+
+        self.base_interaction_locked = np.zeros(num_envs, dtype=bool)
+        self.finished = np.zeros(num_envs, dtype=bool)
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+        self.first_loaded = np.full(num_envs, -1, dtype=np.int64)
+        self.last_dist_to_target = np.zeros(num_envs, dtype=np.float64)
+
+    def reset(self, mask=None):
+        rows = (
+            np.ones(self.num_envs, dtype=bool)
+            if mask is None
+            else np.asarray(mask, dtype=bool)
+        )
+        self.sim.reset(rows)
+        self.base_interaction_locked[rows] = False
+        self.finished[rows] = False
+        self.episode_steps[rows] = 0
+        self.first_loaded[rows] = -1
+        self.last_dist_to_target[rows] = self._distance_to_current_target()[rows]
+        return self._get_observation()
+
+    def step(self, actions):
+        """
+        actions: (N,) ID akcji jak w SleighEnv.
+        Zwraca obserwacje (N, 12), nagrody (N,), maskę końca (N,) oraz info.
+        Przy autoreset zakończone kopie są od razu resetowane, a ich ostatnia
+        obserwacja trafia do info["final_observation"].
+        """
+        if isinstance(actions, torch.Tensor):
+            actions = actions.cpu().numpy()
+        actions = np.asarray(actions, dtype=np.int64)
+
+        sim = self.sim
+        active = ~self.finished
+        rewards = np.where(active, -0.1, 0.0)
+
+        in_base = self.in_base()
+        self.base_interaction_locked &= in_base
+
+        prev_dist = self.last_dist_to_target
+
+        # MOVE
+        moving = active & (actions <= ACTION_FLOAT)
+        accelerating = moving & (actions < ACTION_FLOAT)
+        direction = actions % 4
+        acc_val = np.where(
+            actions >= 4, sim.max_acceleration(sim.weight), 1.0
+        ).astype(np.float64)
+        ax = np.select(
+            [accelerating & (direction == 2), accelerating & (direction == 3)],
+            [acc_val, -acc_val],
+            0.0,
+        )
+        ay = np.select(
+            [accelerating & (direction == 0), accelerating & (direction == 1)],
+            [acc_val, -acc_val],
+            0.0,
+        )
+
+        # LOAD (9)
+        has_loaded = self.first_loaded >= 0
+        base_free = in_base & ~self.base_interaction_locked
+        wants_load = active & (actions == ACTION_LOAD)
+        loading = wants_load & base_free & ~has_loaded & sim.available.any(axis=1)
+        rewards += np.where(loading, 200.0, np.where(wants_load, -5.0, 0.0))
+
+        # FUEL (10)
+        wants_fuel = active & (actions == ACTION_FUEL)
+        refueling = wants_fuel & base_free & (sim.carrots < sim.MAX_FUEL)
+        rewards += np.where(refueling, 50.0, np.where(wants_fuel, -5.0, 0.0))
+
+        # DELIVER (11)
+        wants_deliver = active & (actions == ACTION_DELIVER)
+        delivering = wants_deliver & self.target_in_range()
+        rewards += np.where(delivering, 5000.0, np.where(wants_deliver, -10.0, 0.0))
+
+        load_cmd = loading.astype(np.int64) - delivering.astype(np.int64)
+        sim.handle_action(ax, ay, load_cmd, refueling)
+        sim.step(moving)
+
+        self.base_interaction_locked |= loading | refueling
+        self.base_interaction_locked &= ~delivering
+        changed = loading | delivering
+        if changed.any():
+            self._update_first_loaded(changed)
+
+        current_dist = self._distance_to_current_target()
+        rewards += np.where(active, (prev_dist - current_dist) * 0.005, 0.0)
+        self.last_dist_to_target = np.where(active, current_dist, prev_dist)
+
+        out_of_fuel = active & (sim.carrots <= 0)
+        rewards -= np.where(out_of_fuel, 500.0, 0.0)
+        all_delivered = active & ~sim.available.any(axis=1) & ~sim.loaded.any(axis=1)
+        rewards += np.where(all_delivered, 10000.0, 0.0)
+
+        self.episode_steps += active
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_episode_steps is not None:
+            truncated = active & (self.episode_steps >= self.max_episode_steps)
+
+        done = out_of_fuel | (active & (sim.time >= self.problem.T)) | all_delivered
+        truncated &= ~done
+        done |= truncated
+
+        info = {
+            "truncated": truncated,
+            "delivered": sim.delivered.sum(axis=1),
+        }
+
+        if self.autoreset and done.any():
+            info["final_observation"] = self._get_observation()
+            observation = self.reset(done)
+        else:
+            self.finished |= done
+            observation = self._get_observation()
+
+        return observation, rewards, done, info
+
+    def in_base(self):
+        dc = self.sim.pos_c - self.sim.lapland_pos.c
+        dr = self.sim.pos_r - self.sim.lapland_pos.r
+        return np.sqrt(dc * dc + dr * dr) <= self.problem.D
+
+    def target_in_range(self):
+        """Czy pierwszy załadowany prezent jest w zasięgu D."""
+        has_loaded = self.first_loaded >= 0
+        target = np.where(has_loaded, self.first_loaded, 0)
+        dc = self.sim.gift_dest_c[target] - self.sim.pos_c
+        dr = self.sim.gift_dest_r[target] - self.sim.pos_r
+        return has_loaded & (np.sqrt(dc * dc + dr * dr) <= self.problem.D)
+
+    def _update_first_loaded(self, rows):
+        idx = np.flatnonzero(rows)
+        self.first_loaded[idx] = self.sim.first_loaded(idx)
+
+    def _target_offsets(self):
+        sim = self.sim
+        fuel_ratio = sim.carrots / float(sim.MAX_FUEL)
+        to_gift = (fuel_ratio >= 0.2) & (self.first_loaded >= 0)
+        target = np.where(to_gift, self.first_loaded, 0)
+
+        target_c = np.where(to_gift, sim.gift_dest_c[target], sim.lapland_pos.c)
+        target_r = np.where(to_gift, sim.gift_dest_r[target], sim.lapland_pos.r)
+        return target_c - sim.pos_c, target_r - sim.pos_r, fuel_ratio
+
+    def _distance_to_current_target(self):
+        dx, dy, _ = self._target_offsets()
+        return np.sqrt(dx * dx + dy * dy)
+
+    def _get_observation(self):
+        sim = self.sim
+        dx, dy, fuel_ratio = self._target_offsets()
+        dist = np.sqrt(dx * dx + dy * dy)
+
+        features = np.empty((self.num_envs, self.input_size), dtype=np.float32)
+        features[:, 0] = self.first_loaded >= 0
+        features[:, 1] = fuel_ratio
+        features[:, 2] = self.in_base()
+        features[:, 3] = dist <= self.problem.D
+        features[:, 4] = np.clip(dx / self.MAX_COORD, -1.0, 1.0)
+        features[:, 5] = np.clip(dy / self.MAX_COORD, -1.0, 1.0)
+        features[:, 6] = sim.vel_c / self.MAX_VEL
+        features[:, 7] = sim.vel_r / self.MAX_VEL
+        features[:, 8] = dist < (sim.vel_c**2 + sim.vel_r**2) / 10.0
+        features[:, 9] = sim.weight / 100.0
+        features[:, 10] = dist / self.MAX_COORD
+        features[:, 11] = 1.0
+
+        return torch.from_numpy(features)
+
+    @property
+    def input_size(self):
+        return 12
+
+    @property
+    def gifts_map(self):
+        return self.sim.all_gifts_map
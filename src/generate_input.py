@@ -29,7 +29,7 @@ def generate():
             y = cy + random.randint(-30, 30)
             weight = random.choice([5, 10, 15, 20, 50])
 
-            f.write(f"Gift_{i} {i} {x} {y} {weight}\n")
+            f.write(f"Gift_{i} {i} {weight} {x} {y}\n")
 
     print(f"Wygenerowano plik: {OUTPUT_FILE}")
 
@@ -0,0 +1,177 @@
+import gzip
+import lzma
+import mmap
+from contextlib import contextmanager
+from typing import Iterator
+
+import numpy as np
+
+from input.input_parser import InputParser
+from models.gift_catalog import GiftCatalog
+
+# Bloki po 4 MB - tablice pomocnicze bloku są kilka razy większe od niego
+CHUNK_SIZE = 1 << 22
+GIFT_FIELDS = 5
+# Dłuższe liczby nie mieszczą się bezpiecznie w int64
+MAX_DIGITS = 18
+
+
+@contextmanager
+def open_input(path: str):
+    """
+    Plik wejściowy jako obiekt z readline/read: .gz i .xz są dekompresowane
+    strumieniowo, zwykłe pliki mapowane w pamięć.
+    """
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as file:
+            yield file
+    elif path.endswith(".xz"):
+        with lzma.open(path, "rb") as file:
+            yield file
+    else:
+        with open(path, "rb") as file:
+            try:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Pustego pliku nie da się zmapować
+                yield file
+                return
+            with mapped:
+                yield mapped
+
+
+def iter_line_chunks(stream, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Bloki po ~chunk_size bajtów, zawsze ucięte na końcu linii."""
+    tail = b""
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            if tail:
+                yield tail
+            return
+
+        block = tail + block
+        cut = block.rfind(b"\n") + 1
+        if cut == 0:
+            tail = block
+            continue
+        tail = block[cut:]
+        yield block[:cut]
+
+
+def parse_gift_chunk(block: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Linie "name score weight c r" -> (nazwy jako tablica bajtów 'S',
+    kolumny liczbowe (n, 4) int64). Bez obiektów Pythona na prezent.
+    Pomocnicze tablice mają rozmiar rzędu liczby tokenów (pozycje w int32),
+    a nie tokenów razy najdłuższy token.
+    """
+    buf = np.frombuffer(block, dtype=np.uint8)
+    if len(buf) == 0:
+        return np.empty(0, dtype="S1"), np.empty((0, GIFT_FIELDS - 1), np.int64)
+
+    # Granice tokenów to miejsca zmiany spacja/nie-spacja
+    space = buf <= ord(" ")
+    edges = np.flatnonzero(space[1:] != space[:-1]).astype(np.int32) + 1
+    del space
+    if buf[0] > ord(" "):
+        edges = np.concatenate((np.zeros(1, np.int32), edges))
+    if buf[-1] > ord(" "):
+        edges = np.concatenate((edges, np.array([len(buf)], np.int32)))
+    if len(edges) // 2 % GIFT_FIELDS:
+        raise ValueError("Malformed gift line")
+    starts = edges[::2].reshape(-1, GIFT_FIELDS)
+    ends = edges[1::2].reshape(-1, GIFT_FIELDS)
+    newlines = np.flatnonzero(buf == ord("\n")).astype(np.int32)
+    first_line = np.searchsorted(newlines, starts[:, 0])
+    last_line = np.searchsorted(newlines, starts[:, -1])
+    if np.any(first_line != last_line):
+        raise ValueError("Malformed gift line")
+    del newlines, first_line, last_line
+
+    names = _gather_names(buf, starts[:, 0], ends[:, 0] - starts[:, 0])
+    values = parse_integers(buf, starts[:, 1:].ravel(), ends[:, 1:].ravel())
+    return names, values.reshape(-1, GIFT_FIELDS - 1)
+
+
+def _gather_names(buf: np.ndarray, starts: np.ndarray, lengths: np.ndarray):
+    """Tablica 'S' z buf[starts[i]:starts[i] + lengths[i]], kolumna po kolumnie."""
+    width = int(lengths.max()) if len(lengths) else 1
+    names = np.zeros((len(starts), width), dtype=np.uint8)
+    for column in range(width):
+        rows = np.flatnonzero(lengths > column)
+        names[rows, column] = buf[starts[rows] + column]
+    return names.view(f"S{width}").ravel()
+
+
+def parse_integers(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+    """
+    Liczby całkowite z tokenów buf[starts[i]:ends[i]]. Cyfry są dokładane
+    schematem Hornera po jednej kolumnie naraz dla wszystkich tokenów.
+    """
+    if len(starts) == 0:
+        return np.empty(0, dtype=np.int64)
+    sign = buf[starts]
+    negative = sign == ord("-")
+    digit_starts = starts + (negative | (sign == ord("+")))
+    lengths = ends - digit_starts
+    if lengths.min() <= 0 or lengths.max() > MAX_DIGITS:
+        raise ValueError("Malformed integer in gift section")
+
+    values = np.zeros(len(starts), dtype=np.int64)
+    for column in range(int(lengths.max())):
+        rows = np.flatnonzero(lengths > column)
+        digits = buf[digit_starts[rows] + column] - np.uint8(ord("0"))
+        # Bajty poniżej '0' zawijają się w uint8 - jedno porównanie wystarczy
+        if np.any(digits > 9):
+            raise ValueError("Malformed integer in gift section")
+        values[rows] = values[rows] * 10 + digits
+    return np.where(negative, -values, values)
+
+
+class ColumnInputParser(InputParser):
+    """
+    Szybka ścieżka InputParser: kolumny prezentów trafiają od razu do tablic
+    NumPy (GiftCatalog.from_columns) zamiast listy obiektów Gift.
+    """
+
+    def __init__(self, data_path, chunk_size: int = CHUNK_SIZE):
+        super().__init__(data_path)
+        self.chunk_size = chunk_size
+
+    def parse_information(self):
+        with open_input(self.data_path) as stream:
+            header = stream.readline().decode()
+            assert header.strip(), "Input file is empty"
+            T, D, W, G = self.parse_configuration(header)
+
+            accel_lines = [stream.readline().decode() for _ in range(W)]
+            acceleration_ranges = self.parse_acceleration_ranges(accel_lines)
+
+            catalog = self.parse_gift_columns(stream, G)
+
+        return T, D, W, G, acceleration_ranges, catalog
+
+    def parse_gift_columns(self, stream, G: int) -> GiftCatalog:
+        names, values = [], []
+        remaining = G
+        for block in iter_line_chunks(stream, self.chunk_size):
+            if remaining <= 0:
+                break
+            chunk_names, chunk_values = parse_gift_chunk(block)
+            names.append(chunk_names[:remaining])
+            values.append(chunk_values[:remaining])
+            remaining -= len(names[-1])
+
+        if remaining > 0:
+            raise ValueError(f"Expected {G} gifts, found {G - remaining}")
+
+        names = np.concatenate(names) if names else np.empty(0, dtype="S1")
+        values = np.concatenate(values) if values else np.empty((0, 4), np.int64)
+        return GiftCatalog.from_columns(
+            names=names,
+            scores=values[:, 0],
+            weights=values[:, 1],
+            dest_c=values[:, 2],
+            dest_r=values[:, 3],
+        )
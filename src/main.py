@@ -2,11 +2,15 @@ import argparse
 import os
 import sys
 
+import numpy as np
+
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from agents.dqn_agent import DQNAgent
-from core.loader import load_problem
+from brain.anytime import solve_anytime
+from core.loader import load_problem, load_travel_times
 from env.sleigh_env import SleighEnv
+from env.vector_sleigh_env import VectorSleighEnv
 from output.output_writer import OutputWriter
 from visualizer import Visualizer
 
@@ -61,6 +65,64 @@ def run_training(env, agent, args):
             print(f"💾 Zapisano rekord: {best_avg_reward:.2f}")
 
 
+def run_vector_training(env, agent, args):
+    print(
+        f"--- START TRENINGU ({args.episodes} odcinków, {env.num_envs} środowisk) ---"
+    )
+    if not os.path.exists("models_saved"):
+        os.makedirs("models_saved")
+
+    epsilon = 1.0
+    epsilon_decay = 0.999
+    epsilon_min = 0.05
+    best_avg_reward = -float("inf")
+    recent_rewards = []
+
+    episode_rewards = np.zeros(env.num_envs)
+    episode_steps = np.zeros(env.num_envs, dtype=np.int64)
+    states = env.reset()
+    e = 0
+
+    while e < args.episodes:
+        actions = agent.get_actions(states, epsilon)
+        next_states, rewards, dones, info = env.step(actions)
+
+        stored_next = next_states
+        if dones.any():
+            stored_next = next_states.clone()
+            stored_next[dones] = info["final_observation"][dones]
+        terminal = dones & ~info["truncated"]
+        agent.remember_batch(states, actions, rewards, stored_next, terminal)
+        agent.update()
+
+        states = next_states
+        episode_rewards += rewards
+        episode_steps += 1
+
+        for i in np.flatnonzero(dones):
+            e += 1
+            if epsilon > epsilon_min:
+                epsilon *= epsilon_decay
+            recent_rewards.append(episode_rewards[i])
+            if len(recent_rewards) > 50:
+                recent_rewards.pop(0)
+            avg_reward = sum(recent_rewards) / len(recent_rewards)
+
+            if e % 10 == 0:
+                print(
+                    f"Ep {e:4d} | Avg: {avg_reward:8.2f} | Eps: {epsilon:.2f} | Steps: {episode_steps[i]} | Deliv: {info['delivered'][i]}"
+                )
+                agent.update_target_network()
+
+            if avg_reward > best_avg_reward and e > 20:
+                best_avg_reward = avg_reward
+                agent.save(MODEL_PATH)
+                print(f"💾 Zapisano rekord: {best_avg_reward:.2f}")
+
+            episode_rewards[i] = 0
+            episode_steps[i] = 0
+
+
 def run_evaluation(env, agent, args):
     print("--- EWALUACJA ---")
     try:
@@ -71,7 +133,6 @@ def run_evaluation(env, agent, args):
         return
 
     agent.policy_net.eval()
-    writer = OutputWriter()
     viz = Visualizer(env.problem) if args.render else None
     state = env.reset()
     done = False
@@ -93,67 +154,82 @@ def run_evaluation(env, agent, args):
         "DELIVER",
     ]
 
-    while not done:
-        carrots_before = env.state.carrot_count
-        loaded_before = set(env.state.loaded_gifts)
-        delivered_before = set(env.state.delivered_gifts)
-        vc_before = env.state.velocity.vc
-        vr_before = env.state.velocity.vr
-
-        action = agent.get_action(state, epsilon=0.0)
-        next_state, reward, done, _ = env.step(action)
-
-        if action < 8:
-            dv_c = abs(env.state.velocity.vc - vc_before)
-            dv_r = abs(env.state.velocity.vr - vr_before)
-            val = int(max(dv_c, dv_r))
-            if val == 0:
-                val = 1
-            writer.record_move(action_names[action], val)
-            writer.record_move("FLOAT", 1)
-        elif action == 8:
-            writer.record_move("FLOAT", 1)
-        elif action == 9:
-            for gid in set(env.state.loaded_gifts) - loaded_before:
-                writer.record_load_gift(gid)
-        elif action == 10:
-            if env.state.carrot_count > carrots_before:
-                writer.record_load_carrots(env.state.carrot_count - carrots_before)
-        elif action == 11:
-            for gid in set(env.state.delivered_gifts) - delivered_before:
-                writer.record_deliver_gift(gid)
-
-        if viz:
-            viz.render(env, action_names[action], reward, step)
-        if step % 20 == 0 or action >= 9:
-            print(
-                f"Step {step:4d} | {action_names[action]:10} | Pos: {env.state.position.c:.0f},{env.state.position.r:.0f} | R: {reward:6.1f}"
-            )
+    # Komendy trafiają do writera na bieżąco; wyjątek w przebiegu porzuca
+    # zapis i zostawia poprzedni plik rozwiązania
+    with OutputWriter("solution.txt", gift_names=env.gifts_map) as writer:
+        while not done:
+            action = agent.get_action(state, epsilon=0.0)
+            next_state, reward, done, commands = env.step_with_commands(action)
+            for command, value in commands:
+                writer.record(command, value)
+
+            if viz:
+                viz.render(env, action_names[action], reward, step)
+            if step % 20 == 0 or action >= 9:
+                print(
+                    f"Step {step:4d} | {action_names[action]:10} | Pos: {env.state.position.c:.0f},{env.state.position.r:.0f} | R: {reward:6.1f}"
+                )
 
-        state = next_state
-        total_reward += reward
-        step += 1
-        if step > 3000:
-            break
+            state = next_state
+            total_reward += reward
+            step += 1
+            if step > 3000:
+                break
 
-    print(
-        f"Koniec. Wynik: {total_reward}. Dostarczono: {len(env.state.delivered_gifts)}"
+        print(
+            f"Koniec. Wynik: {total_reward}. Dostarczono: {len(env.state.delivered_gifts)}"
+        )
+
+
+def run_solve(problem, simulator, args):
+    print(f"--- ROZWIĄZYWANIE (limit {args.deadline:g} s) ---")
+    problem.travel_times = load_travel_times(args.input, problem, use_cache=True)
+    best = solve_anytime(
+        problem,
+        simulator.accel_table,
+        args.output,
+        args.deadline,
+        beam_time_budget=args.beam_budget,
     )
-    writer.save("solution.txt")
+    print(f"Koniec. Najlepszy wynik: {best.score} ({best.label}) w {args.output}")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("mode", choices=["train", "eval"])
+    parser.add_argument("mode", choices=["train", "eval", "solve"])
     parser.add_argument("--episodes", type=int, default=1000)
     parser.add_argument("--render", action="store_true")
+    parser.add_argument("--num-envs", type=int, default=1)
+    parser.add_argument("--prioritized", action="store_true")
+    parser.add_argument("--input", default=INPUT_FILE)
+    parser.add_argument("--output", default="solution.txt")
+    parser.add_argument(
+        "--deadline", type=float, default=60.0, help="sekundy na tryb solve"
+    )
+    parser.add_argument(
+        "--beam-budget",
+        type=float,
+        default=None,
+        help="sekundy na jedno przeszukiwanie wiązkowe (domyślnie bez limitu)",
+    )
     args = parser.parse_args()
 
-    problem, simulator = load_problem(INPUT_FILE)
+    problem, simulator = load_problem(args.input, use_cache=True)
+    if args.mode == "solve":
+        run_solve(problem, simulator, args)
+        sys.exit(0)
+
     env = SleighEnv(problem, simulator)
-    agent = DQNAgent(env.input_size, env.ACTION_SPACE_SIZE)
+    agent = DQNAgent(
+        env.input_size, env.ACTION_SPACE_SIZE, prioritized=args.prioritized
+    )
 
-    if args.mode == "train":
+    if args.mode == "train" and args.num_envs > 1:
+        vec_env = VectorSleighEnv(
+            problem, simulator, args.num_envs, max_episode_steps=2001
+        )
+        run_vector_training(vec_env, agent, args)
+    elif args.mode == "train":
         run_training(env, agent, args)
     else:
         run_evaluation(env, agent, args)
@@ -0,0 +1,101 @@
+from typing import Iterator
+
+import numpy as np
+
+from models.coordinate import Coordinate
+from models.gift import Gift
+
+# Tyle pojedynczych obiektów Gift trzyma katalog bez pełnej listy
+GIFT_CACHE_SIZE = 1024
+
+
+class GiftCatalog:
+    """
+    Wspólna przestrzeń identyfikatorów prezentów: id to pozycja w problem.gifts.
+    Indeksowanie po id zwraca Gift, a kolumny są dostępne jako tablice NumPy.
+    Indeksowanie buduje tylko jeden Gift z kolumn (z małą pamięcią podręczną),
+    pełna lista obiektów powstaje dopiero przy jawnym użyciu .gifts.
+    """
+
+    def __init__(self, gifts: list[Gift]):
+        self._gifts = gifts
+        self._ids = None
+        self._cache = {}
+        self.names = np.array([gift.name.encode() for gift in gifts], dtype="S")
+
+        self.scores = np.array([g.score for g in gifts], dtype=np.int64)
+        self.weights = np.array([g.weight for g in gifts], dtype=np.int64)
+        self.dest_c = np.array([g.destination.c for g in gifts], dtype=np.int64)
+        self.dest_r = np.array([g.destination.r for g in gifts], dtype=np.int64)
+
+    @classmethod
+    def from_columns(cls, names, scores, weights, dest_c, dest_r) -> "GiftCatalog":
+        catalog = cls.__new__(cls)
+        catalog._gifts = None
+        catalog._ids = None
+        catalog._cache = {}
+        catalog.names = np.asarray(names, dtype="S")
+        catalog.scores = np.asarray(scores, dtype=np.int64)
+        catalog.weights = np.asarray(weights, dtype=np.int64)
+        catalog.dest_c = np.asarray(dest_c, dtype=np.int64)
+        catalog.dest_r = np.asarray(dest_r, dtype=np.int64)
+        return catalog
+
+    @property
+    def gifts(self) -> list[Gift]:
+        if self._gifts is None:
+            self._gifts = [
+                Gift(
+                    name=name.decode(),
+                    score=score,
+                    weight=weight,
+                    destination=Coordinate(c, r),
+                )
+                for name, score, weight, c, r in zip(
+                    self.names.tolist(),
+                    self.scores.tolist(),
+                    self.weights.tolist(),
+                    self.dest_c.tolist(),
+                    self.dest_r.tolist(),
+                )
+            ]
+        return self._gifts
+
+    @property
+    def ids(self) -> dict[str, int]:
+        if self._ids is None:
+            self._ids = {
+                name.decode(): gift_id for gift_id, name in enumerate(self.names)
+            }
+        return self._ids
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, gift_id: int) -> Gift:
+        if self._gifts is not None:
+            return self._gifts[gift_id]
+        gift = self._cache.get(gift_id)
+        if gift is None:
+            gift_id = int(gift_id)
+            if len(self._cache) >= GIFT_CACHE_SIZE:
+                self._cache.clear()
+            gift = Gift(
+                name=self.names[gift_id].decode(),
+                score=int(self.scores[gift_id]),
+                weight=int(self.weights[gift_id]),
+                destination=Coordinate(
+                    int(self.dest_c[gift_id]), int(self.dest_r[gift_id])
+                ),
+            )
+            self._cache[gift_id] = gift
+        return gift
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self.names)))
+
+    def id_of(self, name: str) -> int:
+        return self.ids[name]
+
+    def name_of(self, gift_id: int) -> str:
+        return self.names[gift_id].decode()
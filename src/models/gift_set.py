@@ -0,0 +1,110 @@
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+
+class GiftSet:
+    """
+    Zbiór id prezentów jako maska bool - przynależność i przeniesienie w O(1).
+    Iteracja zwraca id rosnąco, więc first() to zawsze najmniejsze id.
+    """
+
+    __slots__ = ("mask", "count")
+
+    def __init__(self, size: int, gift_ids: Iterable[int] = ()):
+        self.mask = np.zeros(size, dtype=bool)
+        self.mask[list(gift_ids)] = True
+        self.count = int(self.mask.sum())
+
+    @classmethod
+    def full(cls, size: int) -> "GiftSet":
+        gift_set = cls(size)
+        gift_set.mask[:] = True
+        gift_set.count = size
+        return gift_set
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "GiftSet":
+        gift_set = cls.__new__(cls)
+        gift_set.mask = np.array(mask, dtype=bool)
+        gift_set.count = int(gift_set.mask.sum())
+        return gift_set
+
+    def __contains__(self, gift_id: int) -> bool:
+        return bool(self.mask[gift_id])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids().tolist())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GiftSet):
+            return NotImplemented
+        return self.count == other.count and np.array_equal(self.mask, other.mask)
+
+    def __repr__(self) -> str:
+        return f"GiftSet({self.ids().tolist()})"
+
+    def add(self, gift_id: int):
+        if not self.mask[gift_id]:
+            self.mask[gift_id] = True
+            self.count += 1
+
+    def remove(self, gift_id: int):
+        if not self.mask[gift_id]:
+            raise KeyError(gift_id)
+        self.mask[gift_id] = False
+        self.count -= 1
+
+    def ids(self) -> np.ndarray:
+        return np.flatnonzero(self.mask)
+
+    def first(self) -> Optional[int]:
+        if self.count == 0:
+            return None
+        return int(self.mask.argmax())
+
+    def copy(self) -> "GiftSet":
+        gift_set = GiftSet.__new__(GiftSet)
+        gift_set.mask = self.mask.copy()
+        gift_set.count = self.count
+        return gift_set
+
+
+class LoggedGiftSet(GiftSet):
+    """
+    GiftSet, którego zmiany trafiają do wspólnego dziennika cofania (log) i
+    aktualizują skrót Zobrista zbioru - do przeszukiwania drzewa bez kopii.
+    """
+
+    __slots__ = ("log", "keys", "hash")
+
+    def __init__(self, mask: np.ndarray, log: list, keys: np.ndarray):
+        self.mask = np.array(mask, dtype=bool)
+        self.count = int(self.mask.sum())
+        self.log = log
+        self.keys = keys
+        self.hash = int(np.bitwise_xor.reduce(keys[self.mask])) if self.count else 0
+
+    def add(self, gift_id: int):
+        if not self.mask[gift_id]:
+            self.mask[gift_id] = True
+            self.count += 1
+            self.hash ^= int(self.keys[gift_id])
+            self.log.append((self, gift_id, True))
+
+    def remove(self, gift_id: int):
+        if not self.mask[gift_id]:
+            raise KeyError(gift_id)
+        self.mask[gift_id] = False
+        self.count -= 1
+        self.hash ^= int(self.keys[gift_id])
+        self.log.append((self, gift_id, False))
+
+    def revert(self, gift_id: int, added: bool):
+        """Cofa jeden wpis dziennika - bez ponownego logowania."""
+        self.mask[gift_id] = not added
+        self.count += -1 if added else 1
+        self.hash ^= int(self.keys[gift_id])
@@ -1,8 +1,9 @@
 from typing import List
 from dataclasses import dataclass
-from input.input_parser import InputParser
+from input.column_parser import ColumnInputParser
 from models.acceleration_range import AccelerationRange
 from models.gift import Gift
+from models.gift_catalog import GiftCatalog
 
 @dataclass
 class Problem:
@@ -11,17 +12,36 @@ class Problem:
     W: int
     G: int
     acceleration_ranges: List[AccelerationRange]
-    gifts: List[Gift]
+    catalog: GiftCatalog
+    # Opcjonalna macierz czasów przelotu (TravelTimeMatrix) dla solverów
+    travel_times = None
 
     def __init__(self, data_path: str):
-        ip = InputParser(data_path=data_path)
-        T, D, W, G, acceleration_ranges, gifts = ip.parse_information()
+        ip = ColumnInputParser(data_path=data_path)
+        T, D, W, G, acceleration_ranges, catalog = ip.parse_information()
         self.T = T
         self.D = D
         self.W = W
         self.G = G
         self.acceleration_ranges = acceleration_ranges
-        self.gifts = gifts
+        self.catalog = catalog
+
+    @classmethod
+    def from_parts(cls, T, D, W, G, acceleration_ranges, catalog):
+        """Problem z gotowych części (np. z cache), bez parsowania pliku."""
+        problem = cls.__new__(cls)
+        problem.T = T
+        problem.D = D
+        problem.W = W
+        problem.G = G
+        problem.acceleration_ranges = acceleration_ranges
+        problem.catalog = catalog
+        return problem
+
+    @property
+    def gifts(self) -> List[Gift]:
+        """Obiekty Gift tworzone dopiero przy pierwszym dostępie."""
+        return self.catalog.gifts
 
     @property
     def data(self):
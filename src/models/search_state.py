@@ -0,0 +1,212 @@
+from functools import lru_cache
+
+import numpy as np
+
+from models.coordinate import Coordinate
+from models.gift_set import GiftSet, LoggedGiftSet
+from models.sleigh_state import SleighState
+from models.velocity import Velocity
+
+# Pola skalarne - w tej samej kolejności trafiają do migawki
+_SCALARS = (
+    "c",
+    "r",
+    "vc",
+    "vr",
+    "sleigh_weight",
+    "carrot_count",
+    "current_time",
+    "last_action_was_acceleration",
+)
+
+
+@lru_cache(maxsize=4)
+def zobrist_keys(size: int, seed: int = 2022) -> np.ndarray:
+    """Losowe klucze (3, size) - osobne dla dostępnych, załadowanych i dostarczonych."""
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(1, np.iinfo(np.int64).max, (3, size), dtype=np.int64)
+    keys.setflags(write=False)
+    return keys
+
+
+class _PositionView:
+    """position.c / position.r czytane i pisane wprost w polach SearchState."""
+
+    __slots__ = ("state",)
+
+    def __init__(self, state):
+        self.state = state
+
+    @property
+    def c(self):
+        return self.state.c
+
+    @c.setter
+    def c(self, value):
+        self.state.c = value
+
+    @property
+    def r(self):
+        return self.state.r
+
+    @r.setter
+    def r(self, value):
+        self.state.r = value
+
+
+class _VelocityView:
+    __slots__ = ("state",)
+
+    def __init__(self, state):
+        self.state = state
+
+    @property
+    def vc(self):
+        return self.state.vc
+
+    @vc.setter
+    def vc(self, value):
+        self.state.vc = value
+
+    @property
+    def vr(self):
+        return self.state.vr
+
+    @vr.setter
+    def vr(self, value):
+        self.state.vr = value
+
+
+class SearchState:
+    """
+    Stan sań do przeszukiwania drzewa. Skalary są polami (__slots__), a
+    zbiory prezentów zapisują zmiany w jednym dzienniku, więc gałąź jest
+    cofana przez restore(snapshot()) w czasie proporcjonalnym do liczby
+    zmian, a nie do liczby prezentów. Ma ten sam interfejs co SleighState
+    (position.c, velocity.vr, loaded_gifts...), więc działają na nim
+    przejścia z core.actions.
+    """
+
+    __slots__ = _SCALARS + (
+        "available_gifts",
+        "loaded_gifts",
+        "delivered_gifts",
+        "log",
+        "position",
+        "velocity",
+    )
+
+    def __init__(
+        self,
+        c: int,
+        r: int,
+        vc: int,
+        vr: int,
+        sleigh_weight: int,
+        carrot_count: int,
+        current_time: int,
+        last_action_was_acceleration: bool,
+        available: np.ndarray,
+        loaded: np.ndarray,
+        delivered: np.ndarray,
+    ):
+        self.c, self.r = c, r
+        self.vc, self.vr = vc, vr
+        self.sleigh_weight = sleigh_weight
+        self.carrot_count = carrot_count
+        self.current_time = current_time
+        self.last_action_was_acceleration = last_action_was_acceleration
+
+        keys = zobrist_keys(len(available))
+        self.log = []
+        self.available_gifts = LoggedGiftSet(available, self.log, keys[0])
+        self.loaded_gifts = LoggedGiftSet(loaded, self.log, keys[1])
+        self.delivered_gifts = LoggedGiftSet(delivered, self.log, keys[2])
+        self.position = _PositionView(self)
+        self.velocity = _VelocityView(self)
+
+    @classmethod
+    def from_state(cls, state: SleighState) -> "SearchState":
+        return cls(
+            state.position.c,
+            state.position.r,
+            state.velocity.vc,
+            state.velocity.vr,
+            state.sleigh_weight,
+            state.carrot_count,
+            state.current_time,
+            state.last_action_was_acceleration,
+            state.available_gifts.mask,
+            state.loaded_gifts.mask,
+            state.delivered_gifts.mask,
+        )
+
+    def to_state(self) -> SleighState:
+        return SleighState(
+            current_time=self.current_time,
+            position=Coordinate(self.c, self.r),
+            velocity=Velocity(self.vc, self.vr),
+            sleigh_weight=self.sleigh_weight,
+            carrot_count=self.carrot_count,
+            loaded_gifts=GiftSet.from_mask(self.loaded_gifts.mask),
+            available_gifts=GiftSet.from_mask(self.available_gifts.mask),
+            delivered_gifts=GiftSet.from_mask(self.delivered_gifts.mask),
+            last_action_was_acceleration=self.last_action_was_acceleration,
+        )
+
+    def snapshot(self) -> tuple:
+        """Migawka w O(1): skalary i długość dziennika zmian zbiorów."""
+        return (
+            self.c,
+            self.r,
+            self.vc,
+            self.vr,
+            self.sleigh_weight,
+            self.carrot_count,
+            self.current_time,
+            self.last_action_was_acceleration,
+            len(self.log),
+        )
+
+    def restore(self, snapshot: tuple):
+        """Wraca do migawki, cofając wpisy dziennika dodane po niej."""
+        (
+            self.c,
+            self.r,
+            self.vc,
+            self.vr,
+            self.sleigh_weight,
+            self.carrot_count,
+            self.current_time,
+            self.last_action_was_acceleration,
+            log_length,
+        ) = snapshot
+        log = self.log
+        while len(log) > log_length:
+            gift_set, gift_id, added = log.pop()
+            gift_set.revert(gift_id, added)
+
+    def clear_log(self):
+        """Zapomina historię zmian - starszych migawek nie da się już przywrócić."""
+        self.log.clear()
+
+    def gift_hash(self) -> int:
+        return (
+            self.available_gifts.hash
+            ^ self.loaded_gifts.hash
+            ^ self.delivered_gifts.hash
+        )
+
+    def key(self) -> tuple:
+        """Klucz stanu do tablic transpozycji - bez przeglądania prezentów."""
+        return (
+            self.c,
+            self.r,
+            self.vc,
+            self.vr,
+            self.sleigh_weight,
+            self.carrot_count,
+            self.current_time,
+            self.last_action_was_acceleration,
+            self.gift_hash(),
+        )
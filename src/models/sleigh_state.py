@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from models.velocity import Velocity
 from models.coordinate import Coordinate
+from models.gift_set import GiftSet
 
 
 @dataclass
@@ -10,9 +11,9 @@ class SleighState:
     velocity:     'Velocity'
     sleigh_weight: int
     carrot_count: int
-    loaded_gifts: list[str]
-    available_gifts: list[str]
-    delivered_gifts: list[str]
+    loaded_gifts: GiftSet
+    available_gifts: GiftSet
+    delivered_gifts: GiftSet
     last_action_was_acceleration: bool
 
     def clone(self) -> 'SleighState':
@@ -22,8 +23,8 @@ class SleighState:
             velocity=Velocity(self.velocity.vc, self.velocity.vr),
             sleigh_weight=self.sleigh_weight,
             carrot_count=self.carrot_count,
-            loaded_gifts=list(self.loaded_gifts),
-            available_gifts=list(self.available_gifts),
-            delivered_gifts=list(self.delivered_gifts),
+            loaded_gifts=self.loaded_gifts.copy(),
+            available_gifts=self.available_gifts.copy(),
+            delivered_gifts=self.delivered_gifts.copy(),
             last_action_was_acceleration=self.last_action_was_acceleration
-        )
\ No newline at end of file
+        )
@@ -1,59 +1,143 @@
+import os
+import secrets
+import shutil
+import tempfile
+
+from core.actions import COMMAND_NAMES, Action
+
+_COMMANDS = [COMMAND_NAMES[action] for action in sorted(COMMAND_NAMES)]
+
+
+def _open_temp(directory: str) -> tuple[int, str]:
+    """
+    Nowy plik tymczasowy w directory, jak z mkstemp, ale tworzony z trybem
+    0666 - jądro nakłada umask procesu tak samo jak przy zwykłym open().
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        path = os.path.join(directory, f"tmp{secrets.token_hex(8)}.tmp")
+        try:
+            return os.open(path, flags, 0o666), path
+        except FileExistsError:
+            continue
+
+
 class OutputWriter:
-    def __init__(self):
-        self.commands = []
+    """
+    Strumieniowy zapis rozwiązania. Komendy trafiają od razu do buforowanego
+    anonimowego pliku tymczasowego, a kolejne Float są łączone w jedno
+    Float k. Dopiero close() tworzy plik docelowy: liczba komend i treść.
+    Wyjątek w bloku with porzuca zapis - plik docelowy zostaje bez zmian.
+    """
+
+    def __init__(self, filepath, gift_names=None, buffer_size=1 << 20, atomic=False):
+        """
+        gift_names: obiekt z name_of(id) (np. GiftCatalog) dla id prezentów.
+        atomic: close() podmienia plik docelowy gotowym plikiem tymczasowym -
+        plik docelowy jest zawsze albo stary, albo kompletny.
+        """
+        self.filepath = filepath
+        self.gift_names = gift_names
+        self.atomic = atomic
+        self.count = 0
+        self.pending_float = 0
+
+        self.directory = os.path.dirname(os.path.abspath(filepath))
+        self.file = tempfile.TemporaryFile(
+            "w+", dir=self.directory, buffering=buffer_size
+        )
+
+    def __enter__(self):
+        return self
 
-    def record_move(self, action_enum, value):
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.discard()
+        else:
+            self.close()
+
+    def record(self, action, value):
         """
-        Zapisuje akcje ruchu: AccUp, AccDown, AccLeft, AccRight, Float.
-        action_enum: nazwa z enuma (np. ACC_N) lub string
-        value: wartość liczbowa (np. 1 lub calculated_max)
+        action: kod Action, value: przyspieszenie / k / liczba marchewek
+        albo prezent (id lub nazwa) dla LoadGifts i DeliverGift.
         """
-        cmd_str = ""
-        # Mapowanie naszych kierunków na format wyjściowy
-        # Zakładamy: N=Up, S=Down, E=Right, W=Left (zależnie od układu współrzędnych)
-        # W SleighEnv: 0=N (ay+), 1=S (ay-), 2=E (ax+), 3=W (ax-)
-
-        name = str(action_enum).upper()
-
-        if "ACC_N" in name or "MAX_N" in name:
-            cmd_str = f"AccUp {int(value)}"
-        elif "ACC_S" in name or "MAX_S" in name:
-            cmd_str = f"AccDown {int(value)}"
-        elif "ACC_E" in name or "MAX_E" in name:
-            cmd_str = f"AccRight {int(value)}"
-        elif "ACC_W" in name or "MAX_W" in name:
-            cmd_str = f"AccLeft {int(value)}"
-        elif "FLOAT" in name:
-            cmd_str = f"Float {int(value)}"
-
-        if cmd_str:
-            self.commands.append(cmd_str)
+        if action == Action.Floating:
+            self.pending_float += int(value)
+            return
+
+        self._flush_float()
+        if action == Action.LoadGifts or action == Action.DeliverGift:
+            if not isinstance(value, str):
+                value = self.gift_names.name_of(value)
+        else:
+            value = int(value)
+
+        self.file.write(f"{_COMMANDS[action]} {value}\n")
+        self.count += 1
 
     def record_load_carrots(self, amount):
         """Zapisuje LoadCarrots N"""
-        self.commands.append(f"LoadCarrots {amount}")
+        self.record(Action.LoadCarrots, amount)
 
     def record_load_gift(self, gift_name):
         """Zapisuje LoadGift ChildName"""
-        self.commands.append(f"LoadGift {gift_name}")
+        self.record(Action.LoadGifts, gift_name)
 
     def record_deliver_gift(self, gift_name):
         """Zapisuje DeliverGift ChildName"""
-        self.commands.append(f"DeliverGift {gift_name}")
+        self.record(Action.DeliverGift, gift_name)
 
-    def save(self, filepath):
-        """Zapisuje plik zgodnie ze specyfikacją (pierwsza linia to liczba akcji)"""
-        if not self.commands:
-            print("⚠️ Brak komend do zapisu.")
+    def _flush_float(self):
+        if self.pending_float > 0:
+            self.file.write(f"Float {self.pending_float}\n")
+            self.count += 1
+        self.pending_float = 0
+
+    def close(self):
+        """Dopisuje zaległe Float i zapisuje plik docelowy z liczbą komend."""
+        if self.file.closed:
             return
 
         try:
-            with open(filepath, "w") as f:
-                # 1. Liczba akcji C
-                f.write(f"{len(self.commands)}\n")
-                # 2. Akcje linia po linii
-                for cmd in self.commands:
-                    f.write(f"{cmd}\n")
-            print(f"✅ Zapisano rozwiązanie do: {filepath}")
-        except Exception as e:
-            print(f"❌ Błąd zapisu pliku: {e}")
+            self._flush_float()
+            self.file.seek(0)
+            if self.atomic:
+                self._replace_target()
+            else:
+                with open(self.filepath, "w") as target:
+                    self._write_target(target)
+        finally:
+            self.file.close()
+
+        if self.count == 0:
+            print("⚠️ Brak komend do zapisu.")
+        else:
+            print(f"✅ Zapisano rozwiązanie do: {self.filepath}")
+
+    def _write_target(self, target):
+        target.write(f"{self.count}\n")
+        shutil.copyfileobj(self.file, target)
+
+    def _replace_target(self):
+        fd, tmp_path = _open_temp(self.directory)
+        try:
+            with os.fdopen(fd, "w") as target:
+                self._write_target(target)
+                # Treść musi być na dysku, zanim nazwa zacznie na nią wskazywać
+                target.flush()
+                os.fsync(target.fileno())
+                # Podmieniany plik zachowuje swój tryb
+                try:
+                    mode = os.stat(self.filepath).st_mode & 0o777
+                except FileNotFoundError:
+                    pass
+                else:
+                    os.fchmod(target.fileno(), mode)
+            os.replace(tmp_path, self.filepath)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def discard(self):
+        """Porzuca zapis - plik docelowy zostaje bez zmian."""
+        self.file.close()
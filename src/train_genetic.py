@@ -1,6 +1,9 @@
+import argparse
+import multiprocessing
 import os
-import random
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 
 import numpy as np
 import torch
@@ -8,9 +11,11 @@ import torch
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from agents.genetic_agent import GeneticAgent
-from core.distance_utils import distance
+from agents.genetic_population import GeneticPopulation
 from core.loader import load_problem
-from env.sleigh_env import SleighEnv
+from core.shared_problem import SharedProblem, attach_problem
+from env.scripted_policy import scripted_actions
+from env.vector_sleigh_env import VectorSleighEnv
 
 INPUT_FILE = "data/huge_challenge.in.txt"
 MODEL_PATH = "models_saved/santa_genetic_best.pth"
@@ -21,106 +26,132 @@ ELITE_SIZE = 5
 MUTATION_POWER = 0.05
 
 
-def evaluate_agent(env, agent):
-    """Puszcza jednego agenta na mapę i zwraca jego wynik."""
-    state_tensor = env.reset()
-    if env.state.available_gifts:
-        env._sort_loaded_gifts()
-
-    done = False
-    total_reward = 0
+def evaluate_population(vec_env, population):
+    """
+    Genom i jedzie w i-tej kopii środowiska, wszystkie kopie krokują razem,
+    a decyzje sieci dla całej populacji to jeden forward pass.
+    """
+    states = vec_env.reset()
+    total_rewards = np.zeros(vec_env.num_envs)
     steps = 0
+    max_steps = vec_env.problem.T + 100
 
-    max_steps = env.problem.T + 100
-
-    while not done and steps < max_steps:
-        dist_to_base = distance(env.state.position, env.sim.lapland_pos)
-        action_id = None
-
-        if dist_to_base <= env.problem.D:
-            if not env.state.loaded_gifts and env.state.available_gifts:
-                action_id = 6  # Load
-            elif env.state.carrot_count < 20:
-                action_id = 5  # Fuel
-
-        if action_id is None:
-            if env.state.loaded_gifts:
-                tgt = env.gifts_map[env.state.loaded_gifts[0]]
-                if distance(env.state.position, tgt.destination) <= env.problem.D:
-                    action_id = 7  # Deliver
-
-            if action_id is None:
-                action_id = agent.get_action(state_tensor)
+    while not vec_env.finished.all() and steps < max_steps:
+        actions = scripted_actions(vec_env)
+        network = actions < 0
+        if network.any():
+            actions[network] = population.get_actions(states).numpy()[network]
 
-        state_tensor, reward, done, _ = env.step(action_id)
-
-        if action_id in [6, 7]:
-            env._sort_loaded_gifts()
-
-        total_reward += reward
+        states, rewards, _, _ = vec_env.step(actions)
+        total_rewards += rewards
         steps += 1
 
-    return total_reward, len(env.state.delivered_gifts)
+    return total_rewards, vec_env.sim.delivered.sum(axis=1)
 
 
-def main():
-    if not os.path.exists("models_saved"):
-        os.makedirs("models_saved")
+_worker_problem = None
+_worker_envs = {}
 
-    print("Ładowanie mapy...")
-    problem, simulator = load_problem(INPUT_FILE)
-    env = SleighEnv(problem, simulator)
-
-    state_size = env.encoder.output_size
-    action_size = env.action_space_size
-
-    print(f"Tworzenie populacji {POPULATION_SIZE} agentów...")
-    population = [GeneticAgent(state_size, action_size) for _ in range(POPULATION_SIZE)]
-
-    if os.path.exists(MODEL_PATH):
-        print("Wczytano poprzedniego mistrza!")
-        master = GeneticAgent(state_size, action_size)
-        master.load_state_dict(torch.load(MODEL_PATH))
-        population[0] = master
-        for i in range(1, POPULATION_SIZE):
-            population[i] = master.mutate(power=0.1)
-
-    best_global_score = -float("inf")
 
-    for gen in range(GENERATIONS):
-        scores = []
+def _init_worker(handle):
+    """Każdy proces dołącza do mapy opublikowanej w pamięci współdzielonej."""
+    global _worker_problem
+    torch.set_num_threads(1)
+    _worker_problem = attach_problem(handle)
 
-        for i, agent in enumerate(population):
-            score, delivered = evaluate_agent(env, agent)
-            scores.append((score, agent, delivered))
 
-        scores.sort(key=lambda x: x[0], reverse=True)
+def _evaluate_genomes(genomes):
+    """Ocena fragmentu populacji w procesie roboczym - genomy przychodzą jako płaska tablica."""
+    n = len(genomes)
+    if n not in _worker_envs:
+        problem, simulator = _worker_problem
+        _worker_envs[n] = VectorSleighEnv(problem, simulator, n, autoreset=False)
+    vec_env = _worker_envs[n]
 
-        best_score = scores[0][0]
-        best_agent = scores[0][1]
-        best_delivered = scores[0][2]
+    population = GeneticPopulation(
+        n,
+        vec_env.input_size,
+        vec_env.ACTION_SPACE_SIZE,
+        genomes=genomes,
+        device=torch.device("cpu"),
+    )
+    return evaluate_population(vec_env, population)
 
-        if best_score > best_global_score:
-            best_global_score = best_score
-            torch.save(best_agent.state_dict(), MODEL_PATH)
-            print(f"\n🚀 NOWY REKORD: {best_score:.2f} (Dostarczono: {best_delivered})")
 
-        print(
-            f"\rGen {gen:3d} | Best: {best_score:10.2f} | Avg: {np.mean([s[0] for s in scores]):10.2f} | Deliv: {best_delivered}"
-        )
+def evaluate_parallel(executor, population, workers):
+    chunks = np.array_split(population.genomes.cpu().numpy(), workers)
+    results = list(executor.map(_evaluate_genomes, [c for c in chunks if len(c)]))
+    rewards = np.concatenate([r for r, _ in results])
+    delivered = np.concatenate([d for _, d in results])
+    return rewards, delivered
 
-        new_population = []
 
-        elites = [s[1] for s in scores[:ELITE_SIZE]]
-        new_population.extend(elites)
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
 
-        spots_left = POPULATION_SIZE - ELITE_SIZE
-        for i in range(spots_left):
-            parent = random.choice(elites)
-            child = parent.mutate(mutation_power=MUTATION_POWER)
-            new_population.append(child)
+    if not os.path.exists("models_saved"):
+        os.makedirs("models_saved")
 
-        population = new_population
+    print("Ładowanie mapy...")
+    problem, simulator = load_problem(INPUT_FILE, use_cache=True)
+    vec_env = VectorSleighEnv(problem, simulator, POPULATION_SIZE, autoreset=False)
+
+    state_size = vec_env.input_size
+    action_size = vec_env.ACTION_SPACE_SIZE
+
+    # Pula i pamięć współdzielona są zamykane także po wyjątku albo Ctrl-C
+    with ExitStack() as stack:
+        executor = None
+        if args.workers > 1:
+            print(f"Uruchamianie {args.workers} procesów roboczych...")
+            shared = stack.enter_context(SharedProblem(problem))
+            executor = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=args.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(shared.handle,),
+                )
+            )
+
+        print(f"Tworzenie populacji {POPULATION_SIZE} agentów...")
+        population = GeneticPopulation(POPULATION_SIZE, state_size, action_size)
+
+        if os.path.exists(MODEL_PATH):
+            print("Wczytano poprzedniego mistrza!")
+            master = GeneticAgent(state_size, action_size)
+            master.load_state_dict(torch.load(MODEL_PATH))
+            population = GeneticPopulation.from_agent(master, POPULATION_SIZE, 0.1)
+
+        best_global_score = -float("inf")
+
+        for gen in range(GENERATIONS):
+            if executor is not None:
+                rewards, delivered = evaluate_parallel(
+                    executor, population, args.workers
+                )
+            else:
+                rewards, delivered = evaluate_population(vec_env, population)
+            ranking = np.argsort(-rewards, kind="stable")
+
+            best_score = rewards[ranking[0]]
+            best_delivered = delivered[ranking[0]]
+
+            if best_score > best_global_score:
+                best_global_score = best_score
+                best_agent = population.to_agent(int(ranking[0]))
+                torch.save(best_agent.state_dict(), MODEL_PATH)
+                print(
+                    f"\n🚀 NOWY REKORD: {best_score:.2f} (Dostarczono: {best_delivered})"
+                )
+
+            print(
+                f"\rGen {gen:3d} | Best: {best_score:10.2f} | Avg: {np.mean(rewards):10.2f} | Deliv: {best_delivered}"
+            )
+
+            population.next_generation(ranking[:ELITE_SIZE], MUTATION_POWER)
 
 
 if __name__ == "__main__":
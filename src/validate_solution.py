@@ -0,0 +1,39 @@
+import argparse
+import sys
+import time
+
+from core.loader import load_problem
+from core.solution_validator import SolutionValidator
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sprawdza plik rozwiązania i liczy jego wynik."
+    )
+    parser.add_argument(
+        "input", help="plik z instancją, np. data/b_better_hurry.in.txt"
+    )
+    parser.add_argument("solution", help="plik rozwiązania, np. solution.txt")
+    args = parser.parse_args()
+
+    problem, simulator = load_problem(args.input, use_cache=True)
+    validator = SolutionValidator(problem, simulator.accel_table)
+
+    start = time.perf_counter()
+    result = validator.validate_file(args.solution)
+    elapsed = time.perf_counter() - start
+
+    if result.valid:
+        print(
+            f"✅ Poprawne: {result.commands} komend, wynik {result.score} "
+            f"({elapsed * 1000:.1f} ms)"
+        )
+        return 0
+
+    print(f"❌ Linia {result.line}: {result.violation}")
+    print(f"   Wynik do tego miejsca: {result.score} ({result.commands} komend)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -48,14 +48,14 @@ class Visualizer:
 
         state = env.state
 
-        for gift in self.problem.gifts:
-            if gift.name in state.delivered_gifts:
+        for gift_id, gift in enumerate(self.problem.gifts):
+            if gift_id in state.delivered_gifts:
                 color = self.COLOR_GIFT_DELIVERED
                 size = 1
             else:
                 color = self.COLOR_GIFT
                 size = 2
-                if gift.name in state.loaded_gifts:
+                if gift_id in state.loaded_gifts:
                     continue
 
             px, py = self._to_screen(gift.destination.c, gift.destination.r)
@@ -78,11 +78,10 @@ class Visualizer:
         pygame.draw.circle(self.screen, self.COLOR_SANTA, (sx, sy), 6)
 
         if state.loaded_gifts:
-            target_name = state.loaded_gifts[0]
-            if target_name in env.gifts_map:
-                tgt = env.gifts_map[target_name].destination
-                tx, ty = self._to_screen(tgt.c, tgt.r)
-                pygame.draw.line(self.screen, (255, 0, 255), (sx, sy), (tx, ty), 1)
+            target_id = state.loaded_gifts.first()
+            tgt = env.gifts_map[target_id].destination
+            tx, ty = self._to_screen(tgt.c, tgt.r)
+            pygame.draw.line(self.screen, (255, 0, 255), (sx, sy), (tx, ty), 1)
 
         info_lines = [
             f"Step: {step}",